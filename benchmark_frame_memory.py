@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+CAN Frame Memory Benchmark
+Measures the memory retained per received frame for the previous
+dict-based message formats and for CANFrame, as built by the managers'
+receive paths.
+
+Usage:
+    python benchmark_frame_memory.py                 # 100000 frames
+    python benchmark_frame_memory.py 500000          # 500000 frames
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import pcan_manager
+import pcan_simulator
+from slcan_manager import SLCANManager
+
+
+def synthetic_traffic(count, seed=1):
+    """(msg_id, extended, data) tuples with a realistic ID/DLC mix"""
+    rng = random.Random(seed)
+    std_ids = [rng.randrange(0x800) for _ in range(40)]
+    ext_ids = [rng.randrange(0x20000000) for _ in range(10)]
+    traffic = []
+    for _ in range(count):
+        data = bytes(rng.randrange(256) for _ in range(rng.choice((8, 8, 8, 8, 6, 4, 2, 0))))
+        if rng.random() < 0.2:
+            traffic.append((rng.choice(ext_ids), True, data))
+        else:
+            traffic.append((rng.choice(std_ids), False, data))
+    return traffic
+
+
+def legacy_slcan_messages(traffic):
+    """The dict SLCANManager used to build per frame"""
+    messages = []
+    for msg_id, extended, data in traffic:
+        timestamp_ns = time.time_ns()
+        messages.append({
+            "id": msg_id,
+            "data": list(data),
+            "extended": extended,
+            "timestamp": datetime.fromtimestamp(timestamp_ns / 1e9),
+            "timestamp_ns": timestamp_ns,
+            "type": "EXT" if extended else "STD"
+        })
+    return messages
+
+
+def legacy_pcan_messages(traffic):
+    """The dict PCANManager used to build per frame"""
+    messages = []
+    for msg_id, extended, data in traffic:
+        timestamp_ns = time.time_ns()
+        messages.append({
+            "id": msg_id,
+            "data": list(data),
+            "dlc": len(data),
+            "timestamp": datetime.fromtimestamp(timestamp_ns / 1e9),
+            "timestamp_ns": timestamp_ns,
+            "is_extended": extended,
+            "is_rtr": False,
+            "extended": extended,
+            "type": "EXT" if extended else "STD",
+            "source": "PCAN-51",
+            "channel": 0x51
+        })
+    return messages
+
+
+def slcan_frames(traffic):
+    """CANFrames from SLCANManager's receive path"""
+    stream = b''.join(
+        (b'T%08X%d' if extended else b't%03X%d') % (msg_id, len(data)) + data.hex().upper().encode() + b'\r'
+        for msg_id, extended, data in traffic
+    )
+    manager = SLCANManager()
+    frames = []
+    for offset in range(0, len(stream), 4096):
+        frames.extend(manager._process_chunk(stream[offset:offset + 4096]))
+    return frames
+
+
+def pcan_frames(traffic):
+    """CANFrames from PCANManager's receive path"""
+    pcan_manager.set_backend("simulator")
+    manager = pcan_manager.PCANManager()
+    drained = []
+    for msg_id, extended, data in traffic:
+        msg = pcan_simulator.TPCANMsg()
+        msg.ID = msg_id
+        msg.MSGTYPE = pcan_simulator.PCAN_MESSAGE_EXTENDED if extended else pcan_simulator.PCAN_MESSAGE_STANDARD
+        msg.LEN = len(data)
+        msg.DATA = list(data) + [0] * (8 - len(data))
+        drained.append((msg, None))
+    frames = []
+    for start in range(0, len(drained), 1024):
+        frames.extend(manager._make_messages(drained[start:start + 1024], "PCAN-51", 0x51))
+    return frames
+
+
+def retained_bytes(build, traffic):
+    """Bytes per frame still allocated after build(traffic) returns"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    frames = build(traffic)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(frames)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    traffic = synthetic_traffic(count)
+
+    title = f"CAN Frame Memory Benchmark ({count} retained frames)"
+    print(f"\n{title}\n{'=' * len(title)}")
+    for name, before, after in (
+        ("SLCAN", legacy_slcan_messages, slcan_frames),
+        ("PCAN", legacy_pcan_messages, pcan_frames),
+    ):
+        legacy = retained_bytes(before, traffic)
+        compact = retained_bytes(after, traffic)
+        print(f"  {name:<6} dict message  {legacy:7.0f} bytes/frame")
+        print(f"  {name:<6} CANFrame      {compact:7.0f} bytes/frame  ({legacy / compact:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
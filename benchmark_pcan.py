@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+PCAN Multi-Channel Benchmark
+Runs PCANManager against the simulated PCAN-Basic backend and reports
+receive throughput for per-channel and multiplexed readers, plus batched
+transmit fan-out to all channels.
+
+Usage:
+    python benchmark_pcan.py                 # 2 s per receive rate
+    python benchmark_pcan.py 5               # 5 s per receive rate
+"""
+
+import sys
+import time
+
+import pcan_manager
+import pcan_simulator
+
+CHANNELS = pcan_simulator.SIMULATED_CHANNELS
+RECEIVE_RATES = (1000, 10000, 0)   # frames/s per channel, 0 = as fast as the generator runs
+BURST_SIZE = 20
+TX_FRAMES = 2000
+
+
+def bench_receive(manager, multiplexed, rate, duration):
+    """Generate traffic on every channel, return (received, generated, elapsed)"""
+    received = [0]
+
+    def on_batch(batch):
+        received[0] += len(batch)
+
+    if multiplexed:
+        manager.start_multiplexed_listening(None, on_batch)
+    else:
+        for channel in CHANNELS:
+            manager.start_channel_listening(channel, None, on_batch)
+
+    start = time.perf_counter()
+    for channel in CHANNELS:
+        pcan_simulator.start_traffic(channel, frame_rate=rate, burst_size=BURST_SIZE, extended_ratio=0.2)
+    time.sleep(duration)
+    generated = sum(pcan_simulator.stop_traffic(channel) for channel in CHANNELS)
+    time.sleep(0.2)  # Let the readers drain what is queued
+    elapsed = time.perf_counter() - start
+
+    if multiplexed:
+        manager.stop_multiplexed_listening()
+    else:
+        for channel in CHANNELS:
+            manager.stop_channel_listening(channel)
+    return received[0], generated, elapsed
+
+
+def bench_transmit(manager):
+    """Send TX_FRAMES frames on every channel at once"""
+    frames = [(0x100 + i % 64, bytes([i & 0xFF] * 8), False, False) for i in range(TX_FRAMES)]
+    start = time.perf_counter()
+    results = manager.send_batch_all(frames)
+    elapsed = time.perf_counter() - start
+    sent = sum(TX_FRAMES for success, _ in results.values() if success)
+    return sent, elapsed
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+
+    pcan_manager.set_backend("simulator")
+    manager = pcan_manager.PCANManager()
+    for channel in CHANNELS:
+        success, message = manager.connect_channel(channel, pcan_manager.PCAN_BAUD_500K)
+        if not success:
+            print(f"Could not connect channel {channel:X}: {message}")
+            return
+
+    title = f"PCAN Multi-Channel Benchmark ({len(CHANNELS)} simulated channels)"
+    print(f"\n{title}\n{'=' * len(title)}")
+    for multiplexed in (False, True):
+        reader = "multiplexed" if multiplexed else "per-channel"
+        for rate in RECEIVE_RATES:
+            received, generated, elapsed = bench_receive(manager, multiplexed, rate, duration)
+            label = f"{reader} @ {rate:g}/ch" if rate else f"{reader} @ max"
+            print(f"  {label:<28} {received / elapsed:>9,.0f} frames/s  ({received}/{generated} frames)")
+
+    sent, elapsed = bench_transmit(manager)
+    print(f"  {'transmit fan-out':<28} {sent / elapsed:>9,.0f} frames/s  ({sent} frames)")
+
+    manager.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+SLCAN Decoder Benchmark
+Compares the table-driven SLCAN decoder with the original per-byte parser
+on a recorded SLCAN byte stream and reports frames/s for both.
+
+Usage:
+    python benchmark_slcan.py                 # synthetic recording
+    python benchmark_slcan.py capture.slcan   # raw SLCAN bytes captured from a device
+"""
+
+import random
+import sys
+import time
+from datetime import datetime
+
+from slcan_manager import SLCANManager, decode_slcan_frame
+
+CHUNK_SIZE = 4096  # Typical size of one bulk serial read under load
+
+
+def legacy_parse_message(line):
+    """The original SLCANManager._parse_message, kept as the baseline"""
+    try:
+        if not line:
+            return None
+
+        if line.startswith('t') and len(line) >= 5:
+            msg_id = int(line[1:4], 16)
+            dlc = int(line[4])
+            data_start = 5
+            extended = False
+        elif line.startswith('T') and len(line) >= 10:
+            msg_id = int(line[1:9], 16)
+            dlc = int(line[9])
+            data_start = 10
+            extended = True
+        else:
+            return None
+
+        data = []
+        for i in range(dlc):
+            if data_start + i*2 + 1 < len(line):
+                byte_str = line[data_start + i*2:data_start + i*2 + 2]
+                data.append(int(byte_str, 16))
+
+        return {
+            "id": msg_id,
+            "data": data,
+            "extended": extended,
+            "timestamp": datetime.now(),
+            "type": "EXT" if extended else "STD"
+        }
+
+    except Exception as e:
+        print(f"Error parsing message: {e}")
+        return None
+
+
+def record_stream(frame_count=100000, seed=1):
+    """Build a recorded SLCAN byte stream with a realistic ID/DLC mix"""
+    rng = random.Random(seed)
+    std_ids = [rng.randrange(0x800) for _ in range(40)]
+    ext_ids = [rng.randrange(0x20000000) for _ in range(10)]
+    lines = []
+    for _ in range(frame_count):
+        dlc = rng.choice((8, 8, 8, 8, 6, 4, 2, 0))
+        data = "".join(f"{rng.randrange(256):02X}" for _ in range(dlc))
+        if rng.random() < 0.2:
+            lines.append(f"T{rng.choice(ext_ids):08X}{dlc}{data}\r")
+        else:
+            lines.append(f"t{rng.choice(std_ids):03X}{dlc}{data}\r")
+    return "".join(lines).encode('ascii')
+
+
+def bench_legacy(stream):
+    """Per-line decode/strip/parse, as done by the original readline() loop"""
+    start = time.perf_counter()
+    frames = 0
+    for raw in stream.split(b'\r'):
+        line = raw.decode().strip()
+        if line and legacy_parse_message(line):
+            frames += 1
+    return frames, time.perf_counter() - start
+
+
+def bench_decoder(stream):
+    """Table-driven decoder on raw bytes lines"""
+    start = time.perf_counter()
+    frames = 0
+    for line in stream.split(b'\r'):
+        if decode_slcan_frame(line):
+            frames += 1
+    return frames, time.perf_counter() - start
+
+
+def bench_receive_engine(stream):
+    """Full bulk-read receive path: framing buffer, decoder and frame records"""
+    manager = SLCANManager()
+    start = time.perf_counter()
+    frames = 0
+    for offset in range(0, len(stream), CHUNK_SIZE):
+        frames += len(manager._process_chunk(stream[offset:offset + CHUNK_SIZE]))
+    return frames, time.perf_counter() - start
+
+
+def report(name, frames, elapsed, baseline=None):
+    rate = frames / elapsed if elapsed > 0 else 0.0
+    speedup = f"  ({rate / baseline:.1f}x)" if baseline else ""
+    print(f"  {name:<28} {frames:>8} frames  {elapsed:7.3f}s  {rate:>12,.0f} frames/s{speedup}")
+    return rate
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as f:
+            stream = f.read()
+        print(f"Loaded {len(stream)} bytes from {sys.argv[1]}")
+    else:
+        stream = record_stream()
+        print(f"Generated synthetic recording: {len(stream)} bytes")
+
+    print("\nSLCAN Decoder Benchmark")
+    print("=======================")
+    baseline = report("legacy _parse_message", *bench_legacy(stream))
+    report("decode_slcan_frame", *bench_decoder(stream), baseline=baseline)
+    report("receive engine (chunked)", *bench_receive_engine(stream), baseline=baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+SLCAN Device Benchmark
+Runs SLCANManager against the pty SLCAN simulator and reports connect
+time, receive throughput at several stream rates and transmit latency.
+
+Linux/macOS only (needs pty support).
+
+Usage:
+    python benchmark_slcan_device.py                 # 2 s per receive rate
+    python benchmark_slcan_device.py 5               # 5 s per receive rate
+"""
+
+import statistics
+import sys
+import time
+
+from slcan_manager import SLCANManager
+from slcan_simulator import SLCANSimulator
+
+RECEIVE_RATES = (1000, 10000, 0)   # frames/s, 0 = as fast as the reader keeps up
+BURST_SIZE = 20
+LATENCY_SAMPLES = 200
+PIPELINED_FRAMES = 5000
+
+
+def bench_connect(simulator):
+    manager = SLCANManager()
+    start = time.perf_counter()
+    connected = manager.connect(simulator.path)
+    elapsed = time.perf_counter() - start
+    return manager, connected, elapsed
+
+
+def bench_receive(manager, simulator, rate, duration):
+    """Stream at rate for duration, return (received, streamed, elapsed)"""
+    received = [0]
+
+    def on_batch(batch):
+        received[0] += len(batch)
+
+    simulator.streaming = False
+    simulator.frame_rate = rate
+    manager.start_listening(None, on_batch)
+    streamed_before = simulator.stats["rx_frames"]
+    start = time.perf_counter()
+    simulator.streaming = True
+    time.sleep(duration)
+    simulator.streaming = False
+    time.sleep(0.2)  # Let the reader drain what is in flight
+    elapsed = time.perf_counter() - start
+    manager.stop_listening_messages()
+    return received[0], simulator.stats["rx_frames"] - streamed_before, elapsed
+
+
+def bench_transmit(manager):
+    """Acknowledged round trip of single frames, then pipelined throughput"""
+    manager.start_listening(None, lambda batch: None)
+    latencies = []
+    for i in range(LATENCY_SAMPLES):
+        start = time.perf_counter()
+        manager.send_message(0x100 + i % 16, [i & 0xFF] * 8)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    frames = [(0x200 + i % 16, bytes([i & 0xFF] * 8), False) for i in range(PIPELINED_FRAMES)]
+    start = time.perf_counter()
+    results = [future.result(timeout=10) for future in manager.send_messages_async(frames)]
+    pipelined = time.perf_counter() - start
+    manager.stop_listening_messages()
+    return latencies, sum(1 for ok in results if ok), pipelined
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+
+    simulator = SLCANSimulator(burst_size=BURST_SIZE)
+    simulator.streaming = False
+    simulator.start()
+    print(f"SLCAN simulator on {simulator.path}")
+
+    manager, connected, elapsed = bench_connect(simulator)
+    if not connected:
+        print("Could not connect to the simulator")
+        return
+
+    print("\nSLCAN Device Benchmark")
+    print("======================")
+    print(f"  connect                      {elapsed * 1000:9.1f} ms")
+
+    for rate in RECEIVE_RATES:
+        received, streamed, elapsed = bench_receive(manager, simulator, rate, duration)
+        label = f"receive @ {rate:g} frames/s" if rate else "receive @ max"
+        print(f"  {label:<28} {received / elapsed:>9,.0f} frames/s  ({received}/{streamed} frames)")
+
+    latencies, acked, pipelined = bench_transmit(manager)
+    latencies.sort()
+    print(f"  transmit latency (median)    {statistics.median(latencies):9.3f} ms")
+    print(f"  transmit latency (p99)       {latencies[int(len(latencies) * 0.99) - 1]:9.3f} ms")
+    print(f"  transmit pipelined           {acked / pipelined:>9,.0f} frames/s  ({acked}/{PIPELINED_FRAMES} acked)")
+
+    manager.disconnect()
+    simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# can_frame.py
+from datetime import datetime
+
+# Bits of CANFrame.flags (also the flags byte of shared_frame_ring records)
+FLAG_EXTENDED = 0x01
+FLAG_RTR = 0x02
+
+
+class CANFrame:
+    """One received CAN frame, as handed to callbacks by every adapter manager
+
+    Slotted to keep retained frames small: data is bytes, timestamp_ns is
+    host time in integer nanoseconds and extended/RTR are bits of flags.
+    channel and source identify the channel or device when a manager
+    reads several of them (None otherwise). Frames are shared between
+    consumers, so treat them as read-only.
+    """
+
+    __slots__ = ("id", "data", "timestamp_ns", "flags", "channel", "source")
+
+    def __init__(self, id, data, timestamp_ns, flags=0, channel=None, source=None):
+        self.id = id
+        self.data = data
+        self.timestamp_ns = timestamp_ns
+        self.flags = flags
+        self.channel = channel
+        self.source = source
+
+    @property
+    def extended(self):
+        return bool(self.flags & FLAG_EXTENDED)
+
+    @property
+    def rtr(self):
+        return bool(self.flags & FLAG_RTR)
+
+    @property
+    def dlc(self):
+        return len(self.data)
+
+    @property
+    def type(self):
+        return "EXT" if self.flags & FLAG_EXTENDED else "STD"
+
+    @property
+    def timestamp(self):
+        """Timestamp as a local datetime, for display"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+
+    def __repr__(self):
+        return (f"CANFrame(id=0x{self.id:X}, data={self.data.hex(' ')}, type={self.type}, "
+                f"timestamp_ns={self.timestamp_ns}, source={self.source})")
+
+
+def split_filter_ids(entries):
+    """Split ID filter entries into (standard IDs, extended IDs)
+
+    An entry is an (id, extended) pair, or a bare ID when the frame type
+    is not known. A bare ID above 0x7FF can only be extended; one up to
+    0x7FF can be either type, so it goes in both sets.
+    """
+    standard, extended = set(), set()
+    for entry in entries:
+        if isinstance(entry, tuple):
+            can_id, is_extended = entry
+            (extended if is_extended else standard).add(can_id)
+        else:
+            if entry <= 0x7FF:
+                standard.add(entry)
+            extended.add(entry)
+    return standard, extended
+
+
+def filter_key_set(entries):
+    """(id, extended) pairs of ID filter entries, for exact software filtering
+
+    A bare ID up to 0x7FF stands for both frame types, so it gives two pairs.
+    """
+    standard, extended = split_filter_ids(entries)
+    return frozenset([(can_id, False) for can_id in standard] + [(can_id, True) for can_id in extended])
@@ -0,0 +1,176 @@
+# capture_store.py
+import threading
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    print("NumPy not available - capture history disabled. Install with: pip install numpy")
+
+from can_frame import CANFrame, FLAG_EXTENDED
+
+PAYLOAD_SIZE = 64  # Room for CAN FD payloads
+
+if NUMPY_AVAILABLE:
+    CAPTURE_DTYPE = np.dtype([
+        ("timestamp_ns", "<i8"),
+        ("channel", "<u2"),    # Index into CaptureStore.channels
+        ("id", "<u4"),
+        ("flags", "u1"),       # CANFrame flags
+        ("dlc", "u1"),
+        ("data", "u1", (PAYLOAD_SIZE,)),
+    ])
+
+
+class CaptureStore:
+    """Full capture history in a preallocated NumPy structured array
+
+    Frames are appended in arrival order, one vectorised copy per batch;
+    once capacity frames are stored the oldest are overwritten. Adapter
+    channel keys (PCAN handles, SLCAN pool names) are stored as small
+    indexes into channels.
+
+    segments() and time_range() return views into the buffer rather than
+    copies: they are only valid until enough new frames arrive to wrap
+    over them, so copy (np.concatenate, export, to_frames) anything kept.
+    Frames merged from several adapters or clocks can arrive out of
+    timestamp order; while any such frame is stored, time_range() selects
+    with a mask (copies) instead of a binary search.
+    One thread appends (the GUI thread, from the ingest queue drain);
+    readers on other threads must hold lock.
+    """
+
+    def __init__(self, capacity=1000000):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("CaptureStore needs NumPy")
+        self.capacity = capacity
+        self.records = np.zeros(capacity, dtype=CAPTURE_DTYPE)
+        self.total = 0                 # Frames ever appended
+        self.channels = [None]         # Index 0: frames without a channel
+        self._channel_index = {None: 0}
+        self._last_timestamp_ns = None
+        self._last_unsorted = None     # Index (in total) of the newest frame older than the one before it
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def overwritten(self):
+        return max(0, self.total - self.capacity)
+
+    def append(self, frames):
+        """Store a batch of CANFrames"""
+        count = len(frames)
+        if not count:
+            return
+        if count > self.capacity:
+            self.total += count - self.capacity
+            frames = frames[-self.capacity:]
+            count = self.capacity
+
+        # Column arrays for the whole batch, then at most two slice copies
+        columns = np.empty(count, dtype=CAPTURE_DTYPE)
+        columns["timestamp_ns"] = [frame.timestamp_ns for frame in frames]
+        columns["id"] = [frame.id for frame in frames]
+        columns["flags"] = [frame.flags for frame in frames]
+        columns["dlc"] = [len(frame.data) for frame in frames]
+        keys = [frame.channel for frame in frames]
+        channel_index = self._channel_index
+        for channel in set(keys).difference(channel_index):
+            channel_index[channel] = len(self.channels)
+            self.channels.append(channel)
+        columns["channel"] = [channel_index[channel] for channel in keys]
+        payload = b''.join(frame.data.ljust(PAYLOAD_SIZE, b'\0') for frame in frames)
+        columns["data"] = np.frombuffer(payload, dtype=np.uint8).reshape(count, PAYLOAD_SIZE)
+
+        timestamps = columns["timestamp_ns"]
+        backwards = np.flatnonzero(timestamps[1:] < timestamps[:-1])
+        if len(backwards):
+            self._last_unsorted = self.total + int(backwards[-1]) + 1
+        elif self._last_timestamp_ns is not None and timestamps[0] < self._last_timestamp_ns:
+            self._last_unsorted = self.total
+        self._last_timestamp_ns = int(timestamps[-1])
+
+        with self.lock:
+            start = self.total % self.capacity
+            first = min(count, self.capacity - start)
+            self.records[start:start + first] = columns[:first]
+            if count > first:
+                self.records[:count - first] = columns[first:]
+            self.total += count
+
+    def segments(self):
+        """The stored records, oldest first, as at most two views"""
+        start = self.total % self.capacity
+        if self.total <= self.capacity:
+            return [self.records[:self.total]]
+        return [self.records[start:], self.records[:start]]
+
+    @property
+    def is_sorted(self):
+        """True while the stored frames are in timestamp order"""
+        return self._last_unsorted is None or self._last_unsorted <= self.total - self.capacity
+
+    def time_range(self, start_ns=None, end_ns=None):
+        """Records with start_ns <= timestamp_ns < end_ns, as a list of arrays
+
+        Views found by binary search while the store is sorted, otherwise
+        copies selected with a mask, in arrival order.
+        """
+        views = []
+        search = self.is_sorted
+        for segment in self.segments():
+            timestamps = segment["timestamp_ns"]
+            if not search:
+                mask = np.ones(len(segment), dtype=bool)
+                if start_ns is not None:
+                    mask &= timestamps >= start_ns
+                if end_ns is not None:
+                    mask &= timestamps < end_ns
+                if mask.any():
+                    views.append(segment[mask])
+                continue
+            first = 0 if start_ns is None else np.searchsorted(timestamps, start_ns, side="left")
+            last = len(segment) if end_ns is None else np.searchsorted(timestamps, end_ns, side="left")
+            if last > first:
+                views.append(segment[first:last])
+        return views
+
+    def id_counts(self, start_ns=None, end_ns=None):
+        """{id: frames} over a time range"""
+        counts = {}
+        for view in self.time_range(start_ns, end_ns):
+            ids, hits = np.unique(view["id"], return_counts=True)
+            for can_id, hit in zip(ids.tolist(), hits.tolist()):
+                counts[can_id] = counts.get(can_id, 0) + hit
+        return counts
+
+    def to_frames(self, records):
+        """Rebuild CANFrames from stored records (copies)"""
+        channels = self.channels
+        return [
+            CANFrame(int(record["id"]), record["data"][:record["dlc"]].tobytes(), int(record["timestamp_ns"]),
+                     int(record["flags"]), channels[record["channel"]])
+            for record in records
+        ]
+
+    def export_csv(self, path, start_ns=None, end_ns=None):
+        """Write the stored frames (optionally a time range) as CSV, returns the frame count"""
+        count = 0
+        with open(path, 'w') as f:
+            f.write("timestamp_ns,channel,id,type,dlc,data\n")
+            for view in self.time_range(start_ns, end_ns):
+                for timestamp_ns, channel, can_id, flags, dlc, data in view.tolist():
+                    frame_type = "EXT" if flags & FLAG_EXTENDED else "STD"
+                    payload = data[:dlc].tobytes().hex(" ").upper()
+                    f.write(f"{timestamp_ns},{self.channels[channel] or ''},0x{can_id:X},{frame_type},{dlc},{payload}\n")
+                    count += 1
+        return count
+
+    def clear(self):
+        with self.lock:
+            self.total = 0
+            self._last_timestamp_ns = None
+            self._last_unsorted = None
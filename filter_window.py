@@ -17,6 +17,7 @@ class FilterWindow(QMainWindow):
         self.filter_type = filter_type  # "include" or "exclude"
         self.filtered_ids = set()
         self.received_messages = {}
+        self.is_active = False  # Shown and needing frames from the adapters
         
         # Display format options (same as main window)
         self.id_display_format = "Hex"
@@ -268,6 +269,10 @@ class FilterWindow(QMainWindow):
             
     def update_status(self):
         """Update the status label"""
+        # Filter IDs changed - the adapters may need to deliver a different set
+        if hasattr(self.main_window, 'apply_adapter_filters'):
+            self.main_window.apply_adapter_filters()
+        
         count = len(self.filtered_ids)
         if count == 0:
             self.status_label.setText("Status: No filters active")
@@ -335,21 +340,20 @@ class FilterWindow(QMainWindow):
             self.table.setItem(row, 0, id_item)
             
             # Type
-            msg_type = msg.get("type", "STD")
-            self.table.setItem(row, 1, QTableWidgetItem(msg_type))
+            self.table.setItem(row, 1, QTableWidgetItem(msg.type))
             
             # DLC
-            data = msg.get("data", [])
+            data = msg.data
             self.table.setItem(row, 2, QTableWidgetItem(str(len(data))))
             
             # Raw Data
             raw_item = QTableWidgetItem()
-            raw_item.setData(Qt.ItemDataRole.UserRole, data)
+            raw_item.setData(Qt.ItemDataRole.UserRole, list(data))
             raw_item.setText(self.format_data(data, self.raw_display_format))
             self.table.setItem(row, 3, raw_item)
             
-            # Decoded Signals
-            decoded = msg.get("decoded", {})
+            # Decoded Signals (decoded by the main window, per ID)
+            decoded = getattr(self.main_window, 'decoded_by_id', {}).get(can_id, {})
             decoded_str = json.dumps(decoded) if decoded else ""
             self.table.setItem(row, 4, QTableWidgetItem(decoded_str))
             
@@ -435,23 +439,26 @@ class FilterWindow(QMainWindow):
     
     def update_timestamp_for_row(self, row, msg):
         """Update timestamp for a specific row (same logic as main window)"""
-        raw_time = msg["timestamp"]
+        raw_time = msg.timestamp_ns
         ts_text = ""
         if self.time_mode == "Absolute": 
-            ts_text = raw_time.strftime("%H:%M:%S.%f")[:-3]
+            ts_text = msg.timestamp.strftime("%H:%M:%S.%f")[:-3]
         elif self.time_mode == "Incremental":
-            delta = 0.0 if self.last_timestamp_global is None else (raw_time - self.last_timestamp_global).total_seconds()
+            delta = 0.0 if self.last_timestamp_global is None else (raw_time - self.last_timestamp_global) / 1e9
             ts_text = f"{delta:.3f}s"
             self.last_timestamp_global = raw_time
         elif self.time_mode == "Differential":
-            last = self.last_timestamp_by_id.get(msg["id"])
-            delta = 0.0 if last is None else (raw_time - last).total_seconds()
+            last = self.last_timestamp_by_id.get(msg.id)
+            delta = 0.0 if last is None else (raw_time - last) / 1e9
             ts_text = f"{delta:.3f}s"
-            self.last_timestamp_by_id[msg["id"]] = raw_time
+            self.last_timestamp_by_id[msg.id] = raw_time
         self.set_table_item(row, 5, ts_text)
             
     def closeEvent(self, event):
         """Clean up when closing the filter window"""
         if self.timer:
             self.timer.stop()
+        self.is_active = False
+        if hasattr(self.main_window, 'apply_adapter_filters'):
+            self.main_window.apply_adapter_filters()
         event.accept()
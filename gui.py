@@ -5,15 +5,21 @@ from PyQt6.QtWidgets import (
     QMessageBox, QSpinBox, QCheckBox, QLineEdit, QGroupBox, QHeaderView
 )
 from PyQt6.QtGui import QAction
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtCore import QTimer, Qt, QThread, pyqtSignal
 from message_processor import MessageProcessor
 from dbc_manager import DBCManager
 from slcan_manager import SLCANManager
+from slcan_pool import SLCANPool
 from pcan_manager import PCANManager
+from python_can_manager import PythonCANManager
 from transmit_window import TransmitWindow
 from log_replay_window import LogReplayWindow
 from filter_window import FilterWindow
-import random, datetime, json
+from can_frame import CANFrame
+from ingest_queue import IngestQueue
+from overload_policy import OverloadPolicy
+from capture_store import CaptureStore, NUMPY_AVAILABLE
+import random, time, json
 
 class SLCANConnectionDialog(QDialog):
     def __init__(self, slcan_manager):
@@ -67,6 +73,17 @@ class SLCANConnectionDialog(QDialog):
         self.loopback_cb.setToolTip("Receive your own transmitted messages (useful for testing)")
         layout.addWidget(self.loopback_cb)
         
+        # Hardware timestamp checkbox
+        self.timestamps_cb = QCheckBox("Hardware Timestamps (Z1)")
+        self.timestamps_cb.setToolTip("Stamp frames with the device's millisecond counter (lower jitter)")
+        layout.addWidget(self.timestamps_cb)
+        
+        # Out-of-process reader checkbox
+        self.reader_process_cb = QCheckBox("Read in Separate Process")
+        self.reader_process_cb.setToolTip("Capture into a shared-memory buffer so a busy GUI cannot cause frame loss")
+        self.reader_process_cb.setChecked(self.slcan_manager.reader_process)
+        layout.addWidget(self.reader_process_cb)
+        
         # Connect button
         self.connect_btn = QPushButton("Connect")
         self.connect_btn.clicked.connect(self.connect_device)
@@ -145,6 +162,8 @@ class SLCANConnectionDialog(QDialog):
         port = self.port_combo.currentText()
         baudrate = int(self.baud_combo.currentText())
         loopback = self.loopback_cb.isChecked()
+        timestamps = self.timestamps_cb.isChecked()
+        self.slcan_manager.reader_process = self.reader_process_cb.isChecked()
         
         if not port:
             QMessageBox.warning(self, "Error", "Please select a serial port")
@@ -152,11 +171,12 @@ class SLCANConnectionDialog(QDialog):
         
         self.status_label.setText("Connecting...")
         
-        if self.slcan_manager.connect(port, baudrate, loopback):
+        if self.slcan_manager.connect(port, baudrate, loopback, timestamps):
             can_bitrate = int(self.can_baud_combo.currentText())
             if self.slcan_manager.set_bitrate(can_bitrate, loopback):
                 loopback_text = " (Loopback ON)" if loopback else ""
-                self.status_label.setText(f"Connected to {port} at {baudrate} baud, CAN: {can_bitrate}bps{loopback_text}")
+                connect_ms = self.slcan_manager.connect_time * 1000
+                self.status_label.setText(f"Connected to {port} at {baudrate} baud, CAN: {can_bitrate}bps{loopback_text} in {connect_ms:.0f} ms")
                 self.connect_btn.setEnabled(False)
                 self.disconnect_btn.setEnabled(True)
                 self.device_info_btn.setEnabled(True)
@@ -200,6 +220,9 @@ class SLCANConnectionDialog(QDialog):
         info = self.slcan_manager.check_device_info()
         if info:
             msg = f"Device Information:\n\nType: {info.get('type', 'Unknown')}\nVersion: {repr(info['version'])}\nSerial: {repr(info['serial'])}"
+            msg += f"\nTX Format: {info.get('tx_format') or 'Not learned yet'}"
+            if info.get('loopback') is not None:
+                msg += f"\nLoopback: {'Supported' if info['loopback'] else 'Not supported'}"
             
             # Add specific advice for WeAct Studio
             if info.get('type') == 'WeAct Studio':
@@ -255,6 +278,114 @@ class SLCANConnectionDialog(QDialog):
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Error sending message: {e}")
 
+class SLCANPoolDialog(QDialog):
+    def __init__(self, slcan_pool, port_lister):
+        super().__init__()
+        self.setWindowTitle("SLCAN Multi-Device")
+        self.resize(600, 400)
+        self.slcan_pool = slcan_pool
+        self.port_lister = port_lister
+        
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        
+        # Add device row
+        add_layout = QHBoxLayout()
+        layout.addLayout(add_layout)
+        add_layout.addWidget(QLabel("Port:"))
+        self.port_combo = QComboBox()
+        self.port_combo.addItems(self.port_lister())
+        add_layout.addWidget(self.port_combo)
+        
+        add_layout.addWidget(QLabel("Channel:"))
+        self.channel_input = QLineEdit(f"CAN{len(self.slcan_pool.devices)}")
+        add_layout.addWidget(self.channel_input)
+        
+        add_layout.addWidget(QLabel("CAN Bitrate:"))
+        self.can_baud_combo = QComboBox()
+        self.can_baud_combo.addItems([
+            "10000", "20000", "50000", "100000",
+            "125000", "250000", "500000", "800000", "1000000"
+        ])
+        self.can_baud_combo.setCurrentText("500000")
+        add_layout.addWidget(self.can_baud_combo)
+        
+        self.timestamps_cb = QCheckBox("HW Timestamps")
+        add_layout.addWidget(self.timestamps_cb)
+        
+        add_btn = QPushButton("Add Device")
+        add_btn.clicked.connect(self.add_device)
+        add_layout.addWidget(add_btn)
+        
+        # Per-device statistics
+        self.device_table = QTableWidget()
+        self.device_table.setColumnCount(6)
+        self.device_table.setHorizontalHeaderLabels(["Channel", "Frames/s", "Received", "Dropped", "Late", "Remove"])
+        self.device_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.device_table)
+        
+        disconnect_btn = QPushButton("Disconnect All")
+        disconnect_btn.clicked.connect(self.disconnect_all)
+        layout.addWidget(disconnect_btn)
+        
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self.update_stats)
+        self.stats_timer.start(500)
+        self.refresh_devices()
+    
+    def add_device(self):
+        port = self.port_combo.currentText()
+        channel = self.channel_input.text().strip()
+        if not port or not channel:
+            QMessageBox.warning(self, "Error", "Please select a serial port and a channel name")
+            return
+        
+        self.status_label.setText(f"Connecting {channel} on {port}...")
+        bitrate = int(self.can_baud_combo.currentText())
+        if self.slcan_pool.add_device(channel, port, bitrate=bitrate, timestamps=self.timestamps_cb.isChecked()):
+            self.status_label.setText(f"✓ {channel} connected on {port}")
+            self.channel_input.setText(f"CAN{len(self.slcan_pool.devices)}")
+        else:
+            self.status_label.setText(f"✗ Failed to connect {channel} on {port}")
+        self.refresh_devices()
+    
+    def remove_device(self, channel):
+        self.slcan_pool.remove_device(channel)
+        self.refresh_devices()
+    
+    def disconnect_all(self):
+        self.slcan_pool.disconnect_all()
+        self.refresh_devices()
+    
+    def refresh_devices(self):
+        channels = self.slcan_pool.get_channels()
+        self.device_table.setRowCount(len(channels))
+        for row, channel in enumerate(channels):
+            self.device_table.setItem(row, 0, QTableWidgetItem(channel))
+            remove_btn = QPushButton("Remove")
+            remove_btn.clicked.connect(lambda checked, ch=channel: self.remove_device(ch))
+            self.device_table.setCellWidget(row, 5, remove_btn)
+        self.update_stats()
+    
+    def update_stats(self):
+        stats = self.slcan_pool.get_stats()
+        for row in range(self.device_table.rowCount()):
+            item = self.device_table.item(row, 0)
+            channel_stats = stats.get(item.text()) if item else None
+            if not channel_stats:
+                continue
+            self.device_table.setItem(row, 1, QTableWidgetItem(f"{channel_stats['frames_per_second']:.0f}"))
+            self.device_table.setItem(row, 2, QTableWidgetItem(str(channel_stats['received'])))
+            self.device_table.setItem(row, 3, QTableWidgetItem(str(channel_stats['dropped'])))
+            self.device_table.setItem(row, 4, QTableWidgetItem(str(channel_stats['late'])))
+    
+    def done(self, result):
+        self.stats_timer.stop()
+        super().done(result)
+
 class ConversionDialog(QDialog):
     def __init__(self, dbc_manager):
         super().__init__()
@@ -287,12 +418,33 @@ class ConversionDialog(QDialog):
             if dbc_file:
                 self.dbc_manager.symb_to_dbc(symb_file, dbc_file)
 
+class PCANDiscoveryThread(QThread):
+    """Discovers (or tests) PCAN channels off the GUI thread"""
+    channel_found = pyqtSignal(str, object)         # name, channel
+    channel_tested = pyqtSignal(str, object, bool)  # name, channel, available
+    discovery_finished = pyqtSignal()
+    
+    def __init__(self, pcan_manager, refresh=False, test_baudrate=None):
+        super().__init__()
+        self.pcan_manager = pcan_manager
+        self.refresh = refresh
+        self.test_baudrate = test_baudrate  # None = discover only
+    
+    def run(self):
+        channels = self.pcan_manager.list_available_channels(refresh=self.refresh, on_found=self.channel_found.emit)
+        if self.test_baudrate is not None:
+            self.pcan_manager.test_channels(channels, self.test_baudrate, on_result=self.channel_tested.emit)
+        self.discovery_finished.emit()
+
+
 class PCANConnectionDialog(QDialog):
     def __init__(self, pcan_manager):
         super().__init__()
         self.setWindowTitle("PCAN Connection")
         self.resize(400, 300)
         self.pcan_manager = pcan_manager
+        self.discovery_thread = None
+        self.test_results = []
         
         layout = QVBoxLayout()
         self.setLayout(layout)
@@ -307,13 +459,13 @@ class PCANConnectionDialog(QDialog):
         channel_controls = QHBoxLayout()
         channel_layout.addLayout(channel_controls)
         
-        refresh_btn = QPushButton("Refresh Channels")
-        refresh_btn.clicked.connect(self.refresh_channels)
-        channel_controls.addWidget(refresh_btn)
+        self.refresh_btn = QPushButton("Refresh Channels")
+        self.refresh_btn.clicked.connect(lambda: self.refresh_channels(force=True))
+        channel_controls.addWidget(self.refresh_btn)
         
-        test_all_btn = QPushButton("Test All")
-        test_all_btn.clicked.connect(self.test_all_channels)
-        channel_controls.addWidget(test_all_btn)
+        self.test_all_btn = QPushButton("Test All")
+        self.test_all_btn.clicked.connect(self.test_all_channels)
+        channel_controls.addWidget(self.test_all_btn)
         
         channel_controls.addStretch()
         
@@ -337,6 +489,13 @@ class PCANConnectionDialog(QDialog):
         self.baud_combo.setCurrentText("500000")
         baud_layout.addWidget(self.baud_combo)
         
+        # Reader thread mode
+        self.multiplexed_cb = QCheckBox("Single Reader Thread for All Channels")
+        self.multiplexed_cb.setToolTip("Read every connected channel from one thread instead of one thread per channel")
+        self.multiplexed_cb.setChecked(self.pcan_manager.multiplexed_reader)
+        self.multiplexed_cb.toggled.connect(self.on_multiplexed_toggled)
+        layout.addWidget(self.multiplexed_cb)
+        
         # Connect button
         self.connect_btn = QPushButton("Connect")
         self.connect_btn.clicked.connect(self.connect_device)
@@ -380,59 +539,139 @@ class PCANConnectionDialog(QDialog):
         send_btn = QPushButton("Send Message")
         send_btn.clicked.connect(self.send_message)
         layout.addWidget(send_btn)
+        
+        # Bus health of connected channels, from the manager's monitor snapshot
+        self.health_timer = QTimer()
+        self.health_timer.timeout.connect(self.update_health)
+        self.health_timer.start(500)
+    
+    def update_health(self):
+        health = self.pcan_manager.get_bus_health()
+        for row in range(self.channel_table.rowCount()):
+            item = self.channel_table.item(row, 0)
+            channel_health = health.get(item.data(Qt.ItemDataRole.UserRole)) if item else None
+            if not channel_health:
+                continue
+            text = f"Connected · {channel_health['state']}"
+            if channel_health['bus_load'] is not None:
+                text += f" · {channel_health['bus_load']:.0f}% load"
+            status_item = QTableWidgetItem(text)
+            errors = (f"RX/TX errors: {channel_health['rx_errors']}/{channel_health['tx_errors']}"
+                      if channel_health['rx_errors'] is not None else "RX/TX errors: n/a")
+            status_item.setToolTip(
+                f"{errors}\n"
+                f"Error frames: {channel_health['error_frames']}\n"
+                f"Queue overruns: {channel_health['overruns']}\n"
+                f"Read errors: {channel_health['read_errors']}\n"
+                f"Frames/s: {channel_health['frames_per_second']:.0f}"
+            )
+            self.channel_table.setItem(row, 1, status_item)
+    
+    def on_multiplexed_toggled(self, checked):
+        # Applies to channels that start listening after the change
+        self.pcan_manager.multiplexed_reader = checked
     
-    def refresh_channels(self):
-        """Refresh the list of available PCAN channels with status"""
+    def refresh_channels(self, force=False):
+        """Refresh the list of available PCAN channels with status
+        
+        Uses the manager's cached topology when it is still valid;
+        otherwise channels are discovered in the background and rows are
+        added as they are found.
+        """
+        if self.discovery_thread and self.discovery_thread.isRunning():
+            return
         self.channel_table.setRowCount(0)
-        channels = self.pcan_manager.list_available_channels()
+        self.start_discovery(refresh=force)
+    
+    def start_discovery(self, refresh=False, test_baudrate=None):
+        self.refresh_btn.setEnabled(False)
+        self.test_all_btn.setEnabled(False)
+        self.discovery_thread = PCANDiscoveryThread(self.pcan_manager, refresh, test_baudrate)
+        self.discovery_thread.channel_found.connect(self.add_channel_row)
+        self.discovery_thread.channel_tested.connect(self.on_channel_tested)
+        self.discovery_thread.discovery_finished.connect(self.on_discovery_finished)
+        self.discovery_thread.start()
+    
+    def on_discovery_finished(self):
+        self.refresh_btn.setEnabled(True)
+        self.test_all_btn.setEnabled(True)
+        if self.discovery_thread.test_baudrate is not None:
+            self.show_test_results()
+    
+    def find_channel_row(self, channel):
+        for row in range(self.channel_table.rowCount()):
+            item = self.channel_table.item(row, 0)
+            if item and item.data(Qt.ItemDataRole.UserRole) == channel:
+                return row
+        return -1
+    
+    def add_channel_row(self, name, channel):
+        """Add (or update) the table row of a discovered channel"""
+        i = self.find_channel_row(channel)
+        if i < 0:
+            i = self.channel_table.rowCount()
+            self.channel_table.insertRow(i)
+        
+        # Channel name
+        name_item = QTableWidgetItem(name)
+        name_item.setData(Qt.ItemDataRole.UserRole, channel)
+        self.channel_table.setItem(i, 0, name_item)
+        
+        # Status
+        status = "Disconnected"
+        if hasattr(self.pcan_manager, 'connected_channels'):
+            if channel in self.pcan_manager.connected_channels:
+                status = "Connected"
+        self.channel_table.setItem(i, 1, QTableWidgetItem(status))
+        
+        # Connect/Disconnect button
+        if status == "Connected":
+            conn_btn = QPushButton("Disconnect")
+            conn_btn.clicked.connect(lambda checked, ch=channel: self.disconnect_channel(ch))
+        else:
+            conn_btn = QPushButton("Connect")
+            conn_btn.clicked.connect(lambda checked, ch=channel: self.connect_channel(ch))
+        self.channel_table.setCellWidget(i, 2, conn_btn)
         
-        self.channel_table.setRowCount(len(channels))
-        for i, (name, channel) in enumerate(channels):
-            # Channel name
-            self.channel_table.setItem(i, 0, QTableWidgetItem(name))
-            
-            # Status
-            status = "Disconnected"
-            if hasattr(self.pcan_manager, 'connected_channels'):
-                if channel in self.pcan_manager.connected_channels:
-                    status = "Connected"
-            self.channel_table.setItem(i, 1, QTableWidgetItem(status))
-            
-            # Connect/Disconnect button
-            if status == "Connected":
-                conn_btn = QPushButton("Disconnect")
-                conn_btn.clicked.connect(lambda checked, ch=channel: self.disconnect_channel(ch))
-            else:
-                conn_btn = QPushButton("Connect")
-                conn_btn.clicked.connect(lambda checked, ch=channel: self.connect_channel(ch))
-            self.channel_table.setCellWidget(i, 2, conn_btn)
-            
-            # Test button
-            test_btn = QPushButton("Test")
-            test_btn.clicked.connect(lambda checked, ch=channel: self.test_channel(ch))
-            self.channel_table.setCellWidget(i, 3, test_btn)
-            
-            # Send test message button
-            send_btn = QPushButton("Send Test")
-            send_btn.clicked.connect(lambda checked, ch=channel: self.send_test_message(ch))
-            send_btn.setEnabled(status == "Connected")
-            self.channel_table.setCellWidget(i, 4, send_btn)
+        # Test button
+        test_btn = QPushButton("Test")
+        test_btn.clicked.connect(lambda checked, ch=channel: self.test_channel(ch))
+        self.channel_table.setCellWidget(i, 3, test_btn)
+        
+        # Send test message button
+        send_btn = QPushButton("Send Test")
+        send_btn.clicked.connect(lambda checked, ch=channel: self.send_test_message(ch))
+        send_btn.setEnabled(status == "Connected")
+        self.channel_table.setCellWidget(i, 4, send_btn)
     
     def test_all_channels(self):
-        """Test all available PCAN channels"""
-        channels = self.pcan_manager.list_available_channels()
-        results = []
-        
-        for name, channel in channels:
-            baudrate = self.pcan_manager.get_baudrate_value(self.baud_combo.currentText())
-            result = self.pcan_manager.test_connection(channel, baudrate)
-            results.append(f"{name}: {'✓ Available' if result else '✗ Not available'}")
-        
-        if results:
-            QMessageBox.information(self, "Test Results", "\n".join(results))
+        """Test all available PCAN channels in the background"""
+        if self.discovery_thread and self.discovery_thread.isRunning():
+            return
+        self.test_results = []
+        self.status_label.setText("Testing channels...")
+        baudrate = self.pcan_manager.get_baudrate_value(self.baud_combo.currentText())
+        self.start_discovery(test_baudrate=baudrate)
+    
+    def on_channel_tested(self, name, channel, result):
+        self.test_results.append(f"{name}: {'✓ Available' if result else '✗ Not available'}")
+        row = self.find_channel_row(channel)
+        if row >= 0 and channel not in self.pcan_manager.connected_channels:
+            self.channel_table.setItem(row, 1, QTableWidgetItem("Available" if result else "Not available"))
+    
+    def show_test_results(self):
+        self.status_label.setText(f"Tested {len(self.test_results)} channel(s)")
+        if self.test_results:
+            QMessageBox.information(self, "Test Results", "\n".join(self.test_results))
         else:
             QMessageBox.warning(self, "Test Results", "No PCAN channels found")
     
+    def done(self, result):
+        self.health_timer.stop()
+        if self.discovery_thread and self.discovery_thread.isRunning():
+            self.discovery_thread.wait()
+        super().done(result)
+    
     def connect_channel(self, channel):
         """Connect to a specific PCAN channel"""
         baudrate = self.pcan_manager.get_baudrate_value(self.baud_combo.currentText())
@@ -509,12 +748,13 @@ class PCANConnectionDialog(QDialog):
             QMessageBox.warning(self, "Error", "Please select at least one PCAN channel")
             return
         
-        channels = self.pcan_manager.list_available_channels()
         success_count = 0
         
         for row in selected_rows:
-            if row < len(channels):
-                name, channel = channels[row]
+            # Rows are added in discovery order, the channel is stored on the name cell
+            item = self.channel_table.item(row, 0)
+            if item:
+                channel = item.data(Qt.ItemDataRole.UserRole)
                 baudrate = self.pcan_manager.get_baudrate_value(self.baud_combo.currentText())
                 success, message = self.pcan_manager.connect_channel(channel, baudrate)
                 if success:
@@ -575,6 +815,104 @@ class PCANConnectionDialog(QDialog):
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Send error: {str(e)}")
 
+class PythonCANConnectionDialog(QDialog):
+    def __init__(self, bus_manager):
+        super().__init__()
+        self.setWindowTitle("python-can Connection")
+        self.resize(400, 250)
+        self.bus_manager = bus_manager
+        
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        
+        # Interface selection
+        interface_layout = QHBoxLayout()
+        layout.addLayout(interface_layout)
+        interface_layout.addWidget(QLabel("Interface:"))
+        self.interface_combo = QComboBox()
+        self.interface_combo.addItems(self.bus_manager.list_interfaces())
+        self.interface_combo.setCurrentText(self.bus_manager.interface or "socketcan")
+        interface_layout.addWidget(self.interface_combo)
+        
+        # Channel selection (any text the interface accepts, e.g. can0, vcan0, PCAN_USBBUS1)
+        channel_layout = QHBoxLayout()
+        layout.addLayout(channel_layout)
+        channel_layout.addWidget(QLabel("Channel:"))
+        self.channel_combo = QComboBox()
+        self.channel_combo.setEditable(True)
+        self.channel_combo.setCurrentText(str(self.bus_manager.channel or "can0"))
+        channel_layout.addWidget(self.channel_combo)
+        
+        detect_btn = QPushButton("Detect")
+        detect_btn.clicked.connect(self.detect_channels)
+        channel_layout.addWidget(detect_btn)
+        
+        # CAN Bitrate selection (set with ip link for SocketCAN)
+        bitrate_layout = QHBoxLayout()
+        layout.addLayout(bitrate_layout)
+        bitrate_layout.addWidget(QLabel("CAN Bitrate:"))
+        self.bitrate_combo = QComboBox()
+        self.bitrate_combo.addItems(["1000000", "500000", "250000", "125000", "100000", "50000", "20000", "10000"])
+        self.bitrate_combo.setCurrentText("500000")
+        bitrate_layout.addWidget(self.bitrate_combo)
+        
+        # Receive mode
+        self.notifier_cb = QCheckBox("Use python-can Notifier")
+        self.notifier_cb.setToolTip("Deliver frames through a can.Notifier (one at a time) instead of batched Bus.recv reads")
+        self.notifier_cb.setChecked(self.bus_manager.receive_mode == "notifier")
+        layout.addWidget(self.notifier_cb)
+        
+        # Connect button
+        self.connect_btn = QPushButton("Connect")
+        self.connect_btn.clicked.connect(self.connect_device)
+        self.connect_btn.setEnabled(not self.bus_manager.is_connected)
+        layout.addWidget(self.connect_btn)
+        
+        # Disconnect button
+        self.disconnect_btn = QPushButton("Disconnect")
+        self.disconnect_btn.clicked.connect(self.disconnect_device)
+        self.disconnect_btn.setEnabled(self.bus_manager.is_connected)
+        layout.addWidget(self.disconnect_btn)
+        
+        # Status label
+        status = f"Connected to {self.bus_manager.source}" if self.bus_manager.is_connected else "Disconnected"
+        self.status_label = QLabel(f"Status: {status}")
+        layout.addWidget(self.status_label)
+    
+    def detect_channels(self):
+        interface = self.interface_combo.currentText()
+        channels = [str(channel) for found, channel in self.bus_manager.list_available_channels([interface]) if found == interface]
+        self.channel_combo.clear()
+        self.channel_combo.addItems(channels)
+        self.status_label.setText(f"Found {len(channels)} {interface} channel(s)")
+    
+    def connect_device(self):
+        interface = self.interface_combo.currentText()
+        channel = self.channel_combo.currentText().strip()
+        bitrate = int(self.bitrate_combo.currentText())
+        self.bus_manager.receive_mode = "notifier" if self.notifier_cb.isChecked() else "recv"
+        
+        if not channel:
+            QMessageBox.warning(self, "Error", "Please enter a channel")
+            return
+        
+        self.status_label.setText("Connecting...")
+        success, message = self.bus_manager.connect(interface, channel, bitrate)
+        if success:
+            self.status_label.setText(f"Connected to {self.bus_manager.source}")
+            self.connect_btn.setEnabled(False)
+            self.disconnect_btn.setEnabled(True)
+        else:
+            self.status_label.setText("Connection failed")
+            QMessageBox.warning(self, "Error", message)
+    
+    def disconnect_device(self):
+        self.bus_manager.disconnect()
+        self.status_label.setText("Status: Disconnected")
+        self.connect_btn.setEnabled(True)
+        self.disconnect_btn.setEnabled(False)
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -602,10 +940,19 @@ class MainWindow(QMainWindow):
         self.slcan_action.triggered.connect(self.open_slcan_dialog)
         self.hardware_menu.addAction(self.slcan_action)
         
+        self.slcan_pool_action = QAction("SLCAN Multi-Device", self)
+        self.slcan_pool_action.triggered.connect(self.open_slcan_pool_dialog)
+        self.hardware_menu.addAction(self.slcan_pool_action)
+        
         # Add PCAN menu item
         self.pcan_action = QAction("PCAN Connection", self)
         self.pcan_action.triggered.connect(self.open_pcan_dialog)
         self.hardware_menu.addAction(self.pcan_action)
+        
+        # Add python-can menu item (SocketCAN, virtual and other python-can interfaces)
+        self.python_can_action = QAction("python-can Connection", self)
+        self.python_can_action.triggered.connect(self.open_python_can_dialog)
+        self.hardware_menu.addAction(self.python_can_action)
 
         self.dbc_menu = QMenu("DBC", self)
         self.menu_bar.addMenu(self.dbc_menu)
@@ -627,6 +974,10 @@ class MainWindow(QMainWindow):
         self.stop_log_action = QAction("Stop Log", self)
         self.stop_log_action.triggered.connect(self.stop_log)
         self.log_menu.addAction(self.stop_log_action)
+        self.export_capture_action = QAction("Export Capture (.csv)", self)
+        self.export_capture_action.triggered.connect(self.export_capture)
+        self.export_capture_action.setEnabled(NUMPY_AVAILABLE)
+        self.log_menu.addAction(self.export_capture_action)
 
         self.transmit_menu = QMenu("Transmit", self)
         self.menu_bar.addMenu(self.transmit_menu)
@@ -670,6 +1021,8 @@ class MainWindow(QMainWindow):
         self.status_layout = QHBoxLayout()
         self.label_status = QLabel("Status: Disconnected")
         self.status_layout.addWidget(self.label_status)
+        self.label_ingest = QLabel("")
+        self.status_layout.addWidget(self.label_ingest)
 
         self.autoscroll_enabled = True
         self.autoscroll_btn = QPushButton("Autoscroll")
@@ -699,9 +1052,25 @@ class MainWindow(QMainWindow):
         # Managers
         self.dbc_manager = DBCManager()
         self.slcan_manager = SLCANManager()
+        self.slcan_pool = SLCANPool()
         self.pcan_manager = PCANManager()
+        self.python_can_manager = PythonCANManager()
         self.processor = MessageProcessor(self.dbc_manager)
         
+        # Adapter threads only queue frames; the GUI thread applies them at a fixed rate
+        self.ingest_queue = IngestQueue()
+        self.ingest_timer = QTimer()
+        self.ingest_timer.timeout.connect(self.drain_ingest_queue)
+        self.set_ingest_rate(30)
+        self._ingest_status_time = 0.0
+        
+        # Views get the latest frame per ID, less often above a frame rate; recording still gets every frame
+        self.overload_policy = OverloadPolicy()
+        
+        # Full history of received frames (needs NumPy); views read from it instead of keeping copies
+        self.capture_store = None
+        self.set_capture_capacity(1000000)
+        
         # SLCAN state
         self.using_slcan = False
         # PCAN state
@@ -723,6 +1092,7 @@ class MainWindow(QMainWindow):
         # IDs fixos
         self.test_ids = [0x100,0x101,0x102,0x103,0x104]
         self.messages_by_id = {}
+        self.decoded_by_id = {}   # Latest decoded signals per ID, kept out of the frames
 
         # Formatos atuais
         self.id_display_format = "Hex"
@@ -756,6 +1126,49 @@ class MainWindow(QMainWindow):
         else:
             return True  # No filters enabled = show all
 
+    def compute_adapter_filter(self):
+        """Work out which IDs any view still needs from the adapters
+        
+        Returns (include_ids, exclude_ids): include_ids is None when every ID
+        is needed except exclude_ids. Combines the main window filter with
+        the open filter windows, so an open window never loses its frames.
+        """
+        needs = []
+        if self.main_include_filter_enabled and self.main_include_ids:
+            needs.append(("include", set(self.main_include_ids)))
+        elif self.main_exclude_filter_enabled and self.main_exclude_ids:
+            needs.append(("exclude", set(self.main_exclude_ids)))
+        else:
+            needs.append(("exclude", set()))
+        
+        for window in (self.include_filter_window, self.exclude_filter_window):
+            if window is not None and window.is_active:
+                if window.filtered_ids:
+                    needs.append((window.filter_type, set(window.filtered_ids)))
+                else:
+                    needs.append(("exclude", set()))
+        
+        # Union of everything needed: any "all except" need makes the result an exclude set
+        includes = set().union(*(ids for kind, ids in needs if kind == "include"))
+        excludes = [ids for kind, ids in needs if kind == "exclude"]
+        if excludes:
+            return None, set.intersection(*excludes) - includes
+        return includes, set()
+    
+    def apply_adapter_filters(self):
+        """Push the current ID filters down to the connected adapters"""
+        include_ids, exclude_ids = self.compute_adapter_filter()
+        self.slcan_manager.set_id_filter(include_ids, exclude_ids)
+        self.slcan_pool.set_id_filter(include_ids, exclude_ids)
+        self.pcan_manager.set_id_filter(include_ids, exclude_ids)
+        self.python_can_manager.set_id_filter(include_ids, exclude_ids)
+        
+        # Drop what the adapters no longer deliver so stale rows do not linger
+        if include_ids is not None or exclude_ids:
+            for can_id in list(self.received_messages):
+                if (include_ids is not None and can_id not in include_ids) or can_id in exclude_ids:
+                    self.received_messages.pop(can_id, None)
+    
     def get_filtered_test_ids(self):
         """Get test IDs that should be shown based on main window filters"""
         if not (self.main_include_filter_enabled or self.main_exclude_filter_enabled):
@@ -811,26 +1224,60 @@ class MainWindow(QMainWindow):
         dlg.exec()
     def open_slcan_dialog(self):
         dlg = SLCANConnectionDialog(self.slcan_manager)
-        # Connect SLCAN message callback
-        if not self.using_slcan:
-            self.slcan_manager.start_listening(self.on_slcan_message)
-            self.using_slcan = True
         dlg.exec()
+        
+        # Start listening once the dialog has connected the device; the receive
+        # thread also carries the transmit acknowledgements
+        if self.slcan_manager.is_connected and not self.slcan_manager.is_listening:
+            self.using_slcan = self.slcan_manager.start_listening(self.ingest_queue.put, self.ingest_queue.put_batch)
+    
+    def open_slcan_pool_dialog(self):
+        dlg = SLCANPoolDialog(self.slcan_pool, self.slcan_manager.list_serial_ports)
+        dlg.exec()
+        
+        # The merged stream from all pool devices feeds the same views as a single adapter
+        if self.slcan_pool.devices and not self.slcan_pool.is_listening:
+            self.slcan_pool.start_listening(self.ingest_queue.put, self.ingest_queue.put_batch)
+            self.using_slcan = True
     
     def open_pcan_dialog(self):
         dlg = PCANConnectionDialog(self.pcan_manager)
         # Connect PCAN message callback for all channels
         if not hasattr(self, 'using_pcan') or not self.using_pcan:
             # Start listening on all connected channels
-            for channel in self.pcan_manager.get_connected_channels():
-                self.pcan_manager.start_channel_listening(channel, self.on_pcan_message)
+            self.start_pcan_listening()
             self.using_pcan = True
         dlg.exec()
         
         # After dialog closes, refresh listening for any newly connected channels
+        self.start_pcan_listening()
+    
+    def open_python_can_dialog(self):
+        dlg = PythonCANConnectionDialog(self.python_can_manager)
+        dlg.exec()
+        
+        if self.python_can_manager.is_connected and not self.python_can_manager.is_listening:
+            self.apply_adapter_filters()
+            self.python_can_manager.start_listening(self.ingest_queue.put, self.ingest_queue.put_batch)
+    
+    def start_pcan_listening(self):
+        """Start receiving on every connected PCAN channel not yet being read"""
+        if self.pcan_manager.multiplexed_reader:
+            self.pcan_manager.start_multiplexed_listening(self.ingest_queue.put, self.ingest_queue.put_batch)
+            return
         for channel in self.pcan_manager.get_connected_channels():
-            if channel not in self.pcan_manager.channel_listeners:
-                self.pcan_manager.start_channel_listening(channel, self.on_pcan_message)
+            if not self.pcan_manager.is_channel_listening(channel):
+                self.pcan_manager.start_channel_listening(channel, self.ingest_queue.put, self.ingest_queue.put_batch)
+    
+    def export_capture(self):
+        """Save the capture history as CSV"""
+        if self.capture_store is None or not len(self.capture_store):
+            QMessageBox.information(self, "Export Capture", "No frames captured yet")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(self, "Export Capture", "capture.csv", "CSV Files (*.csv)")
+        if file_name:
+            count = self.capture_store.export_csv(file_name)
+            self.label_status.setText(f"Exported {count} frames to {file_name}")
     
     def start_log(self): self.label_status.setText("Logging started (simulated)")
     def stop_log(self): self.label_status.setText("Logging stopped (simulated)")
@@ -889,6 +1336,8 @@ class MainWindow(QMainWindow):
             
             print("Showing include filter window...")
             self.include_filter_window.show()
+            self.include_filter_window.is_active = True
+            self.apply_adapter_filters()
             self.include_filter_window.raise_()
             self.include_filter_window.activateWindow()
             print("Include filter window should be visible now")
@@ -908,6 +1357,8 @@ class MainWindow(QMainWindow):
             
             print("Showing exclude filter window...")
             self.exclude_filter_window.show()
+            self.exclude_filter_window.is_active = True
+            self.apply_adapter_filters()
             self.exclude_filter_window.raise_()
             self.exclude_filter_window.activateWindow()
             print("Exclude filter window should be visible now")
@@ -936,6 +1387,8 @@ class MainWindow(QMainWindow):
     
     def refresh_table_for_filters(self):
         """Refresh the main window table when filters change"""
+        self.apply_adapter_filters()
+        
         if self.enable_test_messages:
             # Re-initialize test messages with new filters
             self.initialize_test_messages()
@@ -1099,47 +1552,54 @@ class MainWindow(QMainWindow):
         
         dialog.exec()
     
-    def on_slcan_message(self, message):
-        """Handle incoming SLCAN messages"""
-        msg_id = message["id"]
-        self.received_messages[msg_id] = message
-        
-        # Update the table if this ID is being displayed
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item:
-                displayed_id = item.data(Qt.ItemDataRole.UserRole)
-                if displayed_id == msg_id:
-                    self.update_row_with_message(row, message)
-                    break
+    def set_ingest_rate(self, rate_hz):
+        """How often (Hz) queued frames are applied to the views"""
+        self.ingest_timer.start(max(1, int(1000 / rate_hz)))
     
-    def on_pcan_message(self, message):
-        """Handle incoming PCAN messages"""
-        msg_id = message["id"]
-        self.received_messages[msg_id] = message
-        
-        # Update the table if this ID is being displayed
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item:
-                displayed_id = item.data(Qt.ItemDataRole.UserRole)
-                if displayed_id == msg_id:
-                    self.update_row_with_message(row, message)
-                    break
+    def set_display_rate_limit(self, frames_per_second):
+        """Ingest rate (frames/s) above which view updates drop to the overload refresh rate"""
+        self.overload_policy.max_display_rate = frames_per_second
+    
+    def set_capture_capacity(self, capacity):
+        """Frames kept in the capture history before the oldest are overwritten (clears it)"""
+        if NUMPY_AVAILABLE:
+            self.capture_store = CaptureStore(capacity)
+    
+    def drain_ingest_queue(self):
+        """Apply everything the adapters queued since the last tick"""
+        frames = self.ingest_queue.drain()
+        if frames and self.capture_store is not None:
+            self.capture_store.append(frames)
+        display = self.overload_policy.process(frames)
+        if display:
+            self.on_frame_batch(display)
+        
+        now = time.monotonic()
+        if now - self._ingest_status_time >= 0.5:
+            self._ingest_status_time = now
+            stats = self.ingest_queue.get_stats()
+            if stats["received"]:
+                overload = self.overload_policy.get_stats()
+                mode = f"OVERLOAD ({overload['rate']:.0f} fps)  " if overload["overloaded"] else ""
+                captured = f"Captured: {len(self.capture_store)}  " if self.capture_store is not None else ""
+                self.label_ingest.setText(
+                    f"{mode}{captured}Queue peak: {stats['high_water']}  "
+                    f"Coalesced: {overload['coalesced']}  Dropped: {stats['dropped']}  "
+                    f"Latency: {stats['last_latency_ms']:.0f} ms (max {stats['max_latency_ms']:.0f} ms)"
+                )
     
-    def on_pcan_message(self, message):
-        """Handle incoming PCAN messages"""
-        msg_id = message["id"]
-        self.received_messages[msg_id] = message
+    def on_frame_batch(self, messages):
+        """Apply the latest frame per ID, as coalesced by the overload policy (GUI thread)"""
+        latest = {message.id: message for message in messages}
+        self.received_messages.update(latest)
         
-        # Update the table if this ID is being displayed
+        # Update each displayed row once with the newest frame for its ID
         for row in range(self.table.rowCount()):
             item = self.table.item(row, 0)
             if item:
                 displayed_id = item.data(Qt.ItemDataRole.UserRole)
-                if displayed_id == msg_id:
-                    self.update_row_with_message(row, message)
-                    break
+                if displayed_id in latest:
+                    self.update_row_with_message(row, latest[displayed_id])
 
     # ---- Formatação ----
     def format_data(self,data,fmt):
@@ -1197,41 +1657,41 @@ class MainWindow(QMainWindow):
                 self.update_timestamp_for_row(row,msg_data)
 
     def update_timestamp_for_row(self,row,msg):
-        raw_time=msg["timestamp"]
+        raw_time=msg.timestamp_ns
         ts_text=""
-        if self.time_mode=="Absolute": ts_text=raw_time.strftime("%H:%M:%S.%f")[:-3]
+        if self.time_mode=="Absolute": ts_text=msg.timestamp.strftime("%H:%M:%S.%f")[:-3]
         elif self.time_mode=="Incremental":
-            delta=0.0 if self.last_timestamp_global is None else (raw_time - self.last_timestamp_global).total_seconds()
+            delta=0.0 if self.last_timestamp_global is None else (raw_time - self.last_timestamp_global) / 1e9
             ts_text=f"{delta:.3f}s"
             self.last_timestamp_global=raw_time
         elif self.time_mode=="Differential":
-            last=self.last_timestamp_by_id.get(msg["id"])
-            delta=0.0 if last is None else (raw_time - last).total_seconds()
+            last=self.last_timestamp_by_id.get(msg.id)
+            delta=0.0 if last is None else (raw_time - last) / 1e9
             ts_text=f"{delta:.3f}s"
-            self.last_timestamp_by_id[msg["id"]]=raw_time
+            self.last_timestamp_by_id[msg.id]=raw_time
         self.set_table_item(row,5,ts_text)
     
     def update_row_with_message(self, row, msg):
         """Update a table row with a real CAN message"""
-        msg["decoded"] = self.processor.decode_message(msg)
+        decoded = self.decoded_by_id[msg.id] = self.processor.decode_message(msg)
         
         # Update all columns
-        self.set_table_item(row, 1, msg["type"])
-        self.set_table_item(row, 2, str(len(msg["data"])))
+        self.set_table_item(row, 1, msg.type)
+        self.set_table_item(row, 2, str(len(msg.data)))
         
         # Raw data
         raw_item = self.table.item(row, 3)
         if not raw_item: 
             raw_item = QTableWidgetItem()
             self.table.setItem(row, 3, raw_item)
-        raw_item.setData(Qt.ItemDataRole.UserRole, msg["data"])
-        raw_item.setText(self.format_data(msg["data"], self.raw_display_format))
+        raw_item.setData(Qt.ItemDataRole.UserRole, list(msg.data))
+        raw_item.setText(self.format_data(msg.data, self.raw_display_format))
         
         # Decoded signals
-        self.set_table_item(row, 4, json.dumps(msg["decoded"]))
+        self.set_table_item(row, 4, json.dumps(decoded))
         
         # ID
-        msg_id = msg["id"]
+        msg_id = msg.id
         id_item = self.table.item(row, 0)
         if id_item: 
             id_item.setText(f"0x{msg_id:X}" if self.id_display_format == "Hex" else str(msg_id))
@@ -1241,10 +1701,11 @@ class MainWindow(QMainWindow):
 
     # ---- Atualizar mensagens ----
     def update_messages(self):
-        # If using SLCAN and we have real messages, display them
-        if self.using_slcan and self.slcan_manager.is_connected:
+        # If using SLCAN or python-can and we have real messages, display them
+        using_bus = self.python_can_manager.is_connected
+        if using_bus or (self.using_slcan and (self.slcan_manager.is_connected or self.slcan_pool.devices)):
             # Update status
-            self.label_status.setText("Status: Connected to SLCAN")
+            self.label_status.setText(f"Status: Connected to {self.python_can_manager.source}" if using_bus else "Status: Connected to SLCAN")
             
             # Show received messages in the table
             for row in range(self.table.rowCount()):
@@ -1266,22 +1727,21 @@ class MainWindow(QMainWindow):
                 if i >= self.table.rowCount():
                     break  # Safety check
                     
-                msg={"id":row_id,"type":"STD","data":[random.randint(0,255) for _ in range(8)],
-                     "timestamp":datetime.datetime.now()}
-                msg["decoded"]=self.processor.decode_message(msg)
+                msg=CANFrame(row_id,bytes(random.randint(0,255) for _ in range(8)),time.time_ns())
+                decoded=self.decoded_by_id[row_id]=self.processor.decode_message(msg)
                 self.messages_by_id[row_id]=msg
 
                 if self.verbose_logging and i == 0:  # Only log first message to avoid spam
-                    print(f"Test message: ID=0x{row_id:X}, Data={msg['data']}")
+                    print(f"Test message: ID=0x{row_id:X}, Data={list(msg.data)}")
 
                 # Atualizar linha fixa
-                self.set_table_item(i,1,msg["type"])
-                self.set_table_item(i,2,str(len(msg["data"])))
+                self.set_table_item(i,1,msg.type)
+                self.set_table_item(i,2,str(len(msg.data)))
                 raw_item=self.table.item(i,3)
                 if not raw_item: raw_item=QTableWidgetItem(); self.table.setItem(i,3,raw_item)
-                raw_item.setData(Qt.ItemDataRole.UserRole,msg["data"])
-                raw_item.setText(self.format_data(msg["data"],self.raw_display_format))
-                self.set_table_item(i,4,json.dumps(msg["decoded"]))
+                raw_item.setData(Qt.ItemDataRole.UserRole,list(msg.data))
+                raw_item.setText(self.format_data(msg.data,self.raw_display_format))
+                self.set_table_item(i,4,json.dumps(decoded))
 
                 # ID
                 id_item=self.table.item(i,0)
@@ -1294,10 +1754,15 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Clean up when closing the application"""
+        self.ingest_timer.stop()
         if self.slcan_manager.is_connected:
             self.slcan_manager.disconnect()
+        if self.slcan_pool.devices:
+            self.slcan_pool.disconnect_all()
         if self.pcan_manager.connected_channels:
             self.pcan_manager.disconnect_all()
+        if self.python_can_manager.is_connected:
+            self.python_can_manager.disconnect()
         if self.transmit_window:
             self.transmit_window.close()
         event.accept()
@@ -0,0 +1,85 @@
+# ingest_queue.py
+import threading
+import time
+from collections import deque
+
+
+class IngestQueue:
+    """Bounded hand-off of received frames from adapter threads to the GUI
+
+    Adapter reader threads call put()/put_batch() (the callback pair every
+    manager's start_listening accepts); the GUI thread takes everything
+    queued with drain() on a timer, so widgets are only touched from the
+    GUI thread and once per drain instead of once per frame. Beyond
+    capacity frames, new frames are dropped and counted.
+    """
+
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self._batches = deque()  # (enqueue time ns, [frames])
+        self._size = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            "received": 0,
+            "dropped": 0,
+            "high_water": 0,       # Most frames queued at once
+            "drains": 0,
+            "last_batch": 0,       # Frames taken by the last drain
+            "last_latency_ms": 0.0,  # Age of the oldest frame taken by the last drain
+            "max_latency_ms": 0.0,
+        }
+
+    def __len__(self):
+        return self._size
+
+    def put(self, frame):
+        self.put_batch([frame])
+
+    def put_batch(self, frames):
+        """Queue frames from an adapter thread; returns how many fit"""
+        now = time.monotonic_ns()
+        stats = self.stats
+        with self._lock:
+            stats["received"] += len(frames)
+            room = self.capacity - self._size
+            if room < len(frames):
+                stats["dropped"] += len(frames) - max(room, 0)
+                frames = frames[:max(room, 0)]
+            if frames:
+                self._batches.append((now, frames))
+                self._size += len(frames)
+                if self._size > stats["high_water"]:
+                    stats["high_water"] = self._size
+        return len(frames)
+
+    def drain(self):
+        """Take every queued frame, oldest first (GUI thread)"""
+        with self._lock:
+            if not self._batches:
+                return []
+            batches = self._batches
+            self._batches = deque()
+            self._size = 0
+
+        stats = self.stats
+        latency_ms = (time.monotonic_ns() - batches[0][0]) / 1e6
+        stats["drains"] += 1
+        stats["last_latency_ms"] = latency_ms
+        if latency_ms > stats["max_latency_ms"]:
+            stats["max_latency_ms"] = latency_ms
+        if len(batches) == 1:
+            frames = batches[0][1]
+        else:
+            frames = [frame for _, batch in batches for frame in batch]
+        stats["last_batch"] = len(frames)
+        return frames
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats["queued"] = self._size
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._batches.clear()
+            self._size = 0
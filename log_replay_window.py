@@ -17,6 +17,9 @@ class LogReplayThread(QThread):
     progress_update = pyqtSignal(int)  # current position
     replay_finished = pyqtSignal()
     
+    BURST_GAP = 0.001  # Messages closer than this (in seconds) are sent as one batch
+    MAX_BURST = 256    # Upper bound on frames per batch write
+    
     def __init__(self):
         super().__init__()
         self.slcan_manager = None
@@ -40,6 +43,8 @@ class LogReplayThread(QThread):
     def run(self):
         self.is_running = True
         last_timestamp = None
+        pending = []
+        burst = []
         
         for i in range(self.start_idx, min(self.end_idx + 1, len(self.messages))):
             if not self.is_running:
@@ -48,45 +53,61 @@ class LogReplayThread(QThread):
             self.current_idx = i
             message = self.messages[i]
             
-            # Calculate delay
+            # Calculate the gap before this message
             delay = self.delay_ms / 1000.0
-            if self.respect_timing and last_timestamp is not None:
+            if self.respect_timing:
                 try:
                     current_time = float(message.get('timestamp', 0))
-                    time_diff = current_time - last_timestamp
-                    if time_diff > 0:
-                        delay = time_diff
-                except (ValueError, TypeError):
-                    pass
-            
-            # Send message
-            if self.slcan_manager and self.slcan_manager.is_connected():
-                try:
-                    success = self.slcan_manager.send_message(
-                        message['id'], 
-                        message['data'], 
-                        message.get('extended', False)
-                    )
-                    status = "Sent" if success else "Failed"
-                except Exception as e:
-                    status = f"Error: {str(e)}"
-            else:
-                status = "Not connected"
-                
-            self.message_sent.emit(message, status)
-            self.progress_update.emit(i)
-            
-            if self.respect_timing and 'timestamp' in message:
-                try:
-                    last_timestamp = float(message['timestamp'])
+                    if last_timestamp is not None:
+                        delay = max(current_time - last_timestamp, 0.0)
+                    last_timestamp = current_time
                 except (ValueError, TypeError):
                     pass
             
-            # Wait for delay
-            if delay > 0:
-                self.msleep(int(delay * 1000))
+            # Messages captured back to back go out together in one write
+            if burst and (delay >= self.BURST_GAP or len(burst) >= self.MAX_BURST):
+                pending.extend(self.send_burst(burst))
+                burst = []
+                if delay > 0:
+                    self.msleep(int(delay * 1000))
+            burst.append((i, message))
+        
+        if burst and self.is_running:
+            pending.extend(self.send_burst(burst))
+        
+        # Let outstanding acknowledgements arrive before reporting completion
+        for future in pending:
+            try:
+                future.result(timeout=2)
+            except Exception:
+                pass
                 
         self.replay_finished.emit()
+    
+    def send_burst(self, burst):
+        """Queue a burst of (index, message) as one batch; results are reported on acknowledgement"""
+        if not (self.slcan_manager and self.slcan_manager.is_connected):
+            for i, message in burst:
+                self.message_sent.emit(message, "Not connected")
+            self.progress_update.emit(burst[-1][0])
+            return []
+        
+        try:
+            futures = self.slcan_manager.send_messages_async(
+                [(message['id'], message['data'], message.get('extended', False)) for i, message in burst]
+            )
+        except Exception as e:
+            for i, message in burst:
+                self.message_sent.emit(message, f"Error: {str(e)}")
+            self.progress_update.emit(burst[-1][0])
+            return []
+        
+        for (i, message), future in zip(burst, futures):
+            future.add_done_callback(
+                lambda f, m=message: self.message_sent.emit(m, "Sent" if f.result() else "Failed")
+            )
+        self.progress_update.emit(burst[-1][0])
+        return futures
         
     def stop(self):
         self.is_running = False
@@ -541,7 +562,7 @@ class LogReplayWindow(QMainWindow):
             self.status_label.setText("No valid message selected")
             return
             
-        if not self.slcan_manager or not self.slcan_manager.is_connected():
+        if not self.slcan_manager or not self.slcan_manager.is_connected:
             self.status_label.setText("SLCAN not connected")
             return
             
@@ -575,7 +596,7 @@ class LogReplayWindow(QMainWindow):
             self.status_label.setText("No messages loaded")
             return
             
-        if not self.slcan_manager or not self.slcan_manager.is_connected():
+        if not self.slcan_manager or not self.slcan_manager.is_connected:
             self.status_label.setText("SLCAN not connected")
             return
             
@@ -10,8 +10,19 @@ from PyQt6.QtWidgets import QApplication
 ENABLE_TEST_MESSAGES = True  # Set to False to disable test message generation
 TEST_MESSAGE_INTERVAL = 500   # Interval in milliseconds for test message updates (default: 500ms)
 VERBOSE_LOGGING = False        # Set to True to enable detailed logging output
+CAPTURE_CAPACITY = 1000000     # Frames kept in the capture history (needs NumPy)
+GUI_REFRESH_RATE = 30          # Hz at which received frames are applied to the table (30-60)
+DISPLAY_RATE_LIMIT = 2000      # Frames per second above which the table refreshes less often (overload mode)
+PCAN_SIMULATOR = False         # Set to True to use simulated PCAN hardware instead of the PEAK driver
+PCAN_SIMULATOR_RATE = 1000     # Frames per second generated on each simulated PCAN channel
 
 def main():
+    if PCAN_SIMULATOR:
+        import pcan_manager
+        import pcan_simulator
+        pcan_simulator.AUTO_TRAFFIC = {"frame_rate": PCAN_SIMULATOR_RATE}
+        pcan_manager.set_backend("simulator")
+    
     app = QApplication(sys.argv)
     window = MainWindow()
     
@@ -19,6 +30,9 @@ def main():
     window.enable_test_messages = ENABLE_TEST_MESSAGES
     window.test_message_interval = TEST_MESSAGE_INTERVAL
     window.verbose_logging = VERBOSE_LOGGING
+    window.set_ingest_rate(GUI_REFRESH_RATE)
+    window.set_capture_capacity(CAPTURE_CAPACITY)
+    window.set_display_rate_limit(DISPLAY_RATE_LIMIT)
     
     # Initialize test messages based on configuration
     window.initialize_test_messages()
@@ -7,6 +7,6 @@ class MessageProcessor:
         if not self.dbc_manager.db:
             return {}
         try:
-            return self.dbc_manager.db.decode_message(msg["id"], msg["data"])
+            return self.dbc_manager.db.decode_message(msg.id, msg.data)
         except Exception:
             return {}
@@ -0,0 +1,77 @@
+# overload_policy.py
+import time
+
+
+class OverloadPolicy:
+    """Decides how much of the received traffic the views have to render
+
+    The views show one row per ID, so every drained batch goes through
+    process(), which keeps only the latest frame per ID and counts each
+    frame it replaces in coalesced. It also measures the ingest rate:
+    above max_display_rate frames/s (until the rate falls back under
+    release_ratio * max_display_rate) the latest frames are held back and
+    handed over at most overload_refresh_hz times per second, so even
+    more are coalesced. Recording and statistics (CaptureStore) take the
+    full batch before it reaches the policy, so they still see every frame.
+    """
+
+    def __init__(self, max_display_rate=2000, overload_refresh_hz=10, release_ratio=0.8):
+        self.max_display_rate = max_display_rate
+        self.overload_refresh_hz = overload_refresh_hz
+        self.release_ratio = release_ratio
+        self.overloaded = False
+        self.rate = 0.0                # Smoothed ingest frames/s
+        self.received = 0              # Frames passed to process()
+        self.coalesced = 0             # Frames never shown because a newer one of the same ID replaced them
+        self.overload_count = 0        # Times overload mode was entered
+        self._pending = {}             # {id: latest frame} waiting for the next display update
+        self._last_time = None
+        self._last_display = 0.0
+
+    def process(self, frames, now=None):
+        """Take a drained batch (may be empty), return the frames to display, one per ID"""
+        now = time.monotonic() if now is None else now
+        self._update_rate(len(frames), now)
+        self.received += len(frames)
+
+        pending = self._pending
+        before = len(pending)
+        for frame in frames:
+            pending[frame.id] = frame
+        self.coalesced += len(frames) - (len(pending) - before)
+
+        if not pending:
+            return []
+        if self.overloaded and now - self._last_display < 1.0 / self.overload_refresh_hz:
+            return []
+        self._last_display = now
+        display = list(pending.values())
+        pending.clear()
+        return display
+
+    def _update_rate(self, count, now):
+        if self._last_time is not None and now > self._last_time:
+            instant = count / (now - self._last_time)
+            self.rate += 0.3 * (instant - self.rate)
+        self._last_time = now
+
+        if not self.overloaded and self.rate > self.max_display_rate:
+            self.overloaded = True
+            self.overload_count += 1
+        elif self.overloaded and self.rate < self.max_display_rate * self.release_ratio:
+            self.overloaded = False
+
+    def get_stats(self):
+        return {
+            "overloaded": self.overloaded,
+            "rate": self.rate,
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "overload_count": self.overload_count,
+        }
+
+    def reset(self):
+        self.received = 0
+        self.coalesced = 0
+        self.overload_count = 0
+        self._pending.clear()
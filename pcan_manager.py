@@ -1,7 +1,12 @@
 # pcan_manager.py
+import os
+import select
+import sys
 import time
 import threading
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from can_frame import CANFrame, FLAG_EXTENDED, FLAG_RTR, split_filter_ids, filter_key_set
 
 try:
     from PCANBasic import *
@@ -19,9 +24,11 @@ except ImportError:
     PCAN_BAUD_1M = PCAN_BAUD_500K = PCAN_BAUD_250K = PCAN_BAUD_125K = None
     PCAN_BAUD_100K = PCAN_BAUD_95K = PCAN_BAUD_83K = PCAN_BAUD_50K = None
     PCAN_BAUD_47K = PCAN_BAUD_33K = PCAN_BAUD_20K = PCAN_BAUD_10K = PCAN_BAUD_5K = None
-    PCAN_ERROR_OK = PCAN_ERROR_ILLHW = PCAN_ERROR_QRCVEMPTY = None
+    PCAN_ERROR_OK = PCAN_ERROR_ILLHW = PCAN_ERROR_QRCVEMPTY = PCAN_ERROR_QXMTFULL = None
     PCAN_MESSAGE_STANDARD = PCAN_MESSAGE_EXTENDED = PCAN_MESSAGE_RTR = None
     PCAN_RECEIVE_EVENT = None
+    PCAN_MESSAGE_FILTER = PCAN_FILTER_OPEN = PCAN_FILTER_CLOSE = None
+    PCAN_MODE_STANDARD = PCAN_MODE_EXTENDED = None
     
     class TPCANMsg:
         def __init__(self):
@@ -34,10 +41,174 @@ except ImportError:
     def CAN_Uninitialize(channel): return None
     def CAN_GetStatus(channel): return None
     def CAN_SetValue(channel, param, value): return None
+    def CAN_GetValue(channel, param): return (None, None)
     def CAN_Write(channel, msg): return None
+    def CAN_FilterMessages(channel, from_id, to_id, mode): return None
     def CAN_Read(channel): return (None, None, None)
     def CAN_GetErrorText(error, lang): return (None, "")
 
+# Bus status bits and error frames; older PCAN-Basic versions lack some of these
+PCAN_ERROR_BUSLIGHT = globals().get("PCAN_ERROR_BUSLIGHT", 0x00004)
+PCAN_ERROR_BUSHEAVY = globals().get("PCAN_ERROR_BUSHEAVY", 0x00008)
+PCAN_ERROR_BUSOFF = globals().get("PCAN_ERROR_BUSOFF", 0x00010)
+PCAN_ERROR_QOVERRUN = globals().get("PCAN_ERROR_QOVERRUN", 0x00040)
+PCAN_ERROR_BUSPASSIVE = globals().get("PCAN_ERROR_BUSPASSIVE", 0x40000)
+PCAN_MESSAGE_ERRFRAME = globals().get("PCAN_MESSAGE_ERRFRAME", 0x40)
+PCAN_ALLOW_ERROR_FRAMES = globals().get("PCAN_ALLOW_ERROR_FRAMES")
+PCAN_PARAMETER_ON = globals().get("PCAN_PARAMETER_ON", 1)
+
+# Bits of a standard frame besides its data (SOF, ID, control, CRC, ACK, EOF, IFS)
+FRAME_OVERHEAD_BITS = 47
+
+PCAN_BACKEND = "pcanbasic"
+
+
+def set_backend(name):
+    """Select the PCAN-Basic implementation used by PCANManager
+    
+    "pcanbasic" is the PEAK driver, "simulator" the in-process simulated
+    hardware of pcan_simulator.py. Call before creating a PCANManager.
+    """
+    global PCAN_AVAILABLE, PCAN_BACKEND
+    try:
+        if name == "simulator":
+            import pcan_simulator as backend
+        elif name == "pcanbasic":
+            import PCANBasic as backend
+        else:
+            print(f"Unknown PCAN backend: {name}")
+            return False
+    except ImportError as e:
+        print(f"PCAN backend {name} not available: {e}")
+        return False
+    
+    globals().update({
+        attr: getattr(backend, attr) for attr in dir(backend)
+        if attr.startswith(("PCAN_", "CAN_", "TPCAN"))
+    })
+    PCAN_AVAILABLE = True
+    PCAN_BACKEND = name
+    print(f"PCAN backend: {name}")
+    return True
+
+
+if os.environ.get("PYCANALYZER_PCAN_BACKEND", "pcanbasic") != "pcanbasic":
+    set_backend(os.environ["PYCANALYZER_PCAN_BACKEND"])
+
+if sys.platform == "win32":
+    import ctypes
+    _kernel32 = ctypes.windll.kernel32
+    _WAIT_OBJECT_0 = 0
+
+
+class PCANReceiveEvent:
+    """OS event the PCAN driver signals when frames are queued on a channel
+    
+    On Windows an auto-reset event is created and registered with
+    PCAN_RECEIVE_EVENT; on Linux the driver exposes a file descriptor
+    through the same parameter, which is waited on with select(). Use
+    PCANReceiveEvent.create(channel), which returns None if the platform
+    or driver does not support it (callers then fall back to polling).
+    """
+    
+    def __init__(self, channel, handle, owned):
+        self.channel = channel
+        self.handle = handle
+        self.owned = owned  # Created by us (Windows) rather than by the driver
+    
+    @classmethod
+    def create(cls, channel):
+        if not PCAN_AVAILABLE:
+            return None
+        try:
+            if sys.platform == "win32":
+                handle = _kernel32.CreateEventW(None, False, False, None)
+                if not handle:
+                    return None
+                if CAN_SetValue(channel, PCAN_RECEIVE_EVENT, handle) != PCAN_ERROR_OK:
+                    _kernel32.CloseHandle(handle)
+                    return None
+                return cls(channel, handle, True)
+            
+            status, fd = CAN_GetValue(channel, PCAN_RECEIVE_EVENT)
+            if status != PCAN_ERROR_OK or not fd:
+                return None
+            return cls(channel, fd, False)
+        except Exception as e:
+            print(f"PCAN receive event not available: {e}")
+            return None
+    
+    def wait(self, timeout):
+        """Block until frames are queued or timeout (seconds) passes"""
+        if self.owned:
+            return _kernel32.WaitForSingleObject(self.handle, int(timeout * 1000)) == _WAIT_OBJECT_0
+        return bool(select.select([self.handle], [], [], timeout)[0])
+    
+    @staticmethod
+    def wait_any(events, timeout):
+        """Block until any of events is signalled or timeout (seconds) passes"""
+        if not events:
+            time.sleep(timeout)
+        elif events[0].owned:
+            handles = (ctypes.c_void_p * len(events))(*[event.handle for event in events])
+            _kernel32.WaitForMultipleObjects(len(events), handles, False, int(timeout * 1000))
+        else:
+            select.select([event.handle for event in events], [], [], timeout)
+    
+    def close(self):
+        if self.owned:
+            try:
+                CAN_SetValue(self.channel, PCAN_RECEIVE_EVENT, 0)
+            except Exception:
+                pass
+            _kernel32.CloseHandle(self.handle)
+        self.handle = None
+
+
+def compute_filter_ranges(ids, max_ranges=8):
+    """Cover a set of CAN IDs with at most max_ranges (first, last) ranges
+    
+    Consecutive IDs share a range; if that gives too many, the ranges
+    with the smallest gap between them are merged (admitting the IDs in
+    the gap, which the software filter then drops).
+    """
+    ranges = []
+    for can_id in sorted(set(ids)):
+        if ranges and can_id == ranges[-1][1] + 1:
+            ranges[-1][1] = can_id
+        else:
+            ranges.append([can_id, can_id])
+    
+    while len(ranges) > max_ranges:
+        i = min(range(len(ranges) - 1), key=lambda j: ranges[j + 1][0] - ranges[j][1])
+        ranges[i][1] = ranges[i + 1][1]
+        del ranges[i + 1]
+    return [tuple(r) for r in ranges]
+
+
+def bus_state(status):
+    """Name of the bus state reported by CAN_GetStatus"""
+    if status == PCAN_ERROR_OK:
+        return "OK"
+    if status & PCAN_ERROR_BUSOFF:
+        return "BUS-OFF"
+    if status & PCAN_ERROR_BUSPASSIVE:
+        return "ERROR-PASSIVE"
+    if status & (PCAN_ERROR_BUSHEAVY | PCAN_ERROR_BUSLIGHT):
+        return "WARNING"
+    return "ERROR"
+
+
+def pcan_timestamp_ns(timestamp):
+    """Convert a TPCANTimestamp (millis, millis_overflow, micros) to nanoseconds
+    
+    The driver's clock is shared by all channels; millis_overflow counts
+    wraps of the 32-bit millisecond counter.
+    """
+    micros = timestamp.micros + 1000 * (timestamp.millis + 0x100000000 * timestamp.millis_overflow)
+    return micros * 1000
+
+
 class PCANManager:
     def __init__(self):
         self.pcan_handle = None
@@ -45,13 +216,66 @@ class PCANManager:
         self.is_listening = False
         self.listen_thread = None
         self.message_callback = None
+        self.batch_callback = None
         self.stop_listening = False
         self.available_channels = []
         
+        # Discovery: channel handles are probed in parallel, result cached
+        self.discovery_ttl = 30.0      # Seconds a discovered topology stays valid
+        self._topology = None          # [(name, channel)] from the last discovery
+        self._topology_time = 0.0
+        self._probe_pool = None
+        
         # Multi-channel support
         self.connected_channels = {}  # {channel: handle}
         self.channel_listeners = {}   # {channel: thread}
         
+        # Receive mode: block on the driver's receive event, poll if unavailable
+        self.use_receive_event = True
+        self.event_wait_timeout = 0.1  # Bounds how long stopping a listener takes
+        self.max_batch_size = 1024     # Frames drained per batch before delivering
+        
+        # Hardware timestamps: driver time + offset = host time (ns)
+        self.use_hw_timestamps = True
+        self._timestamp_anchor = None  # Offset shared by all channels, set by the first frame
+        self._timestamp_offsets = {}   # {channel: offset}
+        
+        # Optional single reader thread servicing all channels
+        self.multiplexed_reader = False
+        self.mux_quantum = 256         # Frames read from one channel before moving to the next
+        self._mux_channels = {}        # {channel: PCANReceiveEvent or None}
+        self._mux_retired = []         # Events of removed channels, closed by the reader
+        self._mux_lock = threading.Lock()
+        self._mux_thread = None
+        self._mux_stop = False
+        self._mux_callback = None
+        self._mux_batch_callback = None
+        
+        # Per-channel receive counters
+        self.channel_stats = {}        # {channel: {"frames", "batches", "errors", "max_batch", "filtered", ...}}
+        
+        # Bus health: sampled at a low rate by a monitor thread, off the receive path
+        self.health_interval = 0.5     # Seconds between samples
+        self.bus_health = {}           # {channel: snapshot}, replaced as a whole, never mutated
+        self.channel_bitrates = {}     # {channel: bits/s} for the bus load estimate
+        self._error_counters = {}      # {channel: (rx, tx)} from the latest error frame
+        self._health_thread = None
+        self._health_wake = threading.Event()
+        
+        # ID filtering: hardware ID ranges per channel plus exact software check
+        self.include_ids = None        # None = accept every ID, else {(id, extended)}
+        self.include_filter = None     # include_ids as given, (id, extended) pairs or bare IDs
+        self.exclude_ids = frozenset()
+        self.max_filter_ranges = 8
+        self.channel_filters = {}      # {channel: (standard ranges, extended ranges) or None}
+        
+        # Transmit: one reusable message struct per channel, fan-out pool, counters
+        self.tx_full_timeout = 0.1     # How long a batch waits for room in a full transmit queue
+        self._tx_msgs = {}             # {channel: TPCANMsg}
+        self._tx_locks = {}            # {channel: Lock} guarding the channel's struct
+        self._tx_pool = None
+        self.tx_stats = {}             # {channel: {"frames", "errors", "queue_full", "batches", "start_time"}}
+        
         if PCAN_AVAILABLE:
             self._initialize_channels()
     
@@ -78,22 +302,52 @@ class PCANManager:
             ("PCAN-PCIe2", PCAN_PCCBUS2),
         ]
     
-    def list_available_channels(self):
-        """List all available PCAN channels"""
+    def list_available_channels(self, refresh=False, on_found=None):
+        """List all available PCAN channels
+        
+        All channel handles are probed concurrently and the result is
+        cached for discovery_ttl seconds (refresh=True probes again).
+        on_found(name, channel) is called for each available channel as
+        soon as it is found.
+        """
         if not PCAN_AVAILABLE:
             return []
         
-        available = []
-        for name, channel in self.available_channels:
+        cached = self._topology
+        if cached is not None and not refresh and time.monotonic() - self._topology_time < self.discovery_ttl:
+            if on_found:
+                for name, channel in cached:
+                    on_found(name, channel)
+            return list(cached)
+        
+        def probe(entry):
+            name, channel = entry
             try:
                 # Try to get channel condition to see if it's available
                 result = CAN_GetStatus(channel)
-                if result != PCAN_ERROR_ILLHW:  # Channel exists
-                    available.append((name, channel))
             except:
-                continue
+                return False
+            if result == PCAN_ERROR_ILLHW:
+                return False
+            if on_found:  # Channel exists
+                on_found(name, channel)
+            return True
         
-        return available
+        found = list(self._worker_pool().map(probe, self.available_channels))
+        available = [entry for entry, ok in zip(self.available_channels, found) if ok]
+        self._topology = available
+        self._topology_time = time.monotonic()
+        return list(available)
+    
+    def invalidate_topology(self):
+        """Forget the cached channel list so the next listing probes again"""
+        self._topology = None
+    
+    def _worker_pool(self):
+        if self._probe_pool is None:
+            self._probe_pool = ThreadPoolExecutor(max_workers=max(len(self.available_channels), 1),
+                                                  thread_name_prefix="pcan-probe")
+        return self._probe_pool
     
     def test_connection(self, channel, baudrate=None):
         """Test if a PCAN channel is available and can be initialized"""
@@ -115,6 +369,30 @@ class PCANManager:
             print(f"PCAN test connection failed: {e}")
             return False
     
+    def test_channels(self, channels, baudrate=None, on_result=None):
+        """Test several (name, channel) pairs concurrently
+        
+        on_result(name, channel, ok) is called as each test completes.
+        Channels this manager has connected count as available without
+        being re-initialized. Returns {channel: ok}.
+        """
+        results = {}
+        futures = {}
+        for name, channel in channels:
+            if self._is_open(channel):
+                results[channel] = True
+                if on_result:
+                    on_result(name, channel, True)
+            else:
+                futures[self._worker_pool().submit(self.test_connection, channel, baudrate)] = (name, channel)
+        
+        for future in as_completed(futures):
+            name, channel = futures[future]
+            results[channel] = future.result()
+            if on_result:
+                on_result(name, channel, results[channel])
+        return results
+    
     def connect(self, channel, baudrate=PCAN_BAUD_500K):
         """Connect to PCAN channel"""
         if not PCAN_AVAILABLE:
@@ -130,9 +408,9 @@ class PCANManager:
             
             self.pcan_handle = channel
             self.is_connected = True
-            
-            # Set receive queue size
-            CAN_SetValue(channel, PCAN_RECEIVE_EVENT, 0)
+            self.channel_filters.pop(channel, None)
+            self._program_message_filter(channel)
+            self._start_channel_health(channel, baudrate)
             
             return True, "Connected successfully"
             
@@ -145,8 +423,13 @@ class PCANManager:
             try:
                 self.stop_listening_messages()
                 CAN_Uninitialize(self.pcan_handle)
+                self._forget_timestamp_offset(self.pcan_handle)
+                self._error_counters.pop(self.pcan_handle, None)
                 self.is_connected = False
                 self.pcan_handle = None
+                if not self.connected_channels:
+                    # Channels from connect_channel() are still monitored
+                    self.stop_health_monitor()
                 return True, "Disconnected successfully"
             except Exception as e:
                 return False, f"Disconnect error: {str(e)}"
@@ -156,43 +439,88 @@ class PCANManager:
         """Send a CAN message"""
         if not self.is_connected:
             return False, "Not connected"
-        
+        return self._send_single(self.pcan_handle, msg_id, data, is_extended, is_rtr)
+    
+    def _send_single(self, channel, msg_id, data, is_extended, is_rtr):
         try:
-            # Create PCAN message
-            msg = TPCANMsg()
-            msg.ID = msg_id
-            msg.LEN = len(data)
-            msg.MSGTYPE = PCAN_MESSAGE_STANDARD
-            
-            if is_extended:
-                msg.MSGTYPE |= PCAN_MESSAGE_EXTENDED
-            if is_rtr:
-                msg.MSGTYPE |= PCAN_MESSAGE_RTR
-            
-            # Set data
-            for i in range(len(data)):
-                msg.DATA[i] = data[i]
-            
-            # Send message
-            result = CAN_Write(self.pcan_handle, msg)
+            with self._tx_lock(channel):
+                result = CAN_Write(channel, self._fill_tx_msg(channel, msg_id, data, is_extended, is_rtr))
             
             if result == PCAN_ERROR_OK:
+                self._count_tx(channel, 1, 0)
                 return True, "Message sent successfully"
             else:
+                self._count_tx(channel, 0, 1)
                 error_text = self._get_error_text(result)
                 return False, f"Send failed: {error_text}"
                 
         except Exception as e:
             return False, f"Send error: {str(e)}"
     
-    def start_listening(self, callback):
-        """Start listening for CAN messages"""
+    def _tx_lock(self, channel):
+        lock = self._tx_locks.get(channel)
+        if lock is None:
+            lock = self._tx_locks.setdefault(channel, threading.Lock())
+        return lock
+    
+    def _fill_tx_msg(self, channel, msg_id, data, is_extended=False, is_rtr=False):
+        """Load a frame into the channel's reusable TPCANMsg (tx lock held)"""
+        msg = self._tx_msgs.get(channel)
+        if msg is None:
+            msg = self._tx_msgs[channel] = TPCANMsg()
+        
+        msg_type = PCAN_MESSAGE_STANDARD
+        if is_extended:
+            msg_type |= PCAN_MESSAGE_EXTENDED
+        if is_rtr:
+            msg_type |= PCAN_MESSAGE_RTR
+        
+        dlc = len(data)
+        msg.ID = msg_id
+        msg.LEN = dlc
+        msg.MSGTYPE = msg_type
+        msg.DATA[:dlc] = data
+        return msg
+    
+    def _count_tx(self, channel, frames, errors, queue_full=0, batches=0):
+        stats = self.tx_stats.get(channel)
+        if stats is None:
+            stats = self.tx_stats[channel] = self._new_tx_stats()
+        stats["frames"] += frames
+        stats["errors"] += errors
+        stats["queue_full"] += queue_full
+        stats["batches"] += batches
+    
+    @staticmethod
+    def _new_tx_stats():
+        return {"frames": 0, "errors": 0, "queue_full": 0, "batches": 0, "start_time": time.perf_counter()}
+    
+    def get_tx_stats(self):
+        """Per-channel transmit counters and frames/s since the channel connected"""
+        stats = {}
+        now = time.perf_counter()
+        for channel, counters in self.tx_stats.items():
+            channel_stats = dict(counters)
+            elapsed = now - counters["start_time"]
+            channel_stats["frames_per_second"] = counters["frames"] / elapsed if elapsed > 0 else 0.0
+            stats[channel] = channel_stats
+        return stats
+    
+    def start_listening(self, callback, batch_callback=None):
+        """Start listening for CAN messages
+        
+        callback is called once per frame. If batch_callback is given it is
+        called instead with all frames drained from the driver queue on
+        each wakeup.
+        """
         if not self.is_connected:
             return False, "Not connected"
         
         self.message_callback = callback
+        self.batch_callback = batch_callback
         self.stop_listening = False
         self.is_listening = True
+        self._reset_channel_stats(self.pcan_handle)
         
         self.listen_thread = threading.Thread(target=self._listen_worker)
         self.listen_thread.daemon = True
@@ -208,43 +536,340 @@ class PCANManager:
         if self.listen_thread and self.listen_thread.is_alive():
             self.listen_thread.join(timeout=1.0)
     
+    def _open_receive_event(self, channel):
+        """Register a receive event for channel, None to fall back to polling"""
+        event = PCANReceiveEvent.create(channel) if self.use_receive_event else None
+        mode = "event-driven" if event else "polling"
+        print(f"PCAN channel {channel:02X} receive mode: {mode}")
+        return event
+    
+    def _wait_for_frames(self, event):
+        """Wait after the receive queue ran empty"""
+        if event:
+            event.wait(self.event_wait_timeout)
+        else:
+            # No message available, wait a bit
+            time.sleep(0.001)
+    
     def _listen_worker(self):
         """Worker thread for listening to messages"""
+        event = self._open_receive_event(self.pcan_handle)
+        try:
+            self._listen_loop(event)
+        finally:
+            if event:
+                event.close()
+    
+    def _listen_loop(self, event):
         while not self.stop_listening and self.is_connected:
             try:
-                # Read message from PCAN
-                result = CAN_Read(self.pcan_handle)
+                # Read everything the driver has queued
+                frames, status = self._drain_queue(self.pcan_handle)
                 
-                if result[0] == PCAN_ERROR_OK:
-                    msg, timestamp = result[1], result[2]
-                    
-                    # Convert to our message format
-                    message = {
-                        "id": msg.ID,
-                        "data": list(msg.DATA[:msg.LEN]),
-                        "dlc": msg.LEN,
-                        "timestamp": datetime.now(),
-                        "is_extended": bool(msg.MSGTYPE & PCAN_MESSAGE_EXTENDED),
-                        "is_rtr": bool(msg.MSGTYPE & PCAN_MESSAGE_RTR),
-                        "source": "PCAN"
-                    }
-                    
-                    if self.message_callback:
-                        self.message_callback(message)
+                if frames:
+                    batch = self._make_messages(frames, "PCAN")
+                    self._count_frames(self.pcan_handle, batch)
+                    if batch:
+                        self._dispatch_batch(batch, self.message_callback, self.batch_callback)
                 
-                elif result[0] == PCAN_ERROR_QRCVEMPTY:
-                    # No message available, wait a bit
-                    time.sleep(0.001)
-                else:
-                    # Other error
-                    error_text = self._get_error_text(result[0])
-                    print(f"PCAN read error: {error_text}")
+                if status == PCAN_ERROR_QRCVEMPTY:
+                    self._wait_for_frames(event)
+                elif status != PCAN_ERROR_OK:
+                    # Other error, reported by the health monitor
+                    self._count_error(self.pcan_handle, status)
                     time.sleep(0.01)
                     
             except Exception as e:
                 print(f"PCAN listen error: {e}")
                 time.sleep(0.01)
     
+    def _drain_queue(self, channel, limit=None):
+        """Read until the driver's receive queue is empty (or limit frames)
+        
+        Returns ([(msg, timestamp), ...], status of the last read);
+        status is PCAN_ERROR_OK if the limit was reached first. limit
+        defaults to max_batch_size.
+        """
+        frames = []
+        max_batch_size = limit or self.max_batch_size
+        while len(frames) < max_batch_size:
+            status, msg, timestamp = CAN_Read(channel)
+            if status != PCAN_ERROR_OK:
+                return frames, status
+            frames.append((msg, timestamp))
+        return frames, PCAN_ERROR_OK
+    
+    def _timestamp_offset(self, channel, hw_ns, host_ns):
+        """Offset from the driver's clock to host time for channel
+        
+        Anchored once, on the first frame ever received; channels connected
+        later reuse the same anchor so their timestamps stay comparable.
+        """
+        offset = self._timestamp_offsets.get(channel)
+        if offset is None:
+            if self._timestamp_anchor is None:
+                self._timestamp_anchor = host_ns - hw_ns
+            offset = self._timestamp_offsets[channel] = self._timestamp_anchor
+        return offset
+    
+    def _forget_timestamp_offset(self, channel):
+        """Drop a channel's anchor; re-anchor from scratch once nothing is connected"""
+        self._timestamp_offsets.pop(channel, None)
+        if not self._timestamp_offsets:
+            self._timestamp_anchor = None
+    
+    def _make_messages(self, frames, source, channel=None):
+        """Convert drained frames to CANFrames
+        
+        Frames are stamped from the driver's microsecond timestamp when
+        available, otherwise with the host time of the drain.
+        """
+        host_ns = time.time_ns()
+        use_hw_timestamps = self.use_hw_timestamps
+        include_ids = self.include_ids
+        exclude_ids = self.exclude_ids
+        offset = None
+        error_frames = 0
+        batch = []
+        for msg, timestamp in frames:
+            if msg.MSGTYPE & PCAN_MESSAGE_ERRFRAME:
+                self._count_error_frame(self.pcan_handle if channel is None else channel, msg)
+                error_frames += 1
+                continue
+            
+            # Exact check behind the (range-based) hardware filter
+            if ((include_ids is not None and (msg.ID, bool(msg.MSGTYPE & PCAN_MESSAGE_EXTENDED)) not in include_ids)
+                    or msg.ID in exclude_ids):
+                continue
+            
+            if use_hw_timestamps and timestamp is not None:
+                hw_ns = pcan_timestamp_ns(timestamp)
+                if offset is None:
+                    offset = self._timestamp_offset(self.pcan_handle if channel is None else channel, hw_ns, host_ns)
+                timestamp_ns = hw_ns + offset
+            else:
+                timestamp_ns = host_ns
+            
+            flags = (FLAG_EXTENDED if msg.MSGTYPE & PCAN_MESSAGE_EXTENDED else 0) | \
+                    (FLAG_RTR if msg.MSGTYPE & PCAN_MESSAGE_RTR else 0)
+            batch.append(CANFrame(msg.ID, bytes(msg.DATA[:msg.LEN]), timestamp_ns, flags, channel, source))
+        
+        filtered = len(frames) - len(batch) - error_frames
+        if filtered:
+            stats = self.channel_stats.get(self.pcan_handle if channel is None else channel)
+            if stats is not None:
+                stats["filtered"] += filtered
+        return batch
+    
+    def _count_frames(self, channel, messages):
+        """Count the delivered data/RTR frames; error frames only feed the error counters"""
+        stats = self.channel_stats.get(channel)
+        if stats is not None:
+            count = len(messages)
+            stats["frames"] += count
+            stats["bytes"] += sum(len(message.data) for message in messages)
+            stats["batches"] += 1
+            if count > stats["max_batch"]:
+                stats["max_batch"] = count
+    
+    def _count_error(self, channel, status):
+        """Count a failed read instead of reporting it from the receive loop"""
+        stats = self.channel_stats.get(channel)
+        if stats is not None:
+            if status == PCAN_ERROR_QOVERRUN:
+                stats["overruns"] += 1
+            else:
+                stats["errors"] += 1
+            stats["last_error"] = status
+    
+    def _count_error_frame(self, channel, msg):
+        """Error frames carry the controller's RX/TX error counters in bytes 2 and 3"""
+        self._error_counters[channel] = (msg.DATA[2], msg.DATA[3])
+        stats = self.channel_stats.get(channel)
+        if stats is not None:
+            stats["error_frames"] += 1
+    
+    def _reset_channel_stats(self, channel):
+        self.channel_stats[channel] = {
+            "frames": 0, "bytes": 0, "batches": 0, "errors": 0, "max_batch": 0, "filtered": 0,
+            "overruns": 0, "error_frames": 0, "last_error": None
+        }
+    
+    def get_channel_stats(self):
+        """Per-channel receive counters: frames, batches, errors, overruns, max_batch, filtered"""
+        return {channel: dict(stats) for channel, stats in self.channel_stats.items()}
+    
+    def _start_channel_health(self, channel, baudrate):
+        """Prepare health monitoring of a newly connected channel"""
+        self.channel_bitrates[channel] = self.get_bitrate_bps(baudrate)
+        if PCAN_ALLOW_ERROR_FRAMES is not None:
+            try:
+                # Error frames deliver the controller's error counters
+                CAN_SetValue(channel, PCAN_ALLOW_ERROR_FRAMES, PCAN_PARAMETER_ON)
+            except Exception:
+                pass
+        self.start_health_monitor()
+    
+    def start_health_monitor(self):
+        """Sample the health of every connected channel each health_interval"""
+        if self._health_thread and self._health_thread.is_alive():
+            return
+        self._health_wake.clear()
+        self._health_thread = threading.Thread(target=self._health_worker)
+        self._health_thread.daemon = True
+        self._health_thread.start()
+    
+    def stop_health_monitor(self):
+        self._health_wake.set()
+        if self._health_thread and self._health_thread.is_alive() and self._health_thread is not threading.current_thread():
+            self._health_thread.join(timeout=1.0)
+        self._health_thread = None
+        self.bus_health = {}
+    
+    def _health_worker(self):
+        previous = {}
+        while not self._health_wake.is_set():
+            # Publish by swapping in a new dict: readers never see a partial update
+            self.bus_health, previous = self._sample_health(previous)
+            self._health_wake.wait(self.health_interval)
+    
+    def _sample_health(self, previous):
+        """Snapshot the bus state and counters of all connected channels
+        
+        previous holds (time, frames, bytes) per channel from the last
+        sample, for the receive rate and bus load. Returns (health, previous).
+        """
+        channels = set(self.connected_channels)
+        if self.is_connected and self.pcan_handle is not None:
+            channels.add(self.pcan_handle)
+        
+        now = time.monotonic()
+        health = {}
+        samples = {}
+        for channel in channels:
+            try:
+                status = CAN_GetStatus(channel)
+            except Exception:
+                status = None
+            stats = dict(self.channel_stats.get(channel) or {})
+            frames = stats.get("frames", 0)
+            nbytes = stats.get("bytes", 0)
+            
+            frames_per_second = bits_per_second = 0.0
+            last = previous.get(channel)
+            if last and frames >= last[1] and now > last[0]:  # Counters reset when listening restarts
+                elapsed = now - last[0]
+                frames_per_second = (frames - last[1]) / elapsed
+                bits_per_second = ((frames - last[1]) * FRAME_OVERHEAD_BITS + (nbytes - last[2]) * 8) / elapsed
+            samples[channel] = (now, frames, nbytes)
+            
+            bitrate = self.channel_bitrates.get(channel)
+            rx_errors, tx_errors = self._error_counters.get(channel, (None, None))
+            health[channel] = {
+                "status": status,
+                "state": bus_state(status) if status is not None else "UNKNOWN",
+                "rx_errors": rx_errors,
+                "tx_errors": tx_errors,
+                "error_frames": stats.get("error_frames", 0),
+                "overruns": stats.get("overruns", 0),
+                "read_errors": stats.get("errors", 0),
+                "last_error": stats.get("last_error"),
+                "frames_per_second": frames_per_second,
+                "bus_load": 100.0 * bits_per_second / bitrate if bitrate else None,
+                "time": now,
+            }
+        return health, samples
+    
+    def get_bus_health(self):
+        """Latest health snapshot: {channel: {"state", "status", "rx_errors", "tx_errors",
+        "error_frames", "overruns", "read_errors", "last_error", "frames_per_second", "bus_load"}}
+        
+        Never blocks; the returned dict is replaced rather than updated, so
+        it must not be modified. bus_load is the estimated % of the bitrate
+        used by received frames (bit stuffing not included).
+        """
+        return self.bus_health
+    
+    @staticmethod
+    def _dispatch_batch(batch, callback, batch_callback):
+        """Hand a batch to batch_callback, or to callback one frame at a time"""
+        if batch_callback:
+            batch_callback(batch)
+        elif callback:
+            for message in batch:
+                callback(message)
+    
+    def set_id_filter(self, include_ids=None, exclude_ids=None):
+        """Restrict which CAN IDs are received on every connected channel
+        
+        include_ids (None = all; bare IDs or (id, extended) pairs) is
+        compiled into at most max_filter_ranges hardware ID ranges per frame
+        type, a bare ID up to 0x7FF into both, so most unwanted frames are
+        dropped by the card; the residual and exclude_ids are filtered
+        exactly before frames are converted. Channels are reprogrammed
+        only when their ranges change.
+        """
+        self.include_filter = frozenset(include_ids) if include_ids else None
+        self.include_ids = filter_key_set(include_ids) if include_ids else None
+        self.exclude_ids = frozenset(exclude_ids or ())
+        
+        ok = True
+        channels = set(self.connected_channels)
+        if self.is_connected and self.pcan_handle is not None:
+            channels.add(self.pcan_handle)
+        for channel in channels:
+            ok = self._program_message_filter(channel) and ok
+        return ok
+    
+    def _compute_message_filter(self):
+        """(standard ranges, extended ranges) for include_ids, None to accept everything"""
+        if self.include_filter is None:
+            return None
+        standard, extended = split_filter_ids(self.include_filter)
+        return (compute_filter_ranges(standard, self.max_filter_ranges),
+                compute_filter_ranges(extended, self.max_filter_ranges))
+    
+    def _program_message_filter(self, channel):
+        """Load the include-ID ranges into a channel's hardware message filter"""
+        if not PCAN_AVAILABLE:
+            return False
+        
+        ranges = self._compute_message_filter()
+        if channel in self.channel_filters and self.channel_filters[channel] == ranges:
+            return True
+        
+        try:
+            if ranges is None:
+                result = CAN_SetValue(channel, PCAN_MESSAGE_FILTER, PCAN_FILTER_OPEN)
+            else:
+                # Start from a closed filter; each range widens it
+                result = CAN_SetValue(channel, PCAN_MESSAGE_FILTER, PCAN_FILTER_CLOSE)
+                standard, extended = ranges
+                for first, last in standard:
+                    if result == PCAN_ERROR_OK:
+                        result = CAN_FilterMessages(channel, first, last, PCAN_MODE_STANDARD)
+                for first, last in extended:
+                    if result == PCAN_ERROR_OK:
+                        result = CAN_FilterMessages(channel, first, last, PCAN_MODE_EXTENDED)
+        except Exception as e:
+            result = None
+            print(f"PCAN channel {channel:02X} filter error: {e}")
+        
+        if result == PCAN_ERROR_OK:
+            self.channel_filters[channel] = ranges
+            if ranges is not None:
+                print(f"PCAN channel {channel:02X} hardware filter: {ranges[0]} std, {ranges[1]} ext")
+            return True
+        
+        # Keep the hardware open; the software filter still applies
+        self.channel_filters.pop(channel, None)
+        try:
+            CAN_SetValue(channel, PCAN_MESSAGE_FILTER, PCAN_FILTER_OPEN)
+        except Exception:
+            pass
+        print(f"PCAN channel {channel:02X} rejected hardware filter - filtering in software only")
+        return False
+    
     def _get_error_text(self, error_code):
         """Get error text for PCAN error code"""
         if not PCAN_AVAILABLE:
@@ -279,6 +904,14 @@ class PCANManager:
         }
         return baudrates.get(str(baudrate_str), PCAN_BAUD_500K)
     
+    @classmethod
+    def get_bitrate_bps(cls, baudrate):
+        """Convert a PCAN baudrate constant back to bits/s (None if unknown)"""
+        for bitrate in cls.get_available_baudrates():
+            if cls.get_baudrate_value(bitrate) == baudrate:
+                return int(bitrate)
+        return None
+    
     @staticmethod
     def get_available_baudrates():
         """Get list of available baudrates"""
@@ -306,9 +939,10 @@ class PCANManager:
                 return False, f"Failed to initialize PCAN channel: {error_text}"
             
             self.connected_channels[channel] = channel
-            
-            # Set receive queue size
-            CAN_SetValue(channel, PCAN_RECEIVE_EVENT, 0)
+            self.tx_stats[channel] = self._new_tx_stats()
+            self.channel_filters.pop(channel, None)
+            self._program_message_filter(channel)
+            self._start_channel_health(channel, baudrate)
             
             # Update overall connection status
             self.is_connected = len(self.connected_channels) > 0
@@ -329,12 +963,15 @@ class PCANManager:
             # Stop listening on this channel
             if channel in self.channel_listeners:
                 self.stop_channel_listening(channel)
+            self._remove_multiplexed_channel(channel)
             
             # Uninitialize the channel
             CAN_Uninitialize(channel)
             
             # Remove from connected channels
             del self.connected_channels[channel]
+            self._forget_timestamp_offset(channel)
+            self._error_counters.pop(channel, None)
             
             # Update primary handle if needed
             if self.pcan_handle == channel:
@@ -343,6 +980,8 @@ class PCANManager:
                 else:
                     self.pcan_handle = None
                     self.is_connected = False
+            if not self.is_connected:
+                self.stop_health_monitor()
             
             return True, "Disconnected successfully"
             
@@ -364,41 +1003,80 @@ class PCANManager:
         else:
             return True, "All channels disconnected"
     
+    def _is_open(self, channel):
+        """True for a channel opened by connect_channel() or the single-channel connect()"""
+        return channel in self.connected_channels or (self.is_connected and channel == self.pcan_handle)
+    
     def send_message_on_channel(self, channel, msg_id, data, is_extended=False, is_rtr=False):
         """Send a CAN message on a specific channel"""
         if channel not in self.connected_channels:
             return False, "Channel not connected"
+        return self._send_single(channel, msg_id, data, is_extended, is_rtr)
+    
+    def send_batch(self, channel, frames):
+        """Send frames on a channel back to back
         
+        frames are (msg_id, data, is_extended) or (msg_id, data,
+        is_extended, is_rtr) tuples, written through the channel's reusable
+        message struct. A full transmit queue is retried for up to
+        tx_full_timeout; other errors skip the frame. channel may be any
+        channel connected with connect_channel() or connect(). Returns
+        (True if every frame was queued, message).
+        """
+        if not self._is_open(channel):
+            return False, "Channel not connected"
+        
+        sent = errors = queue_full = 0
+        last_error = PCAN_ERROR_OK
+        fill = self._fill_tx_msg
         try:
-            # Create PCAN message
-            msg = TPCANMsg()
-            msg.ID = msg_id
-            msg.LEN = len(data)
-            msg.MSGTYPE = PCAN_MESSAGE_STANDARD
-            
-            if is_extended:
-                msg.MSGTYPE |= PCAN_MESSAGE_EXTENDED
-            if is_rtr:
-                msg.MSGTYPE |= PCAN_MESSAGE_RTR
-            
-            # Set data
-            for i in range(len(data)):
-                msg.DATA[i] = data[i]
-            
-            # Send message on specific channel
-            result = CAN_Write(channel, msg)
-            
-            if result == PCAN_ERROR_OK:
-                return True, "Message sent successfully"
-            else:
-                error_text = self._get_error_text(result)
-                return False, f"Send failed: {error_text}"
-                
+            with self._tx_lock(channel):
+                for frame in frames:
+                    msg = fill(channel, *frame)
+                    result = CAN_Write(channel, msg)
+                    if result == PCAN_ERROR_QXMTFULL:
+                        deadline = time.perf_counter() + self.tx_full_timeout
+                        while result == PCAN_ERROR_QXMTFULL and time.perf_counter() < deadline:
+                            queue_full += 1
+                            time.sleep(0.0005)
+                            result = CAN_Write(channel, msg)
+                    if result == PCAN_ERROR_OK:
+                        sent += 1
+                    else:
+                        errors += 1
+                        last_error = result
         except Exception as e:
+            self._count_tx(channel, sent, errors + 1, queue_full, 1)
             return False, f"Send error: {str(e)}"
+        
+        self._count_tx(channel, sent, errors, queue_full, 1)
+        if errors:
+            return False, f"Sent {sent}/{sent + errors} frames: {self._get_error_text(last_error)}"
+        return True, f"Sent {sent} frames"
     
-    def start_channel_listening(self, channel, callback):
-        """Start listening on a specific channel"""
+    def send_batch_all(self, frames, channels=None):
+        """Send the same frames on several channels (default: all) concurrently
+        
+        Each channel's batch runs on its own pool thread, so channels are
+        written in parallel instead of one after another. Returns
+        {channel: (success, message)}.
+        """
+        if channels is None:
+            channels = self.get_connected_channels()
+        if len(channels) <= 1:
+            return {channel: self.send_batch(channel, frames) for channel in channels}
+        
+        if self._tx_pool is None:
+            self._tx_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="pcan-tx")
+        futures = {channel: self._tx_pool.submit(self.send_batch, channel, frames) for channel in channels}
+        return {channel: future.result() for channel, future in futures.items()}
+    
+    def start_channel_listening(self, channel, callback, batch_callback=None):
+        """Start listening on a specific channel
+        
+        Same callback contract as start_listening; frames also carry the
+        channel they were received on.
+        """
         if channel not in self.connected_channels:
             return False, "Channel not connected"
         
@@ -406,7 +1084,8 @@ class PCANManager:
             return True, "Already listening on this channel"
         
         # Create listener thread for this channel
-        thread = threading.Thread(target=self._channel_listen_worker, args=(channel, callback))
+        self._reset_channel_stats(channel)
+        thread = threading.Thread(target=self._channel_listen_worker, args=(channel, callback, batch_callback))
         thread.daemon = True
         self.channel_listeners[channel] = {'thread': thread, 'stop': False}
         thread.start()
@@ -429,53 +1108,154 @@ class PCANManager:
         # Remove from listeners
         del self.channel_listeners[channel]
     
-    def _channel_listen_worker(self, channel, callback):
+    def _channel_listen_worker(self, channel, callback, batch_callback=None):
         """Worker thread for listening to messages on a specific channel"""
         listener_info = self.channel_listeners.get(channel)
         if not listener_info:
             return
         
+        event = self._open_receive_event(channel)
+        try:
+            self._channel_listen_loop(channel, callback, batch_callback, listener_info, event)
+        finally:
+            if event:
+                event.close()
+    
+    def _channel_listen_loop(self, channel, callback, batch_callback, listener_info, event):
+        source = f"PCAN-{channel:02X}"
         while not listener_info['stop'] and channel in self.connected_channels:
             try:
-                # Read message from specific PCAN channel
-                result = CAN_Read(channel)
+                # Read everything the driver has queued on this channel
+                frames, status = self._drain_queue(channel)
                 
-                if result[0] == PCAN_ERROR_OK:
-                    msg, timestamp = result[1], result[2]
-                    
-                    # Convert to our message format
-                    message = {
-                        "id": msg.ID,
-                        "data": list(msg.DATA[:msg.LEN]),
-                        "dlc": msg.LEN,
-                        "timestamp": datetime.now(),
-                        "is_extended": bool(msg.MSGTYPE & PCAN_MESSAGE_EXTENDED),
-                        "is_rtr": bool(msg.MSGTYPE & PCAN_MESSAGE_RTR),
-                        "source": f"PCAN-{channel:02X}",
-                        "channel": channel
-                    }
-                    
-                    if callback:
-                        callback(message)
+                if frames:
+                    batch = self._make_messages(frames, source, channel)
+                    self._count_frames(channel, batch)
+                    if batch:
+                        self._dispatch_batch(batch, callback, batch_callback)
                 
-                elif result[0] == PCAN_ERROR_QRCVEMPTY:
-                    # No message available, wait a bit
-                    time.sleep(0.001)
-                else:
-                    # Other error
-                    if result[0] != PCAN_ERROR_ILLHW:  # Don't spam for disconnected channels
-                        error_text = self._get_error_text(result[0])
-                        print(f"PCAN channel {channel:02X} read error: {error_text}")
+                if status == PCAN_ERROR_QRCVEMPTY:
+                    self._wait_for_frames(event)
+                elif status != PCAN_ERROR_OK:
+                    # Other error, reported by the health monitor
+                    self._count_error(channel, status)
                     time.sleep(0.01)
                     
             except Exception as e:
                 print(f"PCAN channel {channel:02X} listen error: {e}")
                 time.sleep(0.01)
     
+    def start_multiplexed_listening(self, callback, batch_callback=None, channels=None):
+        """Listen on several channels (default: all connected) from one thread
+        
+        The reader waits on all channels' receive events at once, then
+        services every ready channel in turn, at most mux_quantum frames
+        each, starting from a different channel every pass so a flooded
+        channel cannot starve the others. Each pass is delivered as one
+        channel-tagged batch, with the same callback contract as
+        start_listening. Calling again while running adds channels not
+        yet being read.
+        """
+        if channels is None:
+            channels = list(self.connected_channels.keys())
+        channels = [ch for ch in channels if ch in self.connected_channels and ch not in self.channel_listeners]
+        
+        self._mux_callback = callback
+        self._mux_batch_callback = batch_callback
+        with self._mux_lock:
+            for channel in channels:
+                if channel not in self._mux_channels:
+                    self._reset_channel_stats(channel)
+                    self._mux_channels[channel] = self._open_receive_event(channel)
+            count = len(self._mux_channels)
+        
+        if not count:
+            return False, "No channels to listen on"
+        if not self._mux_thread:
+            self._mux_stop = False
+            self._mux_thread = threading.Thread(target=self._multiplexed_worker)
+            self._mux_thread.daemon = True
+            self._mux_thread.start()
+        return True, f"Listening on {count} channel(s) from one thread"
+    
+    def stop_multiplexed_listening(self):
+        """Stop the multiplexed reader and release its events"""
+        self._mux_stop = True
+        if self._mux_thread and self._mux_thread.is_alive():
+            self._mux_thread.join(timeout=1.0)
+        self._mux_thread = None
+        with self._mux_lock:
+            events = list(self._mux_channels.values()) + self._mux_retired
+            self._mux_channels.clear()
+            self._mux_retired = []
+        for event in events:
+            if event:
+                event.close()
+    
+    def _remove_multiplexed_channel(self, channel):
+        with self._mux_lock:
+            if channel not in self._mux_channels:
+                return
+            self._mux_retired.append(self._mux_channels.pop(channel))
+            empty = not self._mux_channels
+        if empty:
+            self.stop_multiplexed_listening()
+    
+    def _multiplexed_worker(self):
+        """Single reader thread for all multiplexed channels"""
+        start = 0
+        while not self._mux_stop:
+            with self._mux_lock:
+                channels = list(self._mux_channels.items())
+                retired, self._mux_retired = self._mux_retired, []
+            for event in retired:
+                if event:
+                    event.close()
+            if not channels:
+                time.sleep(self.event_wait_timeout)
+                continue
+            
+            # Round robin: rotate which channel is serviced first
+            start = (start + 1) % len(channels)
+            batch = []
+            backlog = False
+            for channel, _ in channels[start:] + channels[:start]:
+                try:
+                    frames, status = self._drain_queue(channel, self.mux_quantum)
+                except Exception as e:
+                    frames, status = [], None
+                    print(f"PCAN channel {channel:02X} listen error: {e}")
+                
+                if frames:
+                    messages = self._make_messages(frames, f"PCAN-{channel:02X}", channel)
+                    self._count_frames(channel, messages)
+                    batch.extend(messages)
+                
+                if status == PCAN_ERROR_OK:
+                    backlog = True  # Quantum used up, more frames queued
+                elif status != PCAN_ERROR_QRCVEMPTY:
+                    self._count_error(channel, status)
+            
+            if batch:
+                try:
+                    self._dispatch_batch(batch, self._mux_callback, self._mux_batch_callback)
+                except Exception as e:
+                    print(f"PCAN listen error: {e}")
+            
+            if not backlog:
+                events = [event for _, event in channels if event]
+                # Channels without an event have to be polled
+                timeout = self.event_wait_timeout if len(events) == len(channels) else 0.001
+                PCANReceiveEvent.wait_any(events, timeout)
+    
     def get_connected_channels(self):
         """Get list of connected channels"""
         return list(self.connected_channels.keys())
     
+    def is_channel_listening(self, channel):
+        """Check if a channel is being read, by its own thread or the multiplexed reader"""
+        return channel in self.channel_listeners or channel in self._mux_channels
+    
     def is_channel_connected(self, channel):
         """Check if a specific channel is connected"""
         return channel in self.connected_channels
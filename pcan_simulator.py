@@ -0,0 +1,469 @@
+# pcan_simulator.py
+"""
+Simulated PCAN-Basic backend
+Drop-in replacement for the functional PCANBasic API used by
+pcan_manager.py, for testing and benchmarking without PCAN hardware.
+
+Every simulated channel has a real receive queue with overrun detection,
+hardware-style message filter and receive event. Channels initialized at
+the same bitrate share a bus: frames written on one channel are received
+by all the others. start_traffic() generates load on a channel at a given
+frame rate and ID mix. Frames carry TPCANTimestamp values from a
+monotonic clock.
+
+Select it with pcan_manager.set_backend("simulator") or by setting the
+PYCANALYZER_PCAN_BACKEND environment variable to "simulator".
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+# Channel handles
+PCAN_USBBUS1, PCAN_USBBUS2, PCAN_USBBUS3, PCAN_USBBUS4 = 0x51, 0x52, 0x53, 0x54
+PCAN_USBBUS5, PCAN_USBBUS6, PCAN_USBBUS7, PCAN_USBBUS8 = 0x55, 0x56, 0x57, 0x58
+PCAN_PCIBUS1, PCAN_PCIBUS2, PCAN_PCIBUS3, PCAN_PCIBUS4 = 0x41, 0x42, 0x43, 0x44
+PCAN_PCIBUS5, PCAN_PCIBUS6, PCAN_PCIBUS7, PCAN_PCIBUS8 = 0x45, 0x46, 0x47, 0x48
+PCAN_PCCBUS1, PCAN_PCCBUS2 = 0x61, 0x62
+
+# Bitrates (BTR0/BTR1 values)
+PCAN_BAUD_1M = 0x0014
+PCAN_BAUD_500K = 0x001C
+PCAN_BAUD_250K = 0x011C
+PCAN_BAUD_125K = 0x031C
+PCAN_BAUD_100K = 0x432F
+PCAN_BAUD_95K = 0xC34E
+PCAN_BAUD_83K = 0x852B
+PCAN_BAUD_50K = 0x472F
+PCAN_BAUD_47K = 0x1414
+PCAN_BAUD_33K = 0x8B2F
+PCAN_BAUD_20K = 0x532F
+PCAN_BAUD_10K = 0x672F
+PCAN_BAUD_5K = 0x7F7F
+
+# Error codes
+PCAN_ERROR_OK = 0x00000
+PCAN_ERROR_XMTFULL = 0x00001
+PCAN_ERROR_OVERRUN = 0x00002
+PCAN_ERROR_BUSLIGHT = 0x00004
+PCAN_ERROR_BUSHEAVY = 0x00008
+PCAN_ERROR_BUSOFF = 0x00010
+PCAN_ERROR_QRCVEMPTY = 0x00020
+PCAN_ERROR_QOVERRUN = 0x00040
+PCAN_ERROR_QXMTFULL = 0x00080
+PCAN_ERROR_ILLHW = 0x01400
+PCAN_ERROR_BUSPASSIVE = 0x40000
+PCAN_ERROR_ILLPARAMTYPE = 0x04000
+PCAN_ERROR_ILLPARAMVAL = 0x08000
+PCAN_ERROR_INITIALIZE = 0x4000000
+PCAN_ERROR_ILLOPERATION = 0x8000000
+
+# Message types and filter modes
+PCAN_MESSAGE_STANDARD = 0x00
+PCAN_MESSAGE_RTR = 0x01
+PCAN_MESSAGE_EXTENDED = 0x02
+PCAN_MESSAGE_ERRFRAME = 0x40
+PCAN_MODE_STANDARD = PCAN_MESSAGE_STANDARD
+PCAN_MODE_EXTENDED = PCAN_MESSAGE_EXTENDED
+
+# Parameters
+PCAN_RECEIVE_EVENT = 0x03
+PCAN_MESSAGE_FILTER = 0x04
+PCAN_FILTER_CLOSE = 0x00
+PCAN_FILTER_OPEN = 0x01
+PCAN_FILTER_CUSTOM = 0x02
+PCAN_ALLOW_ERROR_FRAMES = 0x24
+PCAN_PARAMETER_OFF = 0x00
+PCAN_PARAMETER_ON = 0x01
+
+_ERROR_TEXTS = {
+    PCAN_ERROR_OK: "No error",
+    PCAN_ERROR_XMTFULL: "Transmit buffer in CAN controller is full",
+    PCAN_ERROR_OVERRUN: "CAN controller was read too late",
+    PCAN_ERROR_BUSLIGHT: "Bus error: an error counter reached the 'light' limit",
+    PCAN_ERROR_BUSHEAVY: "Bus error: an error counter reached the 'heavy' limit",
+    PCAN_ERROR_BUSPASSIVE: "Bus error: the CAN controller is error passive",
+    PCAN_ERROR_BUSOFF: "Bus error: the CAN controller is in bus-off state",
+    PCAN_ERROR_QRCVEMPTY: "Receive queue is empty",
+    PCAN_ERROR_QOVERRUN: "Receive queue was read too late",
+    PCAN_ERROR_QXMTFULL: "Transmit queue is full",
+    PCAN_ERROR_ILLHW: "Invalid PCAN-Channel handle",
+    PCAN_ERROR_ILLPARAMTYPE: "Invalid parameter",
+    PCAN_ERROR_ILLPARAMVAL: "Invalid parameter value",
+    PCAN_ERROR_INITIALIZE: "Channel is not initialized or already initialized",
+    PCAN_ERROR_ILLOPERATION: "Invalid operation",
+}
+
+# Simulated hardware
+BITRATES = (PCAN_BAUD_1M, PCAN_BAUD_500K, PCAN_BAUD_250K, PCAN_BAUD_125K, PCAN_BAUD_100K,
+            PCAN_BAUD_95K, PCAN_BAUD_83K, PCAN_BAUD_50K, PCAN_BAUD_47K, PCAN_BAUD_33K,
+            PCAN_BAUD_20K, PCAN_BAUD_10K, PCAN_BAUD_5K)
+SIMULATED_CHANNELS = (PCAN_USBBUS1, PCAN_USBBUS2, PCAN_PCIBUS1, PCAN_PCIBUS2)
+RECEIVE_QUEUE_SIZE = 32768
+AUTO_TRAFFIC = None   # start_traffic() keyword arguments applied to every channel on initialize
+
+_BOOT_NS = time.monotonic_ns()
+
+if sys.platform == "win32":
+    import ctypes
+    _kernel32 = ctypes.windll.kernel32
+
+
+class TPCANMsg:
+    def __init__(self):
+        self.ID = 0
+        self.MSGTYPE = PCAN_MESSAGE_STANDARD
+        self.LEN = 0
+        self.DATA = [0] * 8
+
+
+class TPCANTimestamp:
+    def __init__(self):
+        self.millis = 0
+        self.millis_overflow = 0
+        self.micros = 0
+
+
+def _timestamp(ns):
+    """TPCANTimestamp for a time.monotonic_ns() value, relative to 'boot'"""
+    micros_total = (ns - _BOOT_NS) // 1000
+    millis, micros = divmod(micros_total, 1000)
+    timestamp = TPCANTimestamp()
+    timestamp.micros = micros
+    timestamp.millis = millis & 0xFFFFFFFF
+    timestamp.millis_overflow = millis >> 32
+    return timestamp
+
+
+class _SimulatedChannel:
+    def __init__(self, handle):
+        self.handle = handle
+        self.initialized = False
+        self.bitrate = None
+        self.rx_queue = deque()
+        self.overrun = False
+        self.lock = threading.Lock()
+        self.filter_ranges = None   # None = open, [] = closed, else [(first, last, mode)]
+        self.event_fd = None        # (read fd, write fd) of the receive event pipe (POSIX)
+        self.event_handle = None    # Event registered with CAN_SetValue (Windows)
+        self.event_set = False
+        self.bus_status = PCAN_ERROR_OK
+        self.error_frames = False
+        self.traffic = None         # Load generator thread state
+        self.stats = {"rx": 0, "tx": 0, "overruns": 0, "filtered": 0}
+
+    def accepts(self, msg_id, msg_type):
+        ranges = self.filter_ranges
+        if ranges is None:
+            return True
+        mode = PCAN_MODE_EXTENDED if msg_type & PCAN_MESSAGE_EXTENDED else PCAN_MODE_STANDARD
+        return any(first <= msg_id <= last and mode == range_mode for first, last, range_mode in ranges)
+
+    def deliver(self, frames):
+        """Queue (msg, timestamp) pairs as received frames and signal the event"""
+        with self.lock:
+            if not self.initialized:
+                return
+            queue = self.rx_queue
+            for msg, timestamp in frames:
+                if not (msg.MSGTYPE & PCAN_MESSAGE_ERRFRAME or self.accepts(msg.ID, msg.MSGTYPE)):
+                    self.stats["filtered"] += 1
+                    continue
+                if len(queue) >= RECEIVE_QUEUE_SIZE:
+                    self.overrun = True
+                    self.stats["overruns"] += 1
+                    continue
+                queue.append((msg, timestamp))
+                self.stats["rx"] += 1
+            if queue and not self.event_set:
+                self._signal()
+
+    def _signal(self):
+        """Set the receive event (lock held)"""
+        self.event_set = True
+        if self.event_fd:
+            try:
+                os.write(self.event_fd[1], b'\x01')
+            except OSError:
+                pass
+        elif self.event_handle:
+            _kernel32.SetEvent(self.event_handle)
+
+    def clear_event(self):
+        """Reset the receive event once the queue ran empty (lock held)"""
+        self.event_set = False
+        if self.event_fd:
+            try:
+                os.read(self.event_fd[0], 4096)
+            except OSError:
+                pass
+
+    def reset(self):
+        with self.lock:
+            self.initialized = False
+            self.bitrate = None
+            self.rx_queue.clear()
+            self.overrun = False
+            self.filter_ranges = None
+            self.bus_status = PCAN_ERROR_OK
+            self.error_frames = False
+            self.event_handle = None
+            self.clear_event()
+
+
+_channels = {handle: _SimulatedChannel(handle) for handle in SIMULATED_CHANNELS}
+
+
+def _channel(handle):
+    return _channels.get(handle)
+
+
+def _bus_peers(channel):
+    """Other initialized channels on the same (bitrate) bus"""
+    return [peer for peer in _channels.values()
+            if peer is not channel and peer.initialized and peer.bitrate == channel.bitrate]
+
+
+# PCAN-Basic API
+
+def CAN_Initialize(channel, baudrate, hw_type=0, io_port=0, interrupt=0):
+    sim = _channel(channel)
+    if sim is None:
+        return PCAN_ERROR_ILLHW
+    if baudrate not in BITRATES:
+        return PCAN_ERROR_ILLPARAMVAL
+    with sim.lock:
+        if sim.initialized:
+            return PCAN_ERROR_INITIALIZE
+        sim.initialized = True
+        sim.bitrate = baudrate
+    if AUTO_TRAFFIC is not None:
+        start_traffic(channel, **AUTO_TRAFFIC)
+    return PCAN_ERROR_OK
+
+
+def CAN_Uninitialize(channel):
+    sim = _channel(channel)
+    if sim is None:
+        return PCAN_ERROR_ILLHW
+    if not sim.initialized:
+        return PCAN_ERROR_INITIALIZE
+    stop_traffic(channel)
+    sim.reset()
+    return PCAN_ERROR_OK
+
+
+def CAN_GetStatus(channel):
+    sim = _channel(channel)
+    if sim is None:
+        return PCAN_ERROR_ILLHW
+    if not sim.initialized:
+        return PCAN_ERROR_INITIALIZE
+    return sim.bus_status
+
+
+def CAN_Read(channel):
+    sim = _channel(channel)
+    if sim is None:
+        return (PCAN_ERROR_ILLHW, TPCANMsg(), TPCANTimestamp())
+    with sim.lock:
+        if not sim.initialized:
+            return (PCAN_ERROR_INITIALIZE, TPCANMsg(), TPCANTimestamp())
+        if sim.overrun:
+            # Reported once, like the driver does
+            sim.overrun = False
+            return (PCAN_ERROR_QOVERRUN, TPCANMsg(), TPCANTimestamp())
+        if not sim.rx_queue:
+            sim.clear_event()
+            return (PCAN_ERROR_QRCVEMPTY, TPCANMsg(), TPCANTimestamp())
+        msg, timestamp = sim.rx_queue.popleft()
+    return (PCAN_ERROR_OK, msg, timestamp)
+
+
+def CAN_Write(channel, msg):
+    sim = _channel(channel)
+    if sim is None:
+        return PCAN_ERROR_ILLHW
+    if not sim.initialized:
+        return PCAN_ERROR_INITIALIZE
+    if sim.bus_status & PCAN_ERROR_BUSOFF:
+        return PCAN_ERROR_BUSOFF
+    if msg.LEN > 8 or msg.ID > (0x1FFFFFFF if msg.MSGTYPE & PCAN_MESSAGE_EXTENDED else 0x7FF):
+        return PCAN_ERROR_ILLPARAMVAL
+
+    # The caller may reuse msg, so the bus gets a copy
+    frame = TPCANMsg()
+    frame.ID = msg.ID
+    frame.MSGTYPE = msg.MSGTYPE
+    frame.LEN = msg.LEN
+    frame.DATA = list(msg.DATA[:8])
+    timestamp = _timestamp(time.monotonic_ns())
+    sim.stats["tx"] += 1
+    for peer in _bus_peers(sim):
+        peer.deliver([(frame, timestamp)])
+    return PCAN_ERROR_OK
+
+
+def CAN_FilterMessages(channel, from_id, to_id, mode):
+    sim = _channel(channel)
+    if sim is None:
+        return PCAN_ERROR_ILLHW
+    if not sim.initialized:
+        return PCAN_ERROR_INITIALIZE
+    if from_id > to_id or mode not in (PCAN_MODE_STANDARD, PCAN_MODE_EXTENDED):
+        return PCAN_ERROR_ILLPARAMVAL
+    with sim.lock:
+        sim.filter_ranges = (sim.filter_ranges or []) + [(from_id, to_id, mode)]
+    return PCAN_ERROR_OK
+
+
+def CAN_GetValue(channel, parameter):
+    sim = _channel(channel)
+    if sim is None:
+        return (PCAN_ERROR_ILLHW, None)
+    if parameter == PCAN_RECEIVE_EVENT:
+        if sys.platform == "win32":
+            return (PCAN_ERROR_ILLOPERATION, None)  # Windows: the application supplies the event
+        with sim.lock:
+            if sim.event_fd is None:
+                sim.event_fd = os.pipe()
+                os.set_blocking(sim.event_fd[0], False)
+                os.set_blocking(sim.event_fd[1], False)
+                if sim.rx_queue:
+                    sim._signal()
+        return (PCAN_ERROR_OK, sim.event_fd[0])
+    if parameter == PCAN_ALLOW_ERROR_FRAMES:
+        return (PCAN_ERROR_OK, PCAN_PARAMETER_ON if sim.error_frames else PCAN_PARAMETER_OFF)
+    if parameter == PCAN_MESSAGE_FILTER:
+        if sim.filter_ranges is None:
+            return (PCAN_ERROR_OK, PCAN_FILTER_OPEN)
+        return (PCAN_ERROR_OK, PCAN_FILTER_CUSTOM if sim.filter_ranges else PCAN_FILTER_CLOSE)
+    return (PCAN_ERROR_ILLPARAMTYPE, None)
+
+
+def CAN_SetValue(channel, parameter, value):
+    sim = _channel(channel)
+    if sim is None:
+        return PCAN_ERROR_ILLHW
+    if parameter == PCAN_RECEIVE_EVENT:
+        if sys.platform != "win32":
+            return PCAN_ERROR_ILLOPERATION
+        with sim.lock:
+            sim.event_handle = value or None
+            sim.event_set = False
+            if sim.rx_queue and sim.event_handle:
+                sim._signal()
+        return PCAN_ERROR_OK
+    if parameter == PCAN_ALLOW_ERROR_FRAMES:
+        if value not in (PCAN_PARAMETER_ON, PCAN_PARAMETER_OFF):
+            return PCAN_ERROR_ILLPARAMVAL
+        sim.error_frames = value == PCAN_PARAMETER_ON
+        return PCAN_ERROR_OK
+    if parameter == PCAN_MESSAGE_FILTER:
+        if value not in (PCAN_FILTER_OPEN, PCAN_FILTER_CLOSE):
+            return PCAN_ERROR_ILLPARAMVAL
+        with sim.lock:
+            sim.filter_ranges = None if value == PCAN_FILTER_OPEN else []
+        return PCAN_ERROR_OK
+    return PCAN_ERROR_ILLPARAMTYPE
+
+
+def CAN_GetErrorText(error, language=0):
+    return (PCAN_ERROR_OK, _ERROR_TEXTS.get(error, f"Undefined error 0x{error:X}").encode('utf-8'))
+
+
+# Fault injection
+
+def set_bus_state(channel, status=PCAN_ERROR_OK, rx_errors=0, tx_errors=0):
+    """Put a simulated channel in a bus state (PCAN_ERROR_OK, _BUSLIGHT,
+    _BUSHEAVY, _BUSPASSIVE or _BUSOFF) as reported by CAN_GetStatus, and
+    queue an error frame with the given error counters if error frames
+    are enabled on the channel.
+    """
+    sim = _channel(channel)
+    if sim is None or not sim.initialized:
+        return False
+    sim.bus_status = status
+    if sim.error_frames:
+        msg = TPCANMsg()
+        msg.MSGTYPE = PCAN_MESSAGE_ERRFRAME
+        msg.LEN = 4
+        msg.DATA = [0, 0, rx_errors, tx_errors, 0, 0, 0, 0]
+        sim.deliver([(msg, _timestamp(time.monotonic_ns()))])
+    return True
+
+
+# Load generation
+
+def start_traffic(channel, frame_rate=1000, ids=None, extended_ratio=0.0, dlc=8, burst_size=1, seed=1):
+    """Generate received traffic on a simulated channel
+
+    frame_rate frames/s (0 = as fast as possible) in bursts of burst_size,
+    with IDs drawn from ids (default: 50 random standard IDs) and a share
+    of extended_ratio extended frames. Runs until stop_traffic() or the
+    channel is uninitialized.
+    """
+    sim = _channel(channel)
+    if sim is None or not sim.initialized:
+        return False
+    stop_traffic(channel)
+
+    rng = random.Random(seed)
+    if ids is None:
+        ids = [rng.randrange(0x800) for _ in range(50)]
+    ext_ids = [rng.randrange(0x800, 0x20000000) for _ in range(10)]
+    state = {"running": True, "sent": 0}
+
+    def make_frame(timestamp):
+        msg = TPCANMsg()
+        if extended_ratio and rng.random() < extended_ratio:
+            msg.ID = rng.choice(ext_ids)
+            msg.MSGTYPE = PCAN_MESSAGE_EXTENDED
+        else:
+            msg.ID = rng.choice(ids)
+        msg.LEN = dlc
+        msg.DATA = [rng.randrange(256) for _ in range(dlc)] + [0] * (8 - dlc)
+        return (msg, timestamp)
+
+    def run():
+        interval_ns = int(1e9 * burst_size / frame_rate) if frame_rate else 0
+        next_ns = time.monotonic_ns()
+        while state["running"] and sim.initialized:
+            now = time.monotonic_ns()
+            # Frames in a burst are spaced like back-to-back frames on the bus
+            sim.deliver([make_frame(_timestamp(now + i * 100_000)) for i in range(burst_size)])
+            state["sent"] += burst_size
+            if interval_ns:
+                next_ns += interval_ns
+                delay = next_ns - time.monotonic_ns()
+                if delay > 0:
+                    time.sleep(delay / 1e9)
+                elif delay < -1_000_000_000:
+                    next_ns = time.monotonic_ns()  # Fell behind, don't try to catch up
+
+    thread = threading.Thread(target=run)
+    thread.daemon = True
+    state["thread"] = thread
+    sim.traffic = state
+    thread.start()
+    return True
+
+
+def stop_traffic(channel):
+    sim = _channel(channel)
+    if sim is None or not sim.traffic:
+        return 0
+    state, sim.traffic = sim.traffic, None
+    state["running"] = False
+    if state["thread"] is not threading.current_thread():
+        state["thread"].join(timeout=1)
+    return state["sent"]
+
+
+def get_channel_stats(channel):
+    """Simulator-side counters: rx, tx, overruns, filtered"""
+    sim = _channel(channel)
+    return dict(sim.stats) if sim else None
@@ -0,0 +1,357 @@
+# python_can_manager.py
+import time
+import threading
+
+from can_frame import CANFrame, FLAG_EXTENDED, FLAG_RTR, split_filter_ids, filter_key_set
+
+try:
+    import can
+    PYTHON_CAN_AVAILABLE = True
+except ImportError:
+    PYTHON_CAN_AVAILABLE = False
+    print("python-can not available. Install with: pip install python-can")
+
+# Offered first in the GUI; any other python-can interface name works too
+PREFERRED_INTERFACES = ["socketcan", "virtual", "pcan", "kvaser", "vector", "ixxat", "slcan", "gs_usb"]
+
+# Frame timestamps further than this from host time come from a device clock and are re-anchored
+CLOCK_SKEW_LIMIT_NS = 10_000_000_000
+
+
+class PythonCANManager:
+    """Any python-can Bus (socketcan, virtual, pcan, kvaser, ...) as a CAN adapter
+
+    Frames are delivered with the same callback contract as SLCANManager
+    and PCANManager: CANFrames to callback one at a time, or lists of them
+    to batch_callback.
+
+    receive_mode "recv" (default) reads in a thread of our own: it blocks
+    in Bus.recv(recv_timeout) for the first frame, then takes everything
+    already queued with recv(0), up to max_batch_size, as one batch.
+    "notifier" runs a can.Notifier instead, so other python-can listeners
+    (loggers, add_listener) can share the bus; frames are then delivered
+    one at a time.
+    """
+
+    def __init__(self):
+        self.bus = None
+        self.is_connected = False
+        self.is_listening = False
+        self.listen_thread = None
+        self.message_callback = None
+        self.batch_callback = None
+        self.stop_listening = False
+        self.interface = None
+        self.channel = None
+        self.bitrate = None
+        self.source = None             # CANFrame.source, e.g. "socketcan:can0"
+
+        # Receive engine
+        self.receive_mode = "recv"     # "recv" or "notifier"
+        self.recv_timeout = 0.1        # Bounds how long stopping the reader takes
+        self.max_batch_size = 1024     # Frames taken per batch before delivering
+        self.notifier = None
+        self._listeners = []           # Extra can.Listener objects for notifier mode
+
+        # Timestamps: kernel/driver time + offset = host time (ns)
+        self.use_hw_timestamps = True
+        self._timestamp_offset = None
+
+        # ID filtering: bus filters (kernel/driver side where supported) plus exact software check
+        self.include_ids = None        # None = accept every ID, else {(id, extended)}
+        self.include_filter = None     # include_ids as given, (id, extended) pairs or bare IDs
+        self.exclude_ids = frozenset()
+
+        self.rx_stats = {}
+        self.reset_rx_stats()
+
+    @staticmethod
+    def list_interfaces():
+        """python-can interface names, the common ones first"""
+        if not PYTHON_CAN_AVAILABLE:
+            return []
+        valid = set(can.interfaces.VALID_INTERFACES)
+        preferred = [name for name in PREFERRED_INTERFACES if name in valid]
+        return preferred + sorted(valid.difference(preferred))
+
+    @staticmethod
+    def list_available_channels(interfaces=("socketcan", "virtual")):
+        """Channels python-can can detect on the given interfaces, as [(interface, channel)]"""
+        if not PYTHON_CAN_AVAILABLE:
+            return []
+        try:
+            configs = can.detect_available_configs(list(interfaces))
+        except Exception as e:
+            print(f"python-can channel detection failed: {e}")
+            return []
+        return [(config["interface"], config["channel"]) for config in configs]
+
+    def connect(self, interface, channel, bitrate=500000, **kwargs):
+        """Open a python-can Bus; extra keyword arguments go to can.Bus"""
+        if not PYTHON_CAN_AVAILABLE:
+            return False, "python-can not available"
+        if self.is_connected:
+            self.disconnect()
+
+        try:
+            if bitrate is not None and interface not in ("socketcan", "virtual"):
+                # SocketCAN bitrates are set with ip link; virtual buses have none
+                kwargs["bitrate"] = bitrate
+            self.bus = can.Bus(interface=interface, channel=channel, **kwargs)
+        except Exception as e:
+            return False, f"python-can connection error: {str(e)}"
+
+        self.interface = interface
+        self.channel = channel
+        self.bitrate = bitrate
+        self.source = f"{interface}:{channel}"
+        self.is_connected = True
+        self._timestamp_offset = None
+        self._apply_bus_filters()
+        return True, "Connected successfully"
+
+    def disconnect(self):
+        """Stop listening and shut the bus down"""
+        if not self.is_connected:
+            return True, "Already disconnected"
+        self.stop_listening_messages()
+        try:
+            self.bus.shutdown()
+        except Exception as e:
+            return False, f"Disconnect error: {str(e)}"
+        finally:
+            self.bus = None
+            self.is_connected = False
+        return True, "Disconnected successfully"
+
+    def send_message(self, msg_id, data, is_extended=False, is_rtr=False):
+        """Send a CAN message"""
+        if not self.is_connected:
+            return False, "Not connected"
+        try:
+            self.bus.send(can.Message(arbitration_id=msg_id, data=bytes(data), is_extended_id=is_extended,
+                                      is_remote_frame=is_rtr, dlc=len(data)))
+            return True, "Message sent successfully"
+        except can.CanError as e:
+            return False, f"Send failed: {str(e)}"
+        except Exception as e:
+            return False, f"Send error: {str(e)}"
+
+    def send_batch(self, frames):
+        """Send (msg_id, data, is_extended, is_rtr) frames in order, returns how many were sent"""
+        if not self.is_connected:
+            return 0
+        sent = 0
+        for msg_id, data, is_extended, is_rtr in frames:
+            ok, _ = self.send_message(msg_id, data, is_extended, is_rtr)
+            if not ok:
+                break
+            sent += 1
+        return sent
+
+    def start_listening(self, callback, batch_callback=None):
+        """Start listening for CAN messages
+
+        callback is called once per frame. If batch_callback is given it is
+        called instead with each batch of frames.
+        """
+        if not self.is_connected:
+            return False, "Not connected"
+        if self.is_listening:
+            return False, "Already listening"
+
+        self.message_callback = callback
+        self.batch_callback = batch_callback
+        self.stop_listening = False
+        self.is_listening = True
+        self.reset_rx_stats()
+
+        if self.receive_mode == "notifier":
+            listener = _FrameListener(self)
+            self.notifier = can.Notifier(self.bus, [listener] + self._listeners, timeout=self.recv_timeout)
+        else:
+            self.listen_thread = threading.Thread(target=self._listen_loop)
+            self.listen_thread.daemon = True
+            self.listen_thread.start()
+        return True, "Started listening"
+
+    def stop_listening_messages(self):
+        """Stop listening for messages"""
+        self.stop_listening = True
+        self.is_listening = False
+        if self.notifier:
+            self.notifier.stop(timeout=1.0)
+            self.notifier = None
+        if self.listen_thread and self.listen_thread.is_alive():
+            self.listen_thread.join(timeout=1.0)
+        self.listen_thread = None
+
+    def add_listener(self, listener):
+        """Attach a python-can Listener (e.g. can.Logger) to the bus in notifier mode"""
+        self._listeners.append(listener)
+        if self.notifier:
+            self.notifier.add_listener(listener)
+
+    def _listen_loop(self):
+        bus = self.bus
+        max_batch_size = self.max_batch_size
+        while not self.stop_listening and self.is_connected:
+            try:
+                msg = bus.recv(self.recv_timeout)
+                if msg is None:
+                    continue
+
+                # Everything already queued goes out with it as one batch
+                messages = [msg]
+                while len(messages) < max_batch_size:
+                    msg = bus.recv(0)
+                    if msg is None:
+                        break
+                    messages.append(msg)
+
+                batch = self._make_messages(messages)
+                if batch:
+                    self._dispatch_batch(batch)
+
+            except Exception as e:
+                self.rx_stats["errors"] += 1
+                self.rx_stats["last_error"] = str(e)
+                time.sleep(0.01)
+
+    def _make_messages(self, messages):
+        """Convert can.Messages to CANFrames, counting and dropping error frames"""
+        host_ns = time.time_ns()
+        use_hw_timestamps = self.use_hw_timestamps
+        include_ids = self.include_ids
+        exclude_ids = self.exclude_ids
+        channel = self.channel
+        source = self.source
+        stats = self.rx_stats
+        batch = []
+        for msg in messages:
+            if msg.is_error_frame:
+                stats["error_frames"] += 1
+                continue
+
+            # Exact check behind the bus filters (which may be mask-based or missing)
+            if ((include_ids is not None and (msg.arbitration_id, msg.is_extended_id) not in include_ids)
+                    or msg.arbitration_id in exclude_ids):
+                stats["filtered"] += 1
+                continue
+
+            if use_hw_timestamps and msg.timestamp:
+                timestamp_ns = int(msg.timestamp * 1e9) + self._clock_offset(msg.timestamp, host_ns)
+            else:
+                timestamp_ns = host_ns
+
+            flags = (FLAG_EXTENDED if msg.is_extended_id else 0) | (FLAG_RTR if msg.is_remote_frame else 0)
+            batch.append(CANFrame(msg.arbitration_id, bytes(msg.data), timestamp_ns, flags, channel, source))
+
+        count = len(batch)
+        stats["frames"] += count
+        stats["bytes"] += sum(len(frame.data) for frame in batch)
+        stats["batches"] += 1
+        if count > stats["max_batch"]:
+            stats["max_batch"] = count
+        return batch
+
+    def _clock_offset(self, timestamp, host_ns):
+        """Offset from the bus's clock to host time, anchored on the first frame
+
+        SocketCAN and virtual buses already stamp in host time (kernel
+        receive timestamps), so their offset is 0; device clocks that
+        start at power-up are anchored to the host time of the first frame.
+        """
+        offset = self._timestamp_offset
+        if offset is None:
+            offset = host_ns - int(timestamp * 1e9)
+            if abs(offset) < CLOCK_SKEW_LIMIT_NS:
+                offset = 0
+            self._timestamp_offset = offset
+        return offset
+
+    def _dispatch_batch(self, batch):
+        """Hand a batch to batch_callback, or to callback one frame at a time"""
+        if self.batch_callback:
+            self.batch_callback(batch)
+        elif self.message_callback:
+            for message in batch:
+                self.message_callback(message)
+
+    def set_id_filter(self, include_ids=None, exclude_ids=None):
+        """Restrict which CAN IDs are received
+
+        include_ids (None = all; bare IDs or (id, extended) pairs) becomes
+        one exact bus filter per ID and frame type, two for a bare ID up to
+        0x7FF, which SocketCAN applies in the kernel; interfaces without
+        filter support fall back to python-can's own filtering. exclude_ids
+        is filtered in software.
+        """
+        self.include_filter = frozenset(include_ids) if include_ids else None
+        self.include_ids = filter_key_set(include_ids) if include_ids else None
+        self.exclude_ids = frozenset(exclude_ids or ())
+        return self._apply_bus_filters()
+
+    def _apply_bus_filters(self):
+        if not self.is_connected:
+            return True
+        filters = None
+        if self.include_filter is not None:
+            standard, extended = split_filter_ids(self.include_filter)
+            filters = [{"can_id": can_id, "can_mask": 0x7FF, "extended": False} for can_id in sorted(standard)]
+            filters += [{"can_id": can_id, "can_mask": 0x1FFFFFFF, "extended": True} for can_id in sorted(extended)]
+        try:
+            self.bus.set_filters(filters)
+            return True
+        except Exception as e:
+            print(f"python-can filter error: {e}")
+            return False
+
+    def get_bus_state(self):
+        """Bus state reported by the interface: ACTIVE, PASSIVE or ERROR (bus-off); None if unknown"""
+        if not self.is_connected:
+            return None
+        try:
+            return self.bus.state.name
+        except Exception:
+            return None
+
+    def reset_rx_stats(self):
+        """Reset the receive counters"""
+        self.rx_stats = {
+            "frames": 0,
+            "bytes": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "filtered": 0,
+            "error_frames": 0,
+            "errors": 0,
+            "last_error": None,
+            "start_time": time.perf_counter(),
+        }
+
+    def get_rx_stats(self):
+        """Get receive counters and rates since listening started"""
+        stats = dict(self.rx_stats)
+        elapsed = time.perf_counter() - stats["start_time"]
+        stats["elapsed"] = elapsed
+        stats["frames_per_second"] = stats["frames"] / elapsed if elapsed > 0 else 0.0
+        stats["frames_per_batch"] = stats["frames"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+
+if PYTHON_CAN_AVAILABLE:
+    class _FrameListener(can.Listener):
+        """Notifier listener converting each received can.Message to a CANFrame"""
+
+        def __init__(self, manager):
+            self.manager = manager
+
+        def on_message_received(self, msg):
+            batch = self.manager._make_messages([msg])
+            if batch:
+                self.manager._dispatch_batch(batch)
+
+        def on_error(self, exc):
+            self.manager.rx_stats["errors"] += 1
+            self.manager.rx_stats["last_error"] = str(exc)
@@ -0,0 +1,120 @@
+# shared_frame_ring.py
+import struct
+from multiprocessing import shared_memory
+
+from can_frame import FLAG_EXTENDED
+
+# One received frame: timestamp_ns, id, flags (CANFrame flags), dlc, data (padded to 8 bytes)
+FRAME_RECORD = struct.Struct('<qIBB2x8s')
+
+# Header: head, tail and producer counters, one u64 each
+_U64 = struct.Struct('<Q')
+_HEAD = 0
+_TAIL = 8
+_DROPPED = 16
+_BYTES = 24
+_READS = 32
+_PARSE_ERRORS = 40
+HEADER_SIZE = 64
+
+
+class SharedFrameRing:
+    """Ring buffer of fixed-size CAN frame records in shared memory
+
+    Single producer, single consumer: the producer (reader process) only
+    advances head and its counters, the consumer (GUI process) only
+    advances tail, so no lock is needed across processes. Frames that do
+    not fit are dropped by the producer and counted.
+
+    Create with SharedFrameRing(capacity) in the owning process and attach
+    from the other one with SharedFrameRing(capacity, name=ring.name).
+    """
+
+    def __init__(self, capacity=65536, name=None):
+        self.capacity = capacity
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + capacity * FRAME_RECORD.size)
+            self.shm.buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __len__(self):
+        buf = self.shm.buf
+        return _U64.unpack_from(buf, _HEAD)[0] - _U64.unpack_from(buf, _TAIL)[0]
+
+    def write_frames(self, frames):
+        """Append a list of (timestamp_ns, id, extended, data) frames, returns how many fit"""
+        buf = self.shm.buf
+        head = _U64.unpack_from(buf, _HEAD)[0]
+        tail = _U64.unpack_from(buf, _TAIL)[0]
+        count = min(len(frames), self.capacity - (head - tail))
+
+        pack_into = FRAME_RECORD.pack_into
+        size = FRAME_RECORD.size
+        capacity = self.capacity
+        for i in range(count):
+            timestamp_ns, msg_id, extended, data = frames[i]
+            offset = HEADER_SIZE + ((head + i) % capacity) * size
+            pack_into(buf, offset, timestamp_ns, msg_id, FLAG_EXTENDED if extended else 0, len(data), data)
+
+        # Publish the records only once they are complete
+        _U64.pack_into(buf, _HEAD, head + count)
+        if count < len(frames):
+            self._add(_DROPPED, len(frames) - count)
+        return count
+
+    def read_frames(self, max_count=None):
+        """Take up to max_count records as (timestamp_ns, id, flags, dlc, data8) tuples"""
+        buf = self.shm.buf
+        head = _U64.unpack_from(buf, _HEAD)[0]
+        tail = _U64.unpack_from(buf, _TAIL)[0]
+        count = head - tail
+        if max_count is not None:
+            count = min(count, max_count)
+        if count <= 0:
+            return []
+
+        size = FRAME_RECORD.size
+        start = tail % self.capacity
+        first = min(count, self.capacity - start)
+        offset = HEADER_SIZE + start * size
+        records = list(FRAME_RECORD.iter_unpack(buf[offset:offset + first * size]))
+        if count > first:
+            records.extend(FRAME_RECORD.iter_unpack(buf[HEADER_SIZE:HEADER_SIZE + (count - first) * size]))
+
+        _U64.pack_into(buf, _TAIL, tail + count)
+        return records
+
+    def add_counters(self, nbytes=0, reads=0, parse_errors=0):
+        """Update the producer's receive counters"""
+        self._add(_BYTES, nbytes)
+        self._add(_READS, reads)
+        self._add(_PARSE_ERRORS, parse_errors)
+
+    def counters(self):
+        buf = self.shm.buf
+        return {
+            "bytes": _U64.unpack_from(buf, _BYTES)[0],
+            "reads": _U64.unpack_from(buf, _READS)[0],
+            "parse_errors": _U64.unpack_from(buf, _PARSE_ERRORS)[0],
+            "dropped": _U64.unpack_from(buf, _DROPPED)[0],
+        }
+
+    def close(self):
+        """Detach, and free the shared memory if this process created it"""
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _add(self, offset, value):
+        if value:
+            buf = self.shm.buf
+            _U64.pack_into(buf, offset, _U64.unpack_from(buf, offset)[0] + value)
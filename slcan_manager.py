@@ -1,10 +1,533 @@
 # slcan_manager.py
 import serial
 import serial.tools.list_ports
+import re
+import sys
 import time
 import threading
-from datetime import datetime
+import multiprocessing
+import binascii
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 import struct
+from can_frame import CANFrame, FLAG_EXTENDED, split_filter_ids, filter_key_set
+from shared_frame_ring import SharedFrameRing
+
+# ASCII code -> hex nibble value, 0xFF for characters that are not hex digits
+_HEX_NIBBLE = tuple(
+    int(chr(c), 16) if chr(c) in "0123456789abcdefABCDEF" else 0xFF
+    for c in range(256)
+)
+
+_STD_FRAME = ord('t')
+_EXT_FRAME = ord('T')
+
+
+def decode_slcan_frame(line):
+    """Decode one SLCAN frame line (bytes, without the trailing \\r)
+    
+    Returns a compact (msg_id, extended, data, stamp) tuple with data as
+    bytes and stamp the device's millisecond counter (None unless timestamp
+    mode Z1 is on), or None if the line is not a well-formed t/T frame.
+    """
+    length = len(line)
+    if length < 5:
+        return None
+    
+    kind = line[0]
+    nibble = _HEX_NIBBLE
+    if kind == _STD_FRAME:
+        n0, n1, n2 = nibble[line[1]], nibble[line[2]], nibble[line[3]]
+        if (n0 | n1 | n2) & 0xF0:
+            return None
+        msg_id = (n0 << 8) | (n1 << 4) | n2
+        dlc = nibble[line[4]]
+        data_start = 5
+        extended = False
+    elif kind == _EXT_FRAME and length >= 10:
+        msg_id = 0
+        for c in line[1:9]:
+            n = nibble[c]
+            if n & 0xF0:
+                return None
+            msg_id = (msg_id << 4) | n
+        if msg_id > 0x1FFFFFFF:
+            return None
+        dlc = nibble[line[9]]
+        data_start = 10
+        extended = True
+    else:
+        return None
+    
+    data_end = data_start + 2 * dlc
+    if dlc > 8 or (length != data_end and length != data_end + 4):
+        return None
+    try:
+        data = binascii.a2b_hex(line[data_start:data_end])
+    except binascii.Error:
+        return None
+    
+    stamp = None
+    if length != data_end:
+        n0, n1, n2, n3 = (nibble[line[data_end]], nibble[line[data_end + 1]],
+                          nibble[line[data_end + 2]], nibble[line[data_end + 3]])
+        if (n0 | n1 | n2 | n3) & 0xF0:
+            return None
+        stamp = (n0 << 12) | (n1 << 8) | (n2 << 4) | n3
+    
+    return msg_id, extended, data, stamp
+
+
+# SJA1000 acceptance code/mask (SLCAN M/m) that lets every frame through
+ACCEPT_ALL_FILTER = (0x00000000, 0xFFFFFFFF)
+
+
+def compute_acceptance_filter(ids):
+    """Compute the tightest single acceptance code/mask covering ids
+    
+    Uses the SJA1000 single filter layout programmed by the SLCAN M/m
+    commands, where mask bits set to 1 are "don't care". ids are filter
+    entries (see split_filter_ids): standard IDs are matched in bits
+    31..21 (RTR and data bytes ignored), extended IDs in bits 31..3. The
+    controller applies the layout of each received frame's type, so a mix
+    of both, including a bare ID that may be either, is covered by one
+    code/mask over the patterns of both. The result may let other IDs
+    through; callers filter exactly in software.
+    """
+    if not ids:
+        return ACCEPT_ALL_FILTER
+    
+    standard, extended = split_filter_ids(ids)
+    patterns = [can_id << 21 for can_id in standard] + [can_id << 3 for can_id in extended]
+    first = patterns[0]
+    differing = 0
+    for pattern in patterns:
+        differing |= pattern ^ first
+    
+    mask = differing | (0x001FFFFF if standard else 0x00000007)
+    return first & ~mask & 0xFFFFFFFF, mask
+
+
+class SLCANTimestampClock:
+    """Maps the device's wrapping millisecond counter onto the host clock
+    
+    Wraparound is resolved using host time elapsed since the previous frame,
+    so gaps longer than one wrap period are handled. The device-to-host
+    offset is the smallest one seen in each window (the frame with the least
+    transport delay), so serial and scheduling jitter do not show up in the
+    timestamps. Returned values never go backwards.
+    """
+    
+    def __init__(self, wrap_ms=60000, window_ns=10_000_000_000):
+        self.wrap_ms = wrap_ms        # Lawicel counters wrap at 60000 ms, some devices at 0x10000
+        self.window_ns = window_ns    # How often the offset is re-estimated (tracks clock drift)
+        self.reset()
+    
+    def reset(self):
+        self._last_device_ms = None
+        self._last_host_ns = 0
+        self._offset_ns = None
+        self._window_min_ns = None
+        self._window_start_ns = 0
+        self._last_ns = 0
+    
+    def to_ns(self, stamp, host_ns):
+        """Convert a device stamp received at host_ns (time.time_ns) to nanoseconds"""
+        if self._last_device_ms is None:
+            device_ms = stamp
+            self._window_start_ns = host_ns
+        else:
+            # Pick the unwrapped value closest to what the host clock predicts
+            expected = self._last_device_ms + (host_ns - self._last_host_ns) // 1_000_000
+            wraps = (expected - stamp + self.wrap_ms // 2) // self.wrap_ms
+            device_ms = max(stamp + wraps * self.wrap_ms, self._last_device_ms)
+        self._last_device_ms = device_ms
+        self._last_host_ns = host_ns
+        
+        device_ns = device_ms * 1_000_000
+        sample = host_ns - device_ns
+        if self._window_min_ns is None or sample < self._window_min_ns:
+            self._window_min_ns = sample
+        if self._offset_ns is None or sample < self._offset_ns:
+            self._offset_ns = sample
+        if host_ns - self._window_start_ns >= self.window_ns:
+            # Re-estimate from this window only, so a drifting device clock is followed
+            self._offset_ns = self._window_min_ns
+            self._window_min_ns = sample
+            self._window_start_ns = host_ns
+        
+        timestamp_ns = max(device_ns + self._offset_ns, self._last_ns)
+        self._last_ns = timestamp_ns
+        return timestamp_ns
+
+
+def _format_standard(msg_id, data, extended):
+    """Standard Lawicel frame: tiiiLdd.. / TiiiiiiiiLdd.."""
+    if extended:
+        cmd = f"T{msg_id:08X}{len(data)}"
+    else:
+        cmd = f"t{msg_id:03X}{len(data)}"
+    return cmd + "".join(f"{byte:02X}" for byte in data)
+
+
+def _format_no_dlc(msg_id, data, extended):
+    """Frame without the DLC digit, accepted by some cheap/WeAct devices"""
+    if extended:
+        cmd = f"T{msg_id:08X}"
+    else:
+        cmd = f"t{msg_id:03X}"
+    return cmd + "".join(f"{byte:02X}" for byte in data)
+
+
+def _format_spaced(msg_id, data, extended):
+    """Space separated fields"""
+    if extended:
+        cmd = f"T {msg_id:08X} {len(data)}"
+    else:
+        cmd = f"t {msg_id:03X} {len(data)}"
+    return cmd + "".join(f" {byte:02X}" for byte in data)
+
+
+def _format_hash(msg_id, data, extended):
+    """Minimal candump-like format used by some WeAct firmwares"""
+    return f"t{msg_id:X}#" + "".join(f"{byte:02X}" for byte in data)
+
+
+# Transmit format name -> encoder(msg_id, data, extended) returning the command string
+_TX_FORMATS = {
+    "standard": _format_standard,
+    "no_dlc": _format_no_dlc,
+    "spaced": _format_spaced,
+    "hash": _format_hash,
+}
+
+# Probe order per device type, the first format acknowledged is kept
+_GENERIC_TX_FORMATS = ("standard", "no_dlc", "spaced")
+_WEACT_TX_FORMATS = ("no_dlc", "standard", "hash")
+
+_TX_SUCCESS_RESPONSES = ('z', 'Z', '', 'OK')
+
+# Precomputed ASCII for standard IDs and DLC digits used by the batch encoder
+_STD_ID_HEX = tuple(b'%03X' % i for i in range(0x800))
+_DLC_DIGIT = tuple(b'%d' % i for i in range(9))
+
+
+def encode_slcan_frames(frames):
+    """Encode (msg_id, data, extended) frames as standard t/T commands
+    
+    All commands are written into one preallocated bytearray, each
+    terminated by \\r, ready for a single serial write. Frames must have
+    been validated (dlc <= 8, id in range) by the caller.
+    """
+    size = 0
+    for msg_id, data, extended in frames:
+        size += (11 if extended else 6) + 2 * len(data)
+    
+    buffer = bytearray(size)
+    pos = 0
+    hexlify = binascii.b2a_hex
+    for msg_id, data, extended in frames:
+        dlc = len(data)
+        if extended:
+            buffer[pos] = _EXT_FRAME
+            buffer[pos + 1:pos + 9] = b'%08X' % msg_id
+            pos += 9
+        else:
+            buffer[pos] = _STD_FRAME
+            buffer[pos + 1:pos + 4] = _STD_ID_HEX[msg_id]
+            pos += 4
+        buffer[pos:pos + 1] = _DLC_DIGIT[dlc]
+        pos += 1
+        if dlc:
+            buffer[pos:pos + 2 * dlc] = hexlify(bytes(data)).upper()
+            pos += 2 * dlc
+        buffer[pos] = 0x0D
+        pos += 1
+    return buffer
+
+
+# A command response ends with \r, \n or BEL (error, sent without \r)
+_RESPONSE_END = re.compile(rb'[\r\n\x07]')
+
+
+def probe_slcan_ready(port, timeout, interval=0.05):
+    """Send empty commands until the device answers anything
+    
+    Devices that reset when the port is opened ignore input until they
+    have booted; an idle SLCAN device answers an empty command with \r
+    (or BEL). Returns True as soon as any byte arrives, False if nothing
+    did within timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        port.write(b'\r')
+        port.flush()
+        probe_deadline = min(deadline, time.monotonic() + interval)
+        while time.monotonic() < probe_deadline:
+            if port.in_waiting:
+                return True
+            time.sleep(0.002)
+    return False
+
+
+def read_slcan_response(port, deadline):
+    """Read one response line (with its terminator) until deadline
+    
+    Received frames (t/T lines) and stray \n are skipped, so a device
+    that is still streaming does not hide the response. Returns None if no
+    response arrived in time.
+    """
+    buffer = b''
+    while time.monotonic() < deadline:
+        waiting = port.in_waiting
+        if not waiting:
+            time.sleep(0.001)
+            continue
+        buffer += port.read(waiting)
+        while True:
+            match = _RESPONSE_END.search(buffer)
+            if not match:
+                break
+            line = buffer[:match.end()]
+            buffer = buffer[match.end():]
+            if line == b'\n' or (line[:1] in (b't', b'T') and len(line) > 5):
+                continue
+            return line.decode('ascii', errors='ignore')
+    return None
+
+
+class SLCANTransmitQueue:
+    """Pipelined transmit queue for an SLCAN device
+    
+    Commands are written back to back, coalesced into one serial write when
+    several are queued, with up to max_in_flight awaiting acknowledgement.
+    Responses (z/Z, \\r or BEL) are matched in order from the shared receive
+    stream via on_response(), which SLCANManager's listen loop calls for
+    every line that is not a received frame. Each submission returns a
+    Future: True/False for frames, the response string for commands (None
+    on timeout, like send_command).
+    """
+    
+    def __init__(self, serial_port, max_in_flight=32, ack_timeout=1.0):
+        self.serial_port = serial_port
+        self.max_in_flight = max_in_flight
+        self.ack_timeout = ack_timeout
+        self._cond = threading.Condition()
+        self._outgoing = deque()  # (payload bytes, is_frame, [futures]) written in one go
+        self._pending = deque()   # (is_frame, future, deadline) awaiting a response
+        self._running = False
+        self._thread = None
+        self.stats = {"writes": 0, "acked": 0, "failed": 0, "timeouts": 0, "max_in_flight": 0}  # Updated under _cond
+    
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._writer_loop)
+        self._thread.daemon = True
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the writer and fail everything that has not completed"""
+        with self._cond:
+            self._running = False
+        self.abandon()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+    
+    def abandon(self):
+        """Fail everything queued or awaiting a response (e.g. after a reconnect)"""
+        with self._cond:
+            abandoned = [f for entry in self._outgoing for f in entry[2]] + [entry[1] for entry in self._pending]
+            self._outgoing.clear()
+            self._pending.clear()
+            self._cond.notify_all()
+        for future in abandoned:
+            if not future.done():
+                future.set_result(None)
+    
+    @property
+    def in_flight(self):
+        return len(self._pending)
+    
+    def submit(self, command, is_frame=True, callback=None):
+        """Queue a command (without \\r) and return a Future for its completion"""
+        future = self.submit_encoded((command + '\r').encode('ascii'), 1, is_frame)[0]
+        if callback:
+            future.add_done_callback(lambda f: callback(f.result()))
+        return future
+    
+    def submit_encoded(self, payload, count, is_frame=True):
+        """Queue count pre-encoded, \\r-terminated commands as a single write
+        
+        Returns one Future per command. A batch is written whole even if it
+        is larger than the in-flight window.
+        """
+        futures = [Future() for _ in range(count)]
+        with self._cond:
+            if not self._running:
+                for future in futures:
+                    future.set_result(False if is_frame else None)
+                return futures
+            self._outgoing.append((payload, is_frame, futures))
+            self._cond.notify_all()
+        return futures
+    
+    def on_response(self, line):
+        """Match one response line (bytes, BEL or without \\r) to the oldest pending command"""
+        with self._cond:
+            if not self._pending:
+                return
+            is_frame, future, _ = self._pending.popleft()
+            if line == b'\x07':
+                ok = False
+                result = False if is_frame else '\x07'
+            elif is_frame:
+                ok = line.strip() in (b'z', b'Z', b'', b'OK')
+                result = ok
+            else:
+                ok = True
+                result = line.decode('ascii', errors='ignore') + '\r'
+            self.stats["acked" if ok else "failed"] += 1
+            self._cond.notify_all()
+        future.set_result(result)
+    
+    def _expire_pending(self, now):
+        """Remove commands whose acknowledgement did not arrive in time (lock held)"""
+        expired = []
+        while self._pending and self._pending[0][2] < now:
+            expired.append(self._pending.popleft())
+        return expired
+    
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                while self._running and (not self._outgoing or len(self._pending) >= self.max_in_flight):
+                    if self._pending and self._pending[0][2] < time.monotonic():
+                        break
+                    self._cond.wait(0.05)
+                if not self._running:
+                    return
+                
+                now = time.monotonic()
+                expired = self._expire_pending(now)
+                self.stats["timeouts"] += len(expired)
+                
+                # Take everything that fits in the window and write it in one go
+                deadline = now + self.ack_timeout
+                chunks = []
+                while self._outgoing and len(self._pending) < self.max_in_flight:
+                    payload, is_frame, futures = self._outgoing.popleft()
+                    chunks.append(payload)
+                    for future in futures:
+                        self._pending.append((is_frame, future, deadline))
+                if len(self._pending) > self.stats["max_in_flight"]:
+                    self.stats["max_in_flight"] = len(self._pending)
+            
+            for is_frame, future, _ in expired:
+                future.set_result(False if is_frame else None)
+            
+            if chunks:
+                try:
+                    self.serial_port.write(b''.join(chunks) if len(chunks) > 1 else chunks[0])
+                    with self._cond:
+                        self.stats["writes"] += 1
+                except Exception as e:
+                    print(f"Error writing to SLCAN device: {e}")
+
+
+def take_slcan_lines(buffer, chunk):
+    """Append raw bytes to a framing buffer and remove all complete lines
+    
+    Returns the lines (bytes, without \r) terminated in buffer so far.
+    BEL (error) is not followed by \r, so it is given a line of its own.
+    """
+    if 7 in chunk:
+        chunk = chunk.replace(b'\x07', b'\x07\r')
+    
+    buffer += chunk
+    end = buffer.rfind(b'\r')
+    if end < 0:
+        return []
+    
+    lines = bytes(buffer[:end]).split(b'\r')
+    del buffer[:end + 1]
+    return lines
+
+
+class _PipePort:
+    """Write-only stand-in for the serial port while a reader process owns it"""
+    
+    def __init__(self, connection):
+        self.connection = connection
+    
+    def write(self, data):
+        self.connection.send_bytes(bytes(data))
+
+
+def _reader_process_main(port_name, baudrate, ring_name, ring_capacity, hw_timestamps,
+                         read_timeout, max_read_size, tx_connection, response_connection, stop_event):
+    """Entry point of the out-of-process SLCAN reader
+    
+    Reads and decodes frames into the shared ring buffer, sends every other
+    line (command/transmit responses) back over response_connection and
+    writes whatever arrives on tx_connection to the device.
+    """
+    ring = SharedFrameRing(ring_capacity, name=ring_name)
+    try:
+        port = serial.Serial(port_name, baudrate, timeout=read_timeout)
+    except Exception as e:
+        print(f"SLCAN reader process could not open {port_name}: {e}")
+        ring.close()
+        return
+    
+    def transmit_loop():
+        while True:
+            try:
+                port.write(tx_connection.recv_bytes())
+            except (EOFError, OSError):
+                return
+            except Exception as e:
+                print(f"Error writing to SLCAN device: {e}")
+    
+    tx_thread = threading.Thread(target=transmit_loop)
+    tx_thread.daemon = True
+    tx_thread.start()
+    
+    clock = SLCANTimestampClock()
+    buffer = bytearray()
+    try:
+        while not stop_event.is_set():
+            chunk = port.read(min(max(port.in_waiting, 1), max_read_size))
+            if not chunk:
+                continue
+            
+            host_ns = time.time_ns()
+            frames = []
+            parse_errors = 0
+            for line in take_slcan_lines(buffer, chunk):
+                if line[:1] == b'\n':
+                    line = line.lstrip(b'\n')
+                if line[:1] in (b't', b'T'):
+                    frame = decode_slcan_frame(line)
+                    if frame is None:
+                        parse_errors += 1
+                        continue
+                    msg_id, extended, data, stamp = frame
+                    if stamp is not None and hw_timestamps:
+                        frames.append((clock.to_ns(stamp, host_ns), msg_id, extended, data))
+                    else:
+                        frames.append((host_ns, msg_id, extended, data))
+                else:
+                    response_connection.send_bytes(line)
+            
+            if frames:
+                ring.write_frames(frames)
+            ring.add_counters(len(chunk), 1, parse_errors)
+    except Exception as e:
+        print(f"Error in SLCAN reader process: {e}")
+    finally:
+        port.close()
+        ring.close()
+
 
 class SLCANManager:
     def __init__(self):
@@ -13,8 +536,54 @@ class SLCANManager:
         self.is_listening = False
         self.listen_thread = None
         self.message_callback = None
+        self.batch_callback = None
         self.stop_listening = False
         
+        # Receive engine state
+        self.read_timeout = 0.01       # Serial read timeout used while listening
+        self.max_read_size = 65536     # Upper bound for a single bulk read
+        self._rx_buffer = bytearray()  # Framing buffer for partial SLCAN lines
+        self.rx_stats = {}
+        self.reset_rx_stats()
+        
+        # Hardware timestamp mode (Z1)
+        self.hw_timestamps = False
+        self.timestamp_clock = SLCANTimestampClock()
+        
+        # Device capabilities, probed once per connection
+        self.device_profile = None
+        
+        # Pipelined transmit queue, active while listening
+        self.tx_queue = None
+        self.command_timeout = 1.0     # Upper bound for a command response
+        
+        # Connection handshake and reconnect
+        self.ready_timeout = 2.0       # Upper bound for the device to answer after opening
+        self.auto_reconnect = True     # Reopen the port if it fails while listening
+        self.port_name = None
+        self.baudrate = 115200
+        self.bitrate_command = "S6"
+        self.connect_time = None       # Seconds the last (re)connect took
+        self.reconnect_count = 0
+        self._port_lock = threading.Lock()  # Guards swapping serial_port (reconnect vs disconnect)
+        self._response_time = None     # Smoothed command round trip
+        
+        # ID filtering: hardware acceptance code/mask plus exact software check
+        self.loopback = False
+        self.include_ids = None       # None = accept every ID, else {(id, extended)}
+        self.include_filter = None    # include_ids as given, (id, extended) pairs or bare IDs
+        self.exclude_ids = frozenset()
+        self.acceptance_filter = ACCEPT_ALL_FILTER
+        
+        # Optional out-of-process reader feeding a shared-memory ring buffer
+        self.reader_process = False
+        self.ring_capacity = 65536
+        self._reader = None
+        self._reader_stop = None
+        self._ring = None
+        self._responses = None
+        self._tx_connection = None
+        
     def list_serial_ports(self):
         """List all available serial ports"""
         ports = serial.tools.list_ports.comports()
@@ -24,71 +593,60 @@ class SLCANManager:
         """Test if a device responds to SLCAN commands"""
         try:
             test_port = serial.Serial(port, baudrate, timeout=2)
-            time.sleep(1)
             
-            # Clear buffers
-            test_port.flushInput()
-            test_port.flushOutput()
+            # Any answer to the readiness probe means an SLCAN device is there
+            if not probe_slcan_ready(test_port, self.ready_timeout):
+                test_port.close()
+                return False
             
             # Try a simple command
+            test_port.reset_input_buffer()
             test_port.write(b'V\r')
             test_port.flush()
-            time.sleep(0.2)
-            
-            response = ""
-            start_time = time.time()
-            while time.time() - start_time < 1.0:
-                if test_port.in_waiting > 0:
-                    response += test_port.read(test_port.in_waiting).decode('ascii', errors='ignore')
-                    break
-                time.sleep(0.01)
+            response = read_slcan_response(test_port, time.monotonic() + self.command_timeout)
             
             test_port.close()
-            return len(response) > 0
+            return bool(response)
             
         except Exception as e:
             print(f"Test connection failed: {e}")
             return False
     
-    def connect(self, port, baudrate=115200, loopback=False):
-        """Connect to SLCAN device"""
+    def connect(self, port, baudrate=115200, loopback=False, timestamps=False):
+        """Connect to SLCAN device
+        
+        With timestamps=True the device's timestamp mode (Z1) is enabled and
+        frames are stamped from its millisecond counter instead of the time
+        they were read from the serial port.
+        
+        Each handshake step waits for the device's answer rather than a
+        fixed delay; the time taken is kept in connect_time.
+        """
+        start = time.perf_counter()
         try:
             self.serial_port = serial.Serial(port, baudrate, timeout=2)
-            time.sleep(2)  # Wait for device to initialize
+            self.port_name = port
+            self.baudrate = baudrate
+            self.loopback = loopback
+            self.acceptance_filter = ACCEPT_ALL_FILTER
+            self.bitrate_command = "S6"  # Default to 500kbps
+            self.hw_timestamps = timestamps
+            self._response_time = None
             
-            # Clear any existing data
-            self.serial_port.flushInput()
-            self.serial_port.flushOutput()
-            
-            # Close any existing connection (ignore response)
-            self.send_command("C")
-            time.sleep(0.2)
-            
-            # Clear buffers again
-            self.serial_port.flushInput()
-            self.serial_port.flushOutput()
-            
-            # Set loopback mode if requested
-            if loopback:
-                loopback_response = self.send_command("L")
-                print(f"Loopback enable response: {repr(loopback_response)}")
-                if loopback_response and loopback_response.strip() == '\x07':
-                    print("Warning: Device may not support loopback mode (returned \\x07)")
-                time.sleep(0.2)
-            
-            # Set bitrate (default to 500kbps - S6)
-            response = self.send_command("S6")
-            print(f"Bitrate command response: {repr(response)}")
-            time.sleep(0.2)
-            
-            # Open CAN channel
-            response = self.send_command("O")
-            print(f"Open command response: {repr(response)}")
+            response, loopback_response = self._open_channel()
             
             # Check for success - many devices return different responses
             if response and (response.strip() in ['\r', '', 'OK'] or '\r' in response):
                 self.is_connected = True
-                print("SLCAN connection successful")
+                self.connect_time = time.perf_counter() - start
+                print(f"SLCAN connection successful ({self.connect_time * 1000:.0f} ms)")
+                
+                # Probe capabilities once; transmits reuse the cached profile
+                self._probe_device(loopback_response)
+                
+                # Apply an ID filter that was configured before connecting
+                if self.include_filter:
+                    self._program_acceptance_filter(compute_acceptance_filter(self.include_filter))
                 return True
             else:
                 print(f"SLCAN connection failed - unexpected response: {repr(response)}")
@@ -105,45 +663,164 @@ class SLCANManager:
                 self.serial_port = None
             return False
     
+    def _open_channel(self):
+        """Handshake from whatever state the device is in to an open channel
+        
+        Replays the connection settings (loopback, bitrate, timestamp mode,
+        acceptance filter). Returns the responses to O and L (None if
+        loopback was not requested).
+        """
+        if not probe_slcan_ready(self.serial_port, self.ready_timeout):
+            print("Warning: Device did not answer the readiness probe")
+        self.serial_port.reset_input_buffer()
+        
+        # Close any existing connection (ignore response)
+        self.send_command("C")
+        
+        # Set loopback mode if requested
+        loopback_response = None
+        if self.loopback:
+            loopback_response = self.send_command("L") or ''
+            print(f"Loopback enable response: {repr(loopback_response)}")
+            if loopback_response.strip() == '\x07':
+                print("Warning: Device may not support loopback mode (returned \\x07)")
+        
+        response = self.send_command(self.bitrate_command)
+        print(f"Bitrate command response: {repr(response)}")
+        
+        if self.hw_timestamps:
+            self._enable_timestamps()
+        
+        if self.acceptance_filter != ACCEPT_ALL_FILTER:
+            code, mask = self.acceptance_filter
+            self.send_command(f"M{code:08X}")
+            self.send_command(f"m{mask:08X}")
+        
+        # Open CAN channel
+        response = self.send_command("O", timeout=self.command_timeout)
+        print(f"Open command response: {repr(response)}")
+        return response, loopback_response
+    
+    def _reconnect(self):
+        """Reopen the port after the device dropped out and restore the channel
+        
+        Runs on the listen thread and retries with a growing delay until it
+        succeeds or listening is stopped. Commands that were in flight are
+        failed.
+        """
+        delay = 0.05
+        port = None
+        while not self.stop_listening:
+            start = time.perf_counter()
+            try:
+                with self._port_lock:
+                    if self.stop_listening:
+                        break
+                    if self.serial_port:
+                        try:
+                            self.serial_port.close()
+                        except Exception:
+                            pass
+                    port = self.serial_port = serial.Serial(self.port_name, self.baudrate, timeout=self.read_timeout)
+                response, _ = self._open_channel()
+                
+                with self._port_lock:
+                    # disconnect() may have given up waiting for us meanwhile;
+                    # never install a port it will not close
+                    if self.stop_listening:
+                        break
+                    if response and '\x07' not in response:
+                        port.timeout = self.read_timeout
+                        self._rx_buffer.clear()
+                        self.timestamp_clock.reset()
+                        if self.tx_queue:
+                            self.tx_queue.abandon()
+                            self.tx_queue.serial_port = port
+                        self.connect_time = time.perf_counter() - start
+                        self.reconnect_count += 1
+                        print(f"SLCAN reconnected in {self.connect_time * 1000:.0f} ms")
+                        return True
+            except Exception as e:
+                print(f"SLCAN reconnect failed: {e}")
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        
+        # Stopped mid-reconnect: close the port this loop opened
+        with self._port_lock:
+            if port is not None:
+                try:
+                    port.close()
+                except Exception:
+                    pass
+                if self.serial_port is port:
+                    self.serial_port = None
+                    self.is_connected = False
+        return False
+    
     def disconnect(self):
         """Disconnect from SLCAN device"""
-        if self.serial_port:
-            try:
-                self.stop_listening_messages()
-                self.send_command("C")  # Close CAN channel
-                self.serial_port.close()
-            except:
-                pass
-            finally:
-                self.serial_port = None
-                self.is_connected = False
+        try:
+            self.stop_listening_messages()
+        except:
+            pass
+        
+        # A reconnect in progress can outlast stop_listening_messages' wait;
+        # the port is only touched once the listen thread has let go of it
+        if self.listen_thread and self.listen_thread.is_alive():
+            self.listen_thread.join(timeout=self.ready_timeout + 4 * self.command_timeout)
+        
+        with self._port_lock:
+            if self.serial_port:
+                try:
+                    self.send_command("C")  # Close CAN channel
+                    self.serial_port.close()
+                except:
+                    pass
+            self.serial_port = None
+            self.is_connected = False
+            self.device_profile = None
     
-    def send_command(self, command):
-        """Send command to SLCAN device"""
+    def send_command(self, command, timeout=None):
+        """Send command to SLCAN device
+        
+        Waits for the response for timeout seconds, by default a few times
+        the device's observed round trip (at most command_timeout).
+        """
         if not self.serial_port:
             return None
+        
+        # While listening the receive thread owns the port; go through the TX queue
+        # (unless this is the receive thread itself, re-opening the channel)
+        if self.tx_queue and threading.current_thread() is not self.listen_thread:
+            try:
+                response = self.tx_queue.submit(command, is_frame=False).result(timeout=self.command_timeout + 1)
+            except FutureTimeoutError:
+                response = None
+            print(f"Command '{command}' -> Response: {repr(response)}")
+            return response
+        
+        # A reader process owns the device (on Windows our handle is closed); only its pipe reaches it
+        if self._reader is not None or not self.serial_port.is_open:
+            print(f"Command '{command}' not sent: port is owned by the SLCAN reader process or closed")
+            return None
+        
         try:
+            if timeout is None:
+                timeout = self._response_timeout()
+            
             # Clear input buffer first
-            self.serial_port.flushInput()
+            self.serial_port.reset_input_buffer()
             
             # Send command
+            start = time.monotonic()
             self.serial_port.write((command + '\r').encode())
             self.serial_port.flush()
             
-            # Wait a bit for response
-            time.sleep(0.1)
-            
-            # Read response with timeout
-            response = ""
-            start_time = time.time()
-            while time.time() - start_time < 1.0:  # 1 second timeout
-                if self.serial_port.in_waiting > 0:
-                    char = self.serial_port.read(1).decode('ascii', errors='ignore')
-                    response += char
-                    if char == '\r' or char == '\n':
-                        break
-                else:
-                    time.sleep(0.01)
+            response = read_slcan_response(self.serial_port, start + timeout)
+            if response is None:
+                response = ""
+            else:
+                self._record_response_time(time.monotonic() - start)
             
             print(f"Command '{command}' -> Response: {repr(response)}")
             return response
@@ -152,6 +829,18 @@ class SLCANManager:
             print(f"Error sending command '{command}': {e}")
             return None
     
+    def _response_timeout(self):
+        """Adaptive command timeout: generous multiple of the observed round trip"""
+        if self._response_time is None:
+            return self.command_timeout
+        return min(self.command_timeout, max(0.1, 10 * self._response_time))
+    
+    def _record_response_time(self, elapsed):
+        if self._response_time is None:
+            self._response_time = elapsed
+        else:
+            self._response_time = 0.8 * self._response_time + 0.2 * elapsed
+    
     def set_bitrate(self, bitrate, loopback=False):
         """Set CAN bitrate"""
         bitrate_map = {
@@ -170,21 +859,26 @@ class SLCANManager:
             # Close channel first
             close_response = self.send_command("C")
             print(f"Close response: {repr(close_response)}")
-            time.sleep(0.2)
             
             # Set loopback mode if requested
+            self.loopback = loopback
             if loopback:
                 loopback_response = self.send_command("L")
                 print(f"Loopback enable response: {repr(loopback_response)}")
-                time.sleep(0.2)
+                if self.device_profile is not None:
+                    self.device_profile["loopback"] = bool(loopback_response) and '\x07' not in loopback_response
             
             # Set new bitrate
-            bitrate_response = self.send_command(bitrate_map[bitrate])
+            self.bitrate_command = bitrate_map[bitrate]
+            bitrate_response = self.send_command(self.bitrate_command)
             print(f"Bitrate response: {repr(bitrate_response)}")
-            time.sleep(0.2)
+            
+            # Timestamp mode can only be changed while the channel is closed
+            if self.hw_timestamps:
+                self._enable_timestamps()
             
             # Reopen channel
-            open_response = self.send_command("O")
+            open_response = self.send_command("O", timeout=self.command_timeout)
             print(f"Reopen response: {repr(open_response)}")
             
             # Check if successful
@@ -195,16 +889,63 @@ class SLCANManager:
             print(f"Unsupported bitrate: {bitrate}")
             return False
     
-    def check_device_info(self):
-        """Get device version and capabilities"""
-        if not self.is_connected:
-            return None
+    def _enable_timestamps(self):
+        """Turn on the device's timestamp mode (Z1), channel must be closed"""
+        response = self.send_command("Z1")
+        print(f"Timestamp enable response: {repr(response)}")
+        self.hw_timestamps = bool(response) and '\x07' not in response
+        if not self.hw_timestamps:
+            print("Warning: Device does not support timestamp mode - using host timestamps")
+        self.timestamp_clock.reset()
+        return self.hw_timestamps
+    
+    def set_id_filter(self, include_ids=None, exclude_ids=None):
+        """Restrict which CAN IDs are received
         
-        # Try version command
+        include_ids (None = all; bare IDs or (id, extended) pairs) is compiled
+        into the device's acceptance code/mask so most unwanted frames never
+        cross the serial link; the residual and exclude_ids are filtered
+        exactly before frames are parsed into messages. The device is
+        reprogrammed only when the code/mask actually changes. Returns False
+        if the device rejected it (the software filter still applies).
+        """
+        self.include_filter = frozenset(include_ids) if include_ids else None
+        self.include_ids = filter_key_set(include_ids) if include_ids else None
+        self.exclude_ids = frozenset(exclude_ids or ())
+        
+        acceptance = compute_acceptance_filter(self.include_filter)
+        if not self.is_connected or acceptance == self.acceptance_filter:
+            return True
+        return self._program_acceptance_filter(acceptance)
+    
+    def _program_acceptance_filter(self, acceptance):
+        """Close the channel, write the acceptance code/mask and reopen"""
+        code, mask = acceptance
+        self.send_command("C")
+        if self.loopback:
+            self.send_command("L")
+        code_response = self.send_command(f"M{code:08X}")
+        mask_response = self.send_command(f"m{mask:08X}")
+        if self.hw_timestamps:
+            self._enable_timestamps()
+        open_response = self.send_command("O", timeout=self.command_timeout)
+        
+        accepted = all(r is not None and '\x07' not in r for r in (code_response, mask_response))
+        if accepted:
+            self.acceptance_filter = acceptance
+            print(f"Acceptance filter set: code={code:08X} mask={mask:08X}")
+        else:
+            self.acceptance_filter = ACCEPT_ALL_FILTER
+            print("Device rejected acceptance filter - filtering in software only")
+        if not open_response or '\x07' in open_response:
+            print(f"Warning: Reopen after filter change failed: {repr(open_response)}")
+        return accepted
+    
+    def _probe_device(self, loopback_response=None):
+        """Probe device type and capabilities once and cache them for this connection"""
         version_response = self.send_command("V")
         print(f"Version response: {repr(version_response)}")
         
-        # Try getting serial number
         serial_response = self.send_command("N")
         print(f"Serial response: {repr(serial_response)}")
         
@@ -215,11 +956,36 @@ class SLCANManager:
         elif version_response and version_response.strip() == '\x07':
             device_type = "Generic (limited commands)"
         
-        return {
+        # Loopback support is only known if it was requested
+        loopback = None
+        if loopback_response is not None:
+            loopback = '\x07' not in loopback_response
+        
+        self.device_profile = {
             "version": version_response,
             "serial": serial_response,
-            "type": device_type
+            "type": device_type,
+            "loopback": loopback,
+            "tx_format": None,  # Learned on the first successful send
         }
+        return self.device_profile
+    
+    def check_device_info(self, refresh=False):
+        """Get device version and capabilities
+        
+        Returns the profile cached at connect time; refresh=True probes the
+        device again (and forgets the learned transmit format).
+        """
+        if not self.is_connected:
+            return None
+        
+        if refresh or self.device_profile is None:
+            loopback_response = None
+            if self.device_profile and self.device_profile["loopback"] is not None:
+                loopback_response = '\r' if self.device_profile["loopback"] else '\x07'
+            self._probe_device(loopback_response)
+        
+        return self.device_profile
     
     def send_message(self, msg_id, data, extended=False):
         """Send CAN message"""
@@ -232,131 +998,185 @@ class SLCANManager:
                 print(f"Error: Data length {len(data)} exceeds maximum of 8 bytes")
                 return False
             
-            # Check if this is a WeAct Studio device
-            device_info = self.check_device_info()
-            is_weact = device_info and device_info.get("type") == "WeAct Studio"
+            profile = self.check_device_info()
+            tx_format = profile.get("tx_format") if profile else None
             
-            if is_weact:
-                print("Detected WeAct Studio device - trying WeAct-specific formats...")
-                return self._send_message_weact(msg_id, data, extended)
-            else:
-                return self._send_message_standard(msg_id, data, extended)
+            # Steady state: reuse the format that worked before, no probing
+            if tx_format:
+                if self.tx_queue:
+                    return self.send_message_async(msg_id, data, extended).result(timeout=self.command_timeout + 1)
+                return self._send_with_format(tx_format, msg_id, data, extended) is True
+            
+            return self._learn_tx_format(msg_id, data, extended, profile)
             
         except Exception as e:
             print(f"Error sending message: {e}")
             return False
     
-    def _send_message_standard(self, msg_id, data, extended=False):
-        """Send message using standard SLCAN format"""
-        # Format message - try standard SLCAN format first
-        if extended:
-            cmd = f"T{msg_id:08X}{len(data)}"
+    def send_message_async(self, msg_id, data, extended=False, callback=None):
+        """Queue a CAN message without waiting for the device
+        
+        Returns a Future resolving to True/False once the acknowledgement
+        arrives; callback(success), if given, is called from the receive
+        thread. Frames are pipelined when listening and the transmit format
+        is known, otherwise this falls back to a synchronous send.
+        """
+        profile = self.device_profile
+        tx_format = profile.get("tx_format") if profile else None
+        
+        if self.tx_queue and tx_format and self._is_valid_frame(msg_id, data, extended):
+            future = self.tx_queue.submit_encoded(self._encode_frames([(msg_id, data, extended)], tx_format), 1)[0]
         else:
-            cmd = f"t{msg_id:03X}{len(data)}"
+            future = Future()
+            future.set_result(self.send_message(msg_id, data, extended))
         
-        for byte in data:
-            cmd += f"{byte:02X}"
+        if callback:
+            future.add_done_callback(lambda f: callback(f.result()))
+        return future
+    
+    def send_messages(self, frames, timeout=None):
+        """Send a batch of (msg_id, data, extended) frames in a single serial write
         
-        response = self.send_command(cmd)
-        print(f"Send message command: {cmd}")
-        print(f"Send message response: {repr(response)} (expected 'z')")
-        
-        # Check for success - should be 'z' but some devices might respond differently
-        if response:
-            response_clean = response.strip()
-            if response_clean == 'z':
-                print("Message sent successfully!")
-                return True
-            elif response_clean == '\x07':
-                print("Device returned error (\\x07) - trying alternative format...")
-                # Try alternative format (some cheap devices need different formatting)
-                return self._try_alternative_send_formats(msg_id, data, extended)
-            elif response_clean == '\r' or response_clean == '':
-                print("Device returned \\r - some devices accept this as success")
-                return True
+        Returns a list of per-frame results (True/False) in input order.
+        """
+        futures = self.send_messages_async(frames)
+        if timeout is None:
+            timeout = self.command_timeout + 1
+        results = []
+        for future in futures:
+            try:
+                results.append(bool(future.result(timeout=timeout)))
+            except FutureTimeoutError:
+                results.append(False)
+        return results
+    
+    def send_messages_async(self, frames):
+        """Queue a batch of (msg_id, data, extended) frames as one serial write
+        
+        Returns one Future per frame (True/False once acknowledged). Invalid
+        frames resolve to False immediately and are not sent.
+        """
+        frames = [tuple(frame) for frame in frames]
+        futures = [Future() for _ in frames]
+        if not self.is_connected or not frames:
+            for future in futures:
+                future.set_result(False)
+            return futures
+        
+        valid = []
+        for index, (msg_id, data, extended) in enumerate(frames):
+            if self._is_valid_frame(msg_id, data, extended):
+                valid.append(index)
             else:
-                print(f"Unexpected response: {repr(response_clean)}")
-                return False
+                print(f"Error: Invalid frame ID=0x{msg_id:X} DLC={len(data)} - not sent")
+                futures[index].set_result(False)
+        
+        # The first send of a connection learns the transmit format
+        profile = self.check_device_info()
+        if valid and profile is not None and not profile.get("tx_format"):
+            first = valid.pop(0)
+            futures[first].set_result(self.send_message(*frames[first]))
+        tx_format = profile.get("tx_format") if profile else None
+        if not valid or not tx_format:
+            for index in valid:
+                futures[index].set_result(False)
+            return futures
+        
+        payload = self._encode_frames([frames[index] for index in valid], tx_format)
+        if self.tx_queue:
+            results = self.tx_queue.submit_encoded(payload, len(valid))
+            for index, result in zip(valid, results):
+                result.add_done_callback(lambda f, target=futures[index]: target.set_result(bool(f.result())))
         else:
-            print("No response from device")
-            return False
+            responses = self._write_and_collect(payload, len(valid))
+            for index, response in zip(valid, responses):
+                futures[index].set_result(response is not None and response.strip() in _TX_SUCCESS_RESPONSES)
+        return futures
     
-    def _send_message_weact(self, msg_id, data, extended=False):
-        """Send message using WeAct Studio specific formats"""
-        print("Trying WeAct Studio specific message formats...")
+    @staticmethod
+    def _is_valid_frame(msg_id, data, extended):
+        return len(data) <= 8 and 0 <= msg_id <= (0x1FFFFFFF if extended else 0x7FF)
+    
+    @staticmethod
+    def _encode_frames(frames, tx_format):
+        """Encode frames with the learned format, table-driven for the standard format"""
+        if tx_format == "standard":
+            return encode_slcan_frames(frames)
+        encoder = _TX_FORMATS[tx_format]
+        return "".join(encoder(*frame) + '\r' for frame in frames).encode('ascii')
+    
+    def _write_and_collect(self, payload, count):
+        """Write a batch without the receive thread and read count responses
         
-        # WeAct Format 1: Try simpler format without DLC
-        try:
-            if extended:
-                cmd = f"T{msg_id:08X}"
-            else:
-                cmd = f"t{msg_id:03X}"
-            
-            # Add data without length prefix
-            for byte in data:
-                cmd += f"{byte:02X}"
-            
-            response = self.send_command(cmd)
-            print(f"WeAct format 1: {cmd} -> {repr(response)}")
-            if response and response.strip() in ['z', '\r', '', 'OK']:
-                print("WeAct format 1 successful!")
-                return True
-        except Exception as e:
-            print(f"WeAct format 1 failed: {e}")
+        Returns the response strings in order, None for missing ones.
+        Received frames interleaved with the responses are skipped.
+        """
+        port = self.serial_port
+        if self._reader is not None or not port or not port.is_open:
+            return [None] * count
+        port.reset_input_buffer()
+        port.write(payload)
+        port.flush()
         
-        # WeAct Format 2: Try with uppercase T/t and different structure
-        try:
-            if extended:
-                cmd = f"T{msg_id:08X}{len(data):01X}"
-            else:
-                cmd = f"t{msg_id:03X}{len(data):01X}"
-            
-            for byte in data:
-                cmd += f"{byte:02X}"
-            
-            response = self.send_command(cmd)
-            print(f"WeAct format 2: {cmd} -> {repr(response)}")
-            if response and response.strip() in ['z', '\r', '', 'OK']:
-                print("WeAct format 2 successful!")
-                return True
-        except Exception as e:
-            print(f"WeAct format 2 failed: {e}")
+        responses = []
+        buffer = b''
+        deadline = time.time() + self.command_timeout
+        while len(responses) < count and time.time() < deadline:
+            waiting = port.in_waiting
+            if not waiting:
+                time.sleep(0.001)
+                continue
+            buffer += port.read(waiting).replace(b'\x07', b'\x07\r')
+            *lines, buffer = buffer.split(b'\r')
+            for line in lines:
+                if line[:1] not in (b't', b'T'):
+                    responses.append(line.decode('ascii', errors='ignore'))
         
-        # WeAct Format 3: Try with line ending
-        try:
-            if extended:
-                cmd = f"T{msg_id:08X}{len(data)}"
-            else:
-                cmd = f"t{msg_id:03X}{len(data)}"
-            
-            for byte in data:
-                cmd += f"{byte:02X}"
-            
-            cmd += "\n"  # Add newline
-            
-            response = self.send_command(cmd.rstrip())  # Remove newline for send_command
-            print(f"WeAct format 3: {cmd.strip()} -> {repr(response)}")
-            if response and response.strip() in ['z', '\r', '', 'OK']:
-                print("WeAct format 3 successful!")
-                return True
-        except Exception as e:
-            print(f"WeAct format 3 failed: {e}")
+        return (responses + [None] * count)[:count]
+    
+    def _send_with_format(self, tx_format, msg_id, data, extended=False):
+        """Send one frame using a named transmit format
         
-        # WeAct Format 4: Try minimal format
-        try:
-            cmd = f"t{msg_id:X}#"
-            for byte in data:
-                cmd += f"{byte:02X}"
-            
-            response = self.send_command(cmd)
-            print(f"WeAct format 4: {cmd} -> {repr(response)}")
-            if response and response.strip() in ['z', '\r', '', 'OK']:
-                print("WeAct format 4 successful!")
+        Returns True on success, None if the device rejected the format
+        (BEL) and False for any other failure.
+        """
+        cmd = _TX_FORMATS[tx_format](msg_id, data, extended)
+        response = self.send_command(cmd)
+        
+        if not response:
+            print("No response from device")
+            return False
+        
+        response_clean = response.strip()
+        if response_clean in _TX_SUCCESS_RESPONSES:
+            return True
+        if response_clean == '\x07':
+            return None
+        print(f"Unexpected response to {tx_format} format: {repr(response_clean)}")
+        return False
+    
+    def _learn_tx_format(self, msg_id, data, extended, profile):
+        """Try the transmit format candidates for this device and remember the one that works"""
+        device_type = profile.get("type") if profile else None
+        if device_type == "WeAct Studio":
+            print("Detected WeAct Studio device - trying WeAct-specific formats...")
+            candidates = _WEACT_TX_FORMATS
+        else:
+            candidates = _GENERIC_TX_FORMATS
+        
+        for tx_format in candidates:
+            result = self._send_with_format(tx_format, msg_id, data, extended)
+            if result:
+                print(f"Transmit format '{tx_format}' works - reusing it for this connection")
+                if profile is not None:
+                    profile["tx_format"] = tx_format
                 return True
-        except Exception as e:
-            print(f"WeAct format 4 failed: {e}")
+            if result is False and tx_format == "standard" and device_type != "WeAct Studio":
+                # Only a BEL from the device means the format itself is unsupported
+                return False
+            print(f"Transmit format '{tx_format}' rejected - trying next format...")
         
-        print("All WeAct formats failed - device may be receive-only")
+        print("All transmit formats failed - device may be receive-only")
         return False
     
     def test_weact_commands(self):
@@ -385,56 +1205,40 @@ class SLCANManager:
         
         return results
     
-    def _try_alternative_send_formats(self, msg_id, data, extended=False):
-        """Try alternative message formats for devices that don't support standard SLCAN"""
-        print("Trying alternative message formats...")
+    def start_listening(self, callback, batch_callback=None):
+        """Start listening for CAN messages
         
-        # Format 1: Try without DLC
-        try:
-            if extended:
-                cmd = f"T{msg_id:08X}"
-            else:
-                cmd = f"t{msg_id:03X}"
-            
-            for byte in data:
-                cmd += f"{byte:02X}"
-            
-            response = self.send_command(cmd)
-            print(f"Alternative format 1: {cmd} -> {repr(response)}")
-            if response and response.strip() in ['z', '\r', '']:
-                return True
-        except Exception as e:
-            print(f"Alternative format 1 failed: {e}")
+        callback is called once per frame (a CANFrame). If batch_callback is
+        given it is called instead, once per serial read, with the list of
+        frames parsed from that read.
         
-        # Format 2: Try with spaces
-        try:
-            if extended:
-                cmd = f"T {msg_id:08X} {len(data)}"
-            else:
-                cmd = f"t {msg_id:03X} {len(data)}"
-            
-            for byte in data:
-                cmd += f" {byte:02X}"
-            
-            response = self.send_command(cmd)
-            print(f"Alternative format 2: {cmd} -> {repr(response)}")
-            if response and response.strip() in ['z', '\r', '']:
-                return True
-        except Exception as e:
-            print(f"Alternative format 2 failed: {e}")
-        
-        print("All alternative formats failed")
-        return False
-    
-    def start_listening(self, callback):
-        """Start listening for CAN messages"""
+        With reader_process set, reading and decoding run in a separate
+        process so capture does not depend on how busy this one is; frames
+        are then delivered in batches taken from the shared ring buffer.
+        """
         if not self.is_connected or self.is_listening:
             return False
         
         self.message_callback = callback
+        self.batch_callback = batch_callback
+        self._rx_buffer.clear()
+        self.reset_rx_stats()
+        self.timestamp_clock.reset()
         self.is_listening = True
         self.stop_listening = False
-        self.listen_thread = threading.Thread(target=self._listen_loop)
+        
+        # Stale responses would be matched to the first queued command
+        self.serial_port.reset_input_buffer()
+        if self.reader_process:
+            tx_port = self._start_reader_process()
+            listen_loop = self._ring_loop
+        else:
+            tx_port = self.serial_port
+            listen_loop = self._listen_loop
+        self.tx_queue = SLCANTransmitQueue(tx_port, ack_timeout=self.command_timeout)
+        self.tx_queue.start()
+        
+        self.listen_thread = threading.Thread(target=listen_loop)
         self.listen_thread.daemon = True
         self.listen_thread.start()
         return True
@@ -445,62 +1249,246 @@ class SLCANManager:
         self.is_listening = False
         if self.listen_thread:
             self.listen_thread.join(timeout=1)
+        # Take the port back from a reader process before dropping the TX queue, so
+        # commands never fall through to direct writes on a port we do not own
+        try:
+            if self._reader:
+                self._stop_reader_process()
+        finally:
+            if self.tx_queue:
+                self.tx_queue.stop()
+                self.tx_queue = None
+    
+    def _start_reader_process(self):
+        """Hand reading to a separate process, returns the port-like object used to transmit"""
+        self._ring = SharedFrameRing(self.ring_capacity)
+        tx_receiver, self._tx_connection = multiprocessing.Pipe(duplex=False)
+        self._responses, response_sender = multiprocessing.Pipe(duplex=False)
+        self._reader_stop = multiprocessing.Event()
+        
+        # Windows only allows one handle per COM port; elsewhere keep ours open
+        # so the control lines (and the device) are not reset
+        if sys.platform == "win32":
+            self.serial_port.close()
+        
+        self._reader = multiprocessing.Process(
+            target=_reader_process_main,
+            args=(self.serial_port.port, self.serial_port.baudrate, self._ring.name, self.ring_capacity,
+                  self.hw_timestamps, self.read_timeout, self.max_read_size,
+                  tx_receiver, response_sender, self._reader_stop)
+        )
+        self._reader.daemon = True
+        self._reader.start()
+        tx_receiver.close()
+        response_sender.close()
+        return _PipePort(self._tx_connection)
+    
+    def _stop_reader_process(self):
+        """Stop the reader process and take the serial port back"""
+        self._reader_stop.set()
+        self._tx_connection.close()
+        self._reader.join(timeout=2)
+        if self._reader.is_alive():
+            self._reader.terminate()
+            self._reader.join(timeout=1)
+        self._responses.close()
+        self._ring.close()
+        self._reader = None
+        self._ring = None
+        
+        if not self.serial_port.is_open:
+            self.serial_port.open()
+        self.serial_port.reset_input_buffer()
+    
+    def reset_rx_stats(self):
+        """Reset the receive throughput counters"""
+        self.rx_stats = {
+            "frames": 0,
+            "bytes": 0,
+            "reads": 0,
+            "max_batch": 0,
+            "parse_errors": 0,
+            "filtered": 0,
+            "dropped": 0,        # Lost to a full ring buffer (reader process only)
+            "start_time": time.perf_counter(),
+        }
+    
+    def get_rx_stats(self):
+        """Get receive throughput counters and rates since listening started"""
+        stats = dict(self.rx_stats)
+        elapsed = time.perf_counter() - stats["start_time"]
+        stats["elapsed"] = elapsed
+        stats["frames_per_second"] = stats["frames"] / elapsed if elapsed > 0 else 0.0
+        stats["bytes_per_second"] = stats["bytes"] / elapsed if elapsed > 0 else 0.0
+        stats["frames_per_read"] = stats["frames"] / stats["reads"] if stats["reads"] else 0.0
+        return stats
     
     def _listen_loop(self):
-        """Main listening loop"""
+        """Main listening loop
+        
+        Blocks in a single bulk read for every byte the device has buffered
+        (or the first byte to arrive, bounded by read_timeout), appends it to
+        the framing buffer and dispatches all complete lines as one batch.
+        """
+        port = self.serial_port
+        if port:
+            port.timeout = self.read_timeout
+        
         while not self.stop_listening and self.is_connected:
             try:
-                if self.serial_port and self.serial_port.in_waiting > 0:
-                    line = self.serial_port.readline().decode().strip()
-                    if line:
-                        message = self._parse_message(line)
-                        if message and self.message_callback:
-                            self.message_callback(message)
-                else:
-                    time.sleep(0.001)  # Small delay to prevent CPU spinning
+                chunk = port.read(min(max(port.in_waiting, 1), self.max_read_size))
+                if not chunk:
+                    continue
+                
+                batch = self._process_chunk(chunk)
+                if batch:
+                    self._dispatch_batch(batch)
+                    
+            except Exception as e:
+                print(f"Error in listen loop: {e}")
+                if not (self.auto_reconnect and self._reconnect()):
+                    break
+                port = self.serial_port
+    
+    def _ring_loop(self):
+        """Consume the frames and responses produced by the reader process
+        
+        A reader process that dies (device unplugged, read error) is
+        replaced like a failed port in _listen_loop: the device is reopened
+        with _reconnect() and a new reader started.
+        """
+        ring = self._ring
+        responses = self._responses
+        reader = self._reader
+        stats = self.rx_stats
+        counted = {"bytes": 0, "reads": 0, "parse_errors": 0, "dropped": 0}  # From replaced readers
+        
+        while not self.stop_listening and self.is_connected:
+            try:
+                # Waiting on the response pipe keeps acknowledgements prompt
+                try:
+                    if responses.poll(self.read_timeout):
+                        while responses.poll():
+                            self.tx_queue.on_response(responses.recv_bytes())
+                except EOFError:
+                    # The reader closed its end of the pipe: it is exiting
+                    reader.join(self.read_timeout)
+                
+                for key, value in ring.counters().items():
+                    stats[key] = counted[key] + value
+                records = ring.read_frames()
+                if not records:
+                    if not reader.is_alive():
+                        print("SLCAN reader process stopped")
+                        counted = {key: stats[key] for key in counted}
+                        if not self._restart_reader_process():
+                            break
+                        ring = self._ring
+                        responses = self._responses
+                        reader = self._reader
+                    continue
+                
+                include_ids = self.include_ids
+                exclude_ids = self.exclude_ids
+                batch = []
+                for timestamp_ns, msg_id, flags, dlc, payload in records:
+                    if ((include_ids is None or (msg_id, bool(flags & FLAG_EXTENDED)) in include_ids)
+                            and msg_id not in exclude_ids):
+                        batch.append(CANFrame(msg_id, payload[:dlc], timestamp_ns, flags))
+                stats["filtered"] += len(records) - len(batch)
+                stats["frames"] += len(batch)
+                if len(batch) > stats["max_batch"]:
+                    stats["max_batch"] = len(batch)
+                if batch:
+                    self._dispatch_batch(batch)
                     
             except Exception as e:
                 print(f"Error in listen loop: {e}")
                 break
+        
+        if not self.stop_listening:
+            self.is_listening = False
+            print("SLCAN listening stopped: reader process lost")
     
-    def _parse_message(self, line):
-        """Parse SLCAN message format"""
+    def _restart_reader_process(self):
+        """Replace a dead reader process, returns False if listening ended instead"""
         try:
-            if not line:
-                return None
-            
-            # Standard frame: tiiil[data...]
-            # Extended frame: Tiiiiiiiil[data...]
-            if line.startswith('t') and len(line) >= 5:
-                # Standard frame
-                msg_id = int(line[1:4], 16)
-                dlc = int(line[4])
-                data_start = 5
-                extended = False
-            elif line.startswith('T') and len(line) >= 10:
-                # Extended frame
-                msg_id = int(line[1:9], 16)
-                dlc = int(line[9])
-                data_start = 10
-                extended = True
-            else:
-                return None
-            
-            # Extract data bytes
-            data = []
-            for i in range(dlc):
-                if data_start + i*2 + 1 < len(line):
-                    byte_str = line[data_start + i*2:data_start + i*2 + 2]
-                    data.append(int(byte_str, 16))
-            
-            return {
-                "id": msg_id,
-                "data": data,
-                "extended": extended,
-                "timestamp": datetime.now(),
-                "type": "EXT" if extended else "STD"
-            }
-            
+            self._stop_reader_process()
         except Exception as e:
-            print(f"Error parsing message: {e}")
+            # Reopening our handle fails while the device is gone; _reconnect retries it
+            print(f"SLCAN reader cleanup failed: {e}")
+        self.tx_queue.serial_port = self.serial_port
+        if not (self.auto_reconnect and self._reconnect()):
+            return False
+        with self._port_lock:
+            if self.stop_listening:
+                return False
+            self.tx_queue.serial_port = self._start_reader_process()
+        return True
+    
+    def _process_chunk(self, chunk):
+        """Append raw bytes to the framing buffer and parse all complete lines"""
+        stats = self.rx_stats
+        stats["bytes"] += len(chunk)
+        stats["reads"] += 1
+        
+        lines = take_slcan_lines(self._rx_buffer, chunk)
+        if not lines:
+            return []
+        
+        # One host timestamp per read, refined per frame by the device clock in Z1 mode
+        host_ns = time.time_ns()
+        batch = []
+        make_message = self._make_message
+        include_ids = self.include_ids
+        exclude_ids = self.exclude_ids
+        tx_queue = self.tx_queue
+        for line in lines:
+            if line[:1] == b'\n':
+                line = line.lstrip(b'\n')
+            if line[:1] in (b't', b'T'):
+                frame = decode_slcan_frame(line)
+                if frame is None:
+                    stats["parse_errors"] += 1
+                elif (include_ids is None or frame[:2] in include_ids) and frame[0] not in exclude_ids:
+                    batch.append(make_message(frame, host_ns))
+                else:
+                    stats["filtered"] += 1
+            elif tx_queue:
+                # Everything else is a response to a command or transmitted frame
+                tx_queue.on_response(line)
+        
+        stats["frames"] += len(batch)
+        if len(batch) > stats["max_batch"]:
+            stats["max_batch"] = len(batch)
+        return batch
+    
+    def _dispatch_batch(self, batch):
+        """Hand a batch of parsed frames to the registered callback(s)"""
+        if self.batch_callback:
+            self.batch_callback(batch)
+        elif self.message_callback:
+            callback = self.message_callback
+            for message in batch:
+                callback(message)
+    
+    def _parse_message(self, line, host_ns=None):
+        """Parse SLCAN message format
+        
+        line is the raw bytes of one frame without the trailing \\r and
+        host_ns the time.time_ns() at which it was read (defaults to now).
+        Returns None for anything that is not a well-formed t/T frame.
+        """
+        frame = decode_slcan_frame(line)
+        if frame is None:
             return None
+        return self._make_message(frame, time.time_ns() if host_ns is None else host_ns)
+    
+    def _make_message(self, frame, host_ns):
+        """Build the CANFrame handed to callbacks from a decoded frame"""
+        msg_id, extended, data, stamp = frame
+        if stamp is not None and self.hw_timestamps:
+            timestamp_ns = self.timestamp_clock.to_ns(stamp, host_ns)
+        else:
+            timestamp_ns = host_ns
+        return CANFrame(msg_id, data, timestamp_ns, FLAG_EXTENDED if extended else 0)
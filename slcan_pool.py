@@ -0,0 +1,180 @@
+# slcan_pool.py
+import heapq
+import itertools
+import threading
+import time
+
+from slcan_manager import SLCANManager
+
+
+class SLCANPool:
+    """Several SLCAN adapters merged into one time-ordered, channel-tagged stream
+
+    Each device keeps its own SLCANManager and reader thread. Their batches
+    are pushed into a shared heap keyed by timestamp; a merge thread
+    releases frames once they are older than reorder_window, so frames from
+    different buses come out in timestamp order even though the readers
+    deliver them with different latencies.
+    """
+
+    def __init__(self, reorder_window=0.02, max_pending=100000):
+        self.devices = {}                 # {channel: SLCANManager}
+        self.reorder_window = reorder_window
+        self.max_pending = max_pending    # Frames held for reordering before dropping
+        self.message_callback = None
+        self.batch_callback = None
+        self.is_listening = False
+
+        self._heap = []                   # (timestamp_ns, seq, message)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._last_emitted_ns = 0
+        self._merge_thread = None
+        self._stop_merging = False
+        self.channel_stats = {}           # {channel: {"received", "dropped", "late"}}
+        self.include_ids = None           # ID filter given to every device, see set_id_filter
+        self.exclude_ids = None
+
+    def add_device(self, channel, port, baudrate=115200, bitrate=500000, loopback=False, timestamps=False):
+        """Connect an SLCAN adapter and register it under a channel name"""
+        if channel in self.devices:
+            print(f"Channel {channel} already in pool")
+            return False
+
+        manager = SLCANManager()
+        if not manager.connect(port, baudrate, loopback, timestamps):
+            return False
+        if not manager.set_bitrate(bitrate, loopback):
+            manager.disconnect()
+            return False
+        manager.set_id_filter(self.include_ids, self.exclude_ids)
+
+        self.channel_stats[channel] = {"received": 0, "dropped": 0, "late": 0}
+        manager.start_listening(None, lambda batch, ch=channel: self._on_batch(ch, batch))
+        self.devices[channel] = manager
+        return True
+
+    def remove_device(self, channel):
+        """Disconnect an adapter and remove it from the pool"""
+        manager = self.devices.pop(channel, None)
+        if manager:
+            manager.disconnect()
+        self.channel_stats.pop(channel, None)
+
+    def disconnect_all(self):
+        """Disconnect every adapter and stop merging"""
+        self.stop_listening_messages()
+        for channel in list(self.devices):
+            self.remove_device(channel)
+
+    def set_id_filter(self, include_ids=None, exclude_ids=None):
+        """Apply an SLCANManager ID filter to every device, including ones added later"""
+        self.include_ids = include_ids
+        self.exclude_ids = exclude_ids
+        ok = True
+        for manager in list(self.devices.values()):
+            ok = manager.set_id_filter(include_ids, exclude_ids) and ok
+        return ok
+
+    def get_channels(self):
+        return list(self.devices.keys())
+
+    def start_listening(self, callback, batch_callback=None):
+        """Start delivering the merged stream
+
+        Same contract as SLCANManager.start_listening; every frame's channel
+        is the name its device was added under.
+        """
+        if self.is_listening:
+            return False
+        self.message_callback = callback
+        self.batch_callback = batch_callback
+        self.is_listening = True
+        self._stop_merging = False
+        self._merge_thread = threading.Thread(target=self._merge_loop)
+        self._merge_thread.daemon = True
+        self._merge_thread.start()
+        return True
+
+    def stop_listening_messages(self):
+        """Stop delivering the merged stream (adapters keep receiving)"""
+        self._stop_merging = True
+        self.is_listening = False
+        if self._merge_thread:
+            self._merge_thread.join(timeout=1)
+            self._merge_thread = None
+
+    def get_stats(self):
+        """Per-channel throughput and overflow counters"""
+        stats = {}
+        for channel, manager in list(self.devices.items()):
+            rx = manager.get_rx_stats()
+            merged = self.channel_stats.get(channel, {})
+            stats[channel] = {
+                "frames_per_second": rx["frames_per_second"],
+                "bytes_per_second": rx["bytes_per_second"],
+                "parse_errors": rx["parse_errors"],
+                "received": merged.get("received", 0),
+                "dropped": merged.get("dropped", 0),  # Merge buffer overflow
+                "late": merged.get("late", 0),        # Arrived after newer frames were released
+            }
+        return stats
+
+    @property
+    def pending(self):
+        return len(self._heap)
+
+    def _on_batch(self, channel, batch):
+        """Called from each device's reader thread"""
+        stats = self.channel_stats.get(channel)
+        if stats is None:
+            return
+        stats["received"] += len(batch)
+        if not self.is_listening:
+            return
+
+        source = f"SLCAN-{channel}"
+        with self._lock:
+            room = self.max_pending - len(self._heap)
+            if room < len(batch):
+                stats["dropped"] += len(batch) - max(room, 0)
+                batch = batch[:max(room, 0)]
+            heap = self._heap
+            for message in batch:
+                message.channel = channel
+                message.source = source
+                heapq.heappush(heap, (message.timestamp_ns, next(self._seq), message))
+
+    def _merge_loop(self):
+        """Release frames older than the reorder window, in timestamp order"""
+        interval = min(self.reorder_window / 2, 0.01)
+        while not self._stop_merging:
+            time.sleep(interval)
+            watermark = time.time_ns() - int(self.reorder_window * 1e9)
+
+            batch = []
+            with self._lock:
+                heap = self._heap
+                while heap and heap[0][0] <= watermark:
+                    batch.append(heapq.heappop(heap)[2])
+            if not batch:
+                continue
+
+            # Frames that arrived too late to be ordered are still delivered, but counted
+            if batch[0].timestamp_ns < self._last_emitted_ns:
+                for message in batch:
+                    if message.timestamp_ns >= self._last_emitted_ns:
+                        break
+                    stats = self.channel_stats.get(message.channel)
+                    if stats:
+                        stats["late"] += 1
+            self._last_emitted_ns = batch[-1].timestamp_ns
+
+            try:
+                if self.batch_callback:
+                    self.batch_callback(batch)
+                elif self.message_callback:
+                    for message in batch:
+                        self.message_callback(message)
+            except Exception as e:
+                print(f"Error in SLCAN pool callback: {e}")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+SLCAN Device Simulator
+Creates a pseudo-terminal that behaves like a Lawicel/SLCAN adapter so
+SLCANManager can be connected, load tested and benchmarked without
+hardware. Supports V, N, F, Sn, O, C, L, Zn, M/m and t/T (acked with z/Z,
+echoed back in loopback mode), and streams synthetic or recorded traffic
+at a configurable frame rate and burst size while the channel is open.
+
+Linux/macOS only (needs pty support).
+
+Usage:
+    python slcan_simulator.py                          # 1000 frames/s, synthetic
+    python slcan_simulator.py --rate 20000 --burst 50  # 20k frames/s in bursts of 50
+    python slcan_simulator.py --replay capture.slcan   # loop recorded SLCAN traffic
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+
+try:
+    import tty
+    PTY_AVAILABLE = True
+except ImportError:
+    PTY_AVAILABLE = False
+
+from slcan_manager import decode_slcan_frame, encode_slcan_frames
+
+BEL = b'\x07'
+
+
+def synthetic_frames(count=1000, seed=1, extended_ratio=0.2):
+    """Build a repeatable (msg_id, data, extended) traffic mix"""
+    rng = random.Random(seed)
+    std_ids = [rng.randrange(0x800) for _ in range(40)]
+    ext_ids = [rng.randrange(0x20000000) for _ in range(10)]
+    frames = []
+    for _ in range(count):
+        data = bytes(rng.randrange(256) for _ in range(rng.choice((8, 8, 8, 8, 6, 4, 2, 0))))
+        if rng.random() < extended_ratio:
+            frames.append((rng.choice(ext_ids), data, True))
+        else:
+            frames.append((rng.choice(std_ids), data, False))
+    return frames
+
+
+def load_recorded_frames(path):
+    """Read the t/T frames of a raw SLCAN capture as (msg_id, data, extended)"""
+    with open(path, 'rb') as f:
+        stream = f.read()
+    frames = []
+    for line in stream.replace(b'\n', b'\r').split(b'\r'):
+        frame = decode_slcan_frame(line)
+        if frame:
+            msg_id, extended, data, _ = frame
+            frames.append((msg_id, data, extended))
+    return frames
+
+
+class SLCANSimulator:
+    """Pseudo-terminal SLCAN device
+
+    Connect SLCANManager to simulator.path. frame_rate is the average
+    number of streamed frames per second (0 = as fast as the reader keeps
+    up) and burst_size how many of them are written back to back.
+    """
+
+    def __init__(self, frame_rate=1000, burst_size=1, frames=None, version="V1013", serial_number="NA123"):
+        if not PTY_AVAILABLE:
+            raise RuntimeError("SLCAN simulator needs pseudo-terminal support (Linux/macOS)")
+
+        self.frame_rate = frame_rate
+        self.burst_size = max(1, burst_size)
+        self.version = version
+        self.serial_number = serial_number
+        self.streaming = True            # Stream traffic whenever the channel is open
+
+        # Device state, as set by the protocol commands
+        self.is_open = False
+        self.loopback = False
+        self.timestamps = False
+        self.bitrate_code = None
+        self.acceptance_code = 0
+        self.acceptance_mask = 0xFFFFFFFF
+
+        self.stats = {"commands": 0, "tx_frames": 0, "rx_frames": 0, "errors": 0}
+        self.command_log = []
+
+        self._lines = []
+        self._accepted = []
+        self.set_frames(frames if frames is not None else synthetic_frames())
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.path = os.ttyname(self._slave)
+        self._write_lock = threading.Lock()
+        self._start_ns = time.monotonic_ns()
+        self._running = False
+        self._threads = []
+
+    def set_frames(self, frames):
+        """Replace the streamed traffic with a list of (msg_id, data, extended)"""
+        self._frames = list(frames)
+        self._lines = [bytes(encode_slcan_frames([frame])) for frame in self._frames]
+        self._apply_filter()
+
+    def start(self):
+        self._running = True
+        for target in (self._command_loop, self._stream_loop):
+            thread = threading.Thread(target=target)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+        return self.path
+
+    def stop(self):
+        self._running = False
+        for fd in (self._slave, self._master):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _write(self, data):
+        with self._write_lock:
+            os.write(self._master, data)
+
+    def _timestamp(self):
+        """Device millisecond counter as sent in Z1 mode"""
+        return b'%04X' % ((time.monotonic_ns() - self._start_ns) // 1_000_000 % 60000)
+
+    def _accepts(self, msg_id, extended):
+        """SJA1000 single-filter acceptance check (mask bit 1 = don't care)"""
+        bits = msg_id << 3 if extended else msg_id << 21
+        return ((bits ^ self.acceptance_code) & ~self.acceptance_mask & 0xFFFFFFFF) == 0
+
+    def _apply_filter(self):
+        self._accepted = [
+            line for line, (msg_id, _, extended) in zip(self._lines, self._frames)
+            if self._accepts(msg_id, extended)
+        ]
+
+    def _command_loop(self):
+        buffer = b''
+        while self._running:
+            try:
+                buffer += os.read(self._master, 4096)
+            except OSError:
+                return
+            while b'\r' in buffer:
+                line, buffer = buffer.split(b'\r', 1)
+                response = self._handle_command(line.lstrip(b'\n'))
+                if response:
+                    self._write(response)
+
+    def _handle_command(self, line):
+        """Return the device's response to one command line (without \\r)"""
+        self.stats["commands"] += 1
+        if len(self.command_log) < 10000:
+            self.command_log.append(line)
+        command = line[:1]
+
+        if command in (b't', b'T'):
+            if not self.is_open or decode_slcan_frame(line) is None:
+                self.stats["errors"] += 1
+                return BEL
+            self.stats["tx_frames"] += 1
+            response = b'z\r' if command == b't' else b'Z\r'
+            if self.loopback:
+                response += line + (self._timestamp() if self.timestamps else b'') + b'\r'
+            return response
+        if command == b'V':
+            return self.version.encode() + b'\r'
+        if command == b'N':
+            return self.serial_number.encode() + b'\r'
+        if command == b'F':
+            return b'F00\r'
+        if command == b'O':
+            if self.is_open:
+                return BEL
+            self.is_open = True
+            return b'\r'
+        if command == b'L':
+            # Loopback open in this repo's dialect
+            self.loopback = True
+            return b'\r'
+        if command == b'C':
+            self.is_open = False
+            self.loopback = False
+            return b'\r'
+
+        # Configuration commands are only accepted with the channel closed
+        if self.is_open:
+            self.stats["errors"] += 1
+            return BEL
+        try:
+            if command == b'S' and len(line) == 2 and b'0' <= line[1:2] <= b'8':
+                self.bitrate_code = int(line[1:2])
+                return b'\r'
+            if command == b'Z' and line[1:2] in (b'0', b'1'):
+                self.timestamps = line[1:2] == b'1'
+                return b'\r'
+            if command in (b'M', b'm') and len(line) == 9:
+                value = int(line[1:9], 16)
+                if command == b'M':
+                    self.acceptance_code = value
+                else:
+                    self.acceptance_mask = value
+                self._apply_filter()
+                return b'\r'
+        except ValueError:
+            pass
+        self.stats["errors"] += 1
+        return BEL
+
+    def _stream_loop(self):
+        position = 0
+        next_time = time.perf_counter()
+        while self._running:
+            lines = self._accepted
+            if not (self.streaming and self.is_open and lines):
+                time.sleep(0.01)
+                next_time = time.perf_counter()
+                continue
+
+            burst = []
+            for _ in range(self.burst_size):
+                burst.append(lines[position % len(lines)])
+                position += 1
+            if self.timestamps:
+                stamp = self._timestamp()
+                payload = b''.join(line[:-1] + stamp + b'\r' for line in burst)
+            else:
+                payload = b''.join(burst)
+
+            try:
+                self._write(payload)
+            except OSError:
+                return
+            self.stats["rx_frames"] += len(burst)
+
+            if self.frame_rate:
+                next_time += len(burst) / self.frame_rate
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -1.0:
+                    next_time = time.perf_counter()  # Reader fell behind, don't try to catch up
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pseudo-terminal SLCAN device simulator")
+    parser.add_argument("--rate", type=float, default=1000, help="frames per second (0 = unthrottled)")
+    parser.add_argument("--burst", type=int, default=1, help="frames written back to back")
+    parser.add_argument("--replay", help="raw SLCAN capture to stream instead of synthetic traffic")
+    args = parser.parse_args()
+
+    frames = load_recorded_frames(args.replay) if args.replay else None
+    simulator = SLCANSimulator(args.rate, args.burst, frames)
+    print(f"SLCAN simulator on {simulator.start()} ({args.rate:g} frames/s, bursts of {args.burst})")
+    print("Press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+            print(f"  {simulator.stats}")
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
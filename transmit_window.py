@@ -17,6 +17,7 @@ class TransmitWindow(QMainWindow):
         self.dbc_manager = dbc_manager
         self.pcan_manager = pcan_manager
         self.periodic_timers = {}
+        self.async_send_failures = 0  # Failed pipelined sends, counted from the adapter thread
         
         print("Setting up window properties...")
         self.setWindowTitle("CAN Message Transmitter")
@@ -498,7 +499,8 @@ class TransmitWindow(QMainWindow):
             extended = ext_widget.isChecked()
             data = self.parse_data_string(data_widget.text())
             
-            success = self.send_can_message(msg_id, data, extended)
+            # Queue without waiting for the acknowledgement so the timer keeps its pace
+            success = self.send_can_message(msg_id, data, extended, wait=False)
             
             # Update count
             count_item = self.periodic_table.item(row, 5)
@@ -508,6 +510,9 @@ class TransmitWindow(QMainWindow):
             
             if not success:
                 self.status_label.setText(f"✗ Periodic send failed: ID=0x{msg_id:X}")
+            elif self.async_send_failures:
+                self.status_label.setText(f"✗ {self.async_send_failures} queued send(s) not acknowledged")
+                self.async_send_failures = 0
                 
         except Exception as e:
             print(f"Error sending periodic message: {e}")
@@ -674,8 +679,17 @@ class TransmitWindow(QMainWindow):
         if self.adapter_combo.count() > 0 and self.adapter_combo.itemData(0):
             self.adapter_combo.setCurrentIndex(0)
     
-    def send_can_message(self, msg_id, data, extended=False, rtr=False):
-        """Universal method to send CAN message via selected adapter"""
+    def on_async_send_result(self, success):
+        """Count failed pipelined sends (called from the adapter's receive thread)"""
+        if not success:
+            self.async_send_failures += 1
+    
+    def send_can_message(self, msg_id, data, extended=False, rtr=False, wait=True):
+        """Universal method to send CAN message via selected adapter
+        
+        With wait=False, SLCAN sends are queued and acknowledged in the
+        background; failures are counted in async_send_failures.
+        """
         if self.adapter_combo.currentData() is None:
             self.status_label.setText("No CAN adapter selected")
             return False
@@ -688,14 +702,10 @@ class TransmitWindow(QMainWindow):
                 return False
             
             if channel == "all":
-                # Send on all connected PCAN channels
-                success_count = 0
-                total_channels = len(self.pcan_manager.connected_channels)
-                
-                for ch in self.pcan_manager.get_connected_channels():
-                    success, message = self.pcan_manager.send_message_on_channel(ch, msg_id, data, extended, rtr)
-                    if success:
-                        success_count += 1
+                # Send on all connected PCAN channels concurrently
+                results = self.pcan_manager.send_batch_all([(msg_id, data, extended, rtr)])
+                success_count = sum(1 for success, _ in results.values() if success)
+                total_channels = len(results)
                 
                 if success_count == total_channels:
                     self.status_label.setText(f"✓ Sent on all {total_channels} PCAN channels")
@@ -722,6 +732,10 @@ class TransmitWindow(QMainWindow):
                 self.status_label.setText("SLCAN not connected")
                 return False
             
+            if not wait:
+                self.slcan_manager.send_message_async(msg_id, data, extended, callback=self.on_async_send_result)
+                return True
+            
             success = self.slcan_manager.send_message(msg_id, data, extended)
             if success:
                 self.status_label.setText("✓ Sent via SLCAN")